@@ -26,40 +26,34 @@ __copyright__ = '(C) 2019, Giovanni Manghi'
 __revision__ = '$Format:%H$'
 
 import os
+import time
+
+# The imports below count in the load budget
+_importStart = time.perf_counter()
 
 from qgis.PyQt.QtGui import QIcon
 
-from qgis.core import QgsProcessingProvider
+from qgis.core import Qgis, QgsMessageLog, QgsProcessingProvider
 from processing.core.ProcessingConfig import ProcessingConfig, Setting
 from processing.tools import system
 
-from ntv2_transformations.VectorDE_GK3ETRS8932NDirInv import VectorDE_GK3ETRS8932NDirInv
-from ntv2_transformations.RasterDE_GK3ETRS8932NDirInv import RasterDE_GK3ETRS8932NDirInv
-from ntv2_transformations.VectorPT_ETR89PTTM06DirInv import VectorPT_ETR89PTTM06DirInv
-from ntv2_transformations.RasterPT_ETR89PTTM06DirInv import RasterPT_ETR89PTTM06DirInv
-from ntv2_transformations.VectorES_ED50ERTS89DirInv import VectorES_ED50ERTS89DirInv
-from ntv2_transformations.RasterES_ED50ERTS89DirInv import RasterES_ED50ERTS89DirInv
-from ntv2_transformations.VectorIT_RER_ETRS89DirInv import VectorIT_RER_ETRS89DirInv
-from ntv2_transformations.RasterIT_RER_ETRS89DirInv import RasterIT_RER_ETRS89DirInv
-from ntv2_transformations.VectorCH_LV95ETRS89DirInv import VectorCH_LV95ETRS89DirInv
-from ntv2_transformations.RasterCH_LV95ETRS89DirInv import RasterCH_LV95ETRS89DirInv
-from ntv2_transformations.VectorUK_OSGB36ETRS89DirInv import VectorUK_OSGB36ETRS89DirInv
-from ntv2_transformations.RasterUK_OSGB36ETRS89DirInv import RasterUK_OSGB36ETRS89DirInv
-from ntv2_transformations.VectorKR_HDKSHTRS96DirInv import VectorKR_HDKSHTRS96DirInv
-from ntv2_transformations.RasterKR_HDKSHTRS96DirInv import RasterKR_HDKSHTRS96DirInv
-from ntv2_transformations.VectorCAT_ED50ETRS89DirInv import VectorCAT_ED50ETRS89DirInv
-from ntv2_transformations.RasterCAT_ED50ETRS89DirInv import RasterCAT_ED50ETRS89DirInv
-from ntv2_transformations.VectorNL_RDNAPETRS89DirInv import VectorNL_RDNAPETRS89DirInv
-from ntv2_transformations.RasterNL_RDNAPETRS89DirInv import RasterNL_RDNAPETRS89DirInv
-from ntv2_transformations.VectorAT_MGIETRS89DirInv import VectorAT_MGIETRS89DirInv
-from ntv2_transformations.RasterAT_MGIETRS89DirInv import RasterAT_MGIETRS89DirInv
-from ntv2_transformations.RasterAU_AGD66_84_GDA94DirInv import RasterAU_AGD66_84_GDA94DirInv
-from ntv2_transformations.VectorAU_AGD66_84_GDA94DirInv import VectorAU_AGD66_84_GDA94DirInv
-from ntv2_transformations.RasterAU_GDA94_2020DirInv import RasterAU_GDA94_2020DirInv
-from ntv2_transformations.VectorAU_GDA94_2020DirInv import VectorAU_GDA94_2020DirInv
+from ntv2_transformations.algorithms import ALGORITHMS
+from ntv2_transformations.LazyAlgorithm import LazyAlgorithm
+from ntv2_transformations.metrics import METRICS_FILE_SETTING
+from ntv2_transformations.workerpool import WORKER_POOL_SETTING, shutdown_pool
+
+IMPORT_TIME = time.perf_counter() - _importStart
 
 
 NTV2_ACTIVATE = 'NTV2_ACTIVATE'
+NTV2_DOWNLOAD_GRIDS = 'NTV2_DOWNLOAD_GRIDS'
+NTV2_CONVERT_GRIDS = 'NTV2_CONVERT_GRIDS'
+
+# Time allowed to import the provider modules and register the
+# algorithms, in seconds. The engines and the registry are only imported
+# when an algorithm is used, so going over it means something heavy is
+# imported again at load time.
+LOAD_BUDGET = 0.05
 
 
 class DETransformProvider(QgsProcessingProvider):
@@ -84,48 +78,57 @@ class DETransformProvider(QgsProcessingProvider):
                                     NTV2_ACTIVATE,
                                     'Activate',
                                     False))
+        ProcessingConfig.addSetting(Setting(self.name(),
+                                    NTV2_DOWNLOAD_GRIDS,
+                                    'Download missing NTv2 grids in background when QGIS starts',
+                                    True))
+        ProcessingConfig.addSetting(Setting(self.name(),
+                                    NTV2_CONVERT_GRIDS,
+                                    'Convert the NTv2 grids to GeoTIFF grids for faster access (PROJ >= 7)',
+                                    True))
+        ProcessingConfig.addSetting(Setting(self.name(),
+                                    METRICS_FILE_SETTING,
+                                    'Append the timing of every run to this file (JSON lines)',
+                                    '',
+                                    valuetype=Setting.FILE))
+        ProcessingConfig.addSetting(Setting(self.name(),
+                                    WORKER_POOL_SETTING,
+                                    'Run the transformations in a pool of warm worker processes',
+                                    False))
         ProcessingConfig.readSettings()
         self.refreshAlgorithms()
+        # Algorithms never download grids, they are fetched here once
+        if self.isActive() and ProcessingConfig.getSetting(NTV2_DOWNLOAD_GRIDS):
+            from ntv2_transformations.manifest import preflight_async
+            preflight_async(convertGrids=ProcessingConfig.getSetting(NTV2_CONVERT_GRIDS))
         return True
 
     def unload(self):
         ProcessingConfig.removeSetting(NTV2_ACTIVATE)
+        ProcessingConfig.removeSetting(NTV2_DOWNLOAD_GRIDS)
+        ProcessingConfig.removeSetting(NTV2_CONVERT_GRIDS)
+        ProcessingConfig.removeSetting(METRICS_FILE_SETTING)
+        ProcessingConfig.removeSetting(WORKER_POOL_SETTING)
+        shutdown_pool()
 
     def isActive(self):
         return ProcessingConfig.getSetting(NTV2_ACTIVATE)
 
     def setActive(self, active):
         ProcessingConfig.setSettingValue(NTV2_ACTIVATE, active)
+        if active and ProcessingConfig.getSetting(NTV2_DOWNLOAD_GRIDS):
+            from ntv2_transformations.manifest import preflight_async
+            preflight_async(convertGrids=ProcessingConfig.getSetting(NTV2_CONVERT_GRIDS))
 
     def getAlgs(self):
-        algs = [VectorPT_ETR89PTTM06DirInv(),
-                RasterPT_ETR89PTTM06DirInv(),
-                VectorDE_GK3ETRS8932NDirInv(),
-                RasterDE_GK3ETRS8932NDirInv(),
-                VectorES_ED50ERTS89DirInv(),
-                RasterES_ED50ERTS89DirInv(),
-                VectorIT_RER_ETRS89DirInv(),
-                RasterIT_RER_ETRS89DirInv(),
-                VectorCH_LV95ETRS89DirInv(),
-                RasterCH_LV95ETRS89DirInv(),
-                VectorUK_OSGB36ETRS89DirInv(),
-                RasterUK_OSGB36ETRS89DirInv(),
-                VectorKR_HDKSHTRS96DirInv(),
-                RasterKR_HDKSHTRS96DirInv(),
-                VectorCAT_ED50ETRS89DirInv(),
-                RasterCAT_ED50ETRS89DirInv(),
-                VectorNL_RDNAPETRS89DirInv(),
-                RasterNL_RDNAPETRS89DirInv(),
-                VectorAT_MGIETRS89DirInv(),
-                RasterAT_MGIETRS89DirInv(),
-                RasterAU_AGD66_84_GDA94DirInv(),
-                VectorAU_AGD66_84_GDA94DirInv(),
-                RasterAU_GDA94_2020DirInv(),
-                VectorAU_GDA94_2020DirInv(),
-               ]
-        return algs
+        return [LazyAlgorithm(info) for info in ALGORITHMS]
 
     def loadAlgorithms(self):
+        start = time.perf_counter()
         self.algs = self.getAlgs()
         for a in self.algs:
             self.addAlgorithm(a)
+        elapsed = IMPORT_TIME + time.perf_counter() - start
+        if elapsed > LOAD_BUDGET:
+            QgsMessageLog.logMessage('Modules imported and algorithms registered in {:.3f} s, over the {:.3f} s budget.'.format(elapsed, LOAD_BUDGET),
+                                     self.name(), Qgis.Warning)
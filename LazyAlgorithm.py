@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    LazyAlgorithm.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+
+from qgis.PyQt.QtGui import QIcon
+
+from qgis.core import QgsProcessingAlgorithm
+
+from ntv2_transformations.algorithms import create_algorithm
+
+pluginPath = os.path.dirname(__file__)
+
+
+class LazyAlgorithm(QgsProcessingAlgorithm):
+    """
+    Toolbox entry of an algorithm, built from its AlgorithmInfo. The
+    algorithm module is imported by createInstance(), i.e. the first time
+    QGIS creates the algorithm to show its dialog or run it.
+    """
+
+    def __init__(self, info):
+        super().__init__()
+        self.info = info
+
+    def name(self):
+        return self.info.name
+
+    def displayName(self):
+        return self.info.displayName
+
+    def group(self):
+        return self.info.group
+
+    def groupId(self):
+        return self.info.groupId
+
+    def tags(self):
+        return self.info.tags.split(',')
+
+    def shortHelpString(self):
+        return self.info.shortHelpString
+
+    def icon(self):
+        return QIcon(os.path.join(pluginPath, 'icons', self.info.icon))
+
+    def initAlgorithm(self, config=None):
+        # Parameters are defined by the algorithm returned by createInstance()
+        pass
+
+    def createInstance(self):
+        return create_algorithm(self.info)
+
+    def processAlgorithm(self, parameters, context, feedback):
+        algorithm = self.create()
+        return algorithm.processAlgorithm(parameters, context, feedback)
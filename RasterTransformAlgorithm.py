@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    RasterTransformAlgorithm.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+from qgis.core import (QgsProcessingException,
+                       QgsProcessingParameterRasterLayer,
+                       QgsProcessingParameterRasterDestination
+                      )
+
+from ntv2_transformations.RasterWarpAlgorithm import RasterWarpAlgorithm
+from ntv2_transformations.commands import gdalwarp_crs_arguments
+
+
+class RasterTransformAlgorithm(RasterWarpAlgorithm):
+    """
+    Warps a raster layer with gdalwarp.
+    """
+
+    KIND = 'raster'
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterRasterLayer(self.INPUT,
+                                                            'Input raster'))
+        self.addTransformationParameters()
+        self.addParameter(QgsProcessingParameterRasterDestination(self.OUTPUT,
+                                                                  'Output'))
+        self.addWarpParameters()
+
+    def getConsoleCommands(self, parameters, context, feedback, executing=True):
+        inLayer = self.parameterAsRasterLayer(parameters, self.INPUT, context)
+        if inLayer is None:
+            raise QgsProcessingException(self.invalidRasterError(parameters, self.INPUT))
+
+        outFile = self.parameterAsOutputLayer(parameters, self.OUTPUT, context)
+        self.setOutputValue(self.OUTPUT, outFile)
+
+        sourceSrs, targetSrs, sourceProj, targetProj = self.transformation(parameters, context)
+        arguments = gdalwarp_crs_arguments(sourceSrs, targetSrs, sourceProj, targetProj)
+
+        return self.warpCommands(parameters, context, arguments, inLayer.source(), outFile,
+                                 sourceProj=sourceProj, targetProj=targetProj)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    RasterWarpAlgorithm.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+
+from qgis.core import (QgsRasterFileWriter,
+                       QgsProcessingException,
+                       QgsProcessingParameterDefinition,
+                       QgsProcessingParameterBoolean,
+                       QgsProcessingParameterEnum,
+                       QgsProcessingParameterNumber
+                      )
+
+from processing.algs.gdal.GdalUtils import GdalUtils
+
+from ntv2_transformations.rasterwarp import COMPRESSIONS, error_threshold, pixel_size, warp, warp_options, warp_tiled
+from ntv2_transformations.displacement import cached_warp
+from ntv2_transformations.metrics import dataset_size, pixel_count
+from ntv2_transformations.TransformAlgorithm import TransformAlgorithm
+
+
+class RasterWarpAlgorithm(TransformAlgorithm):
+    """
+    Base class of the raster algorithms, adding the gdalwarp performance
+    parameters and the tiled parallel warp.
+    """
+
+    THREADS = 'THREADS'
+    WARP_MEMORY = 'WARP_MEMORY'
+    TILED = 'TILED'
+    COMPRESS = 'COMPRESS'
+    TILES = 'TILES'
+    DISPLACEMENT_CACHE = 'DISPLACEMENT_CACHE'
+    ERROR_THRESHOLD = 'ERROR_THRESHOLD'
+
+    def addWarpParameters(self):
+        params = [QgsProcessingParameterNumber(self.THREADS,
+                                               'Number of threads (0 = all CPUs)',
+                                               type=QgsProcessingParameterNumber.Integer,
+                                               minValue=0,
+                                               defaultValue=0),
+                  QgsProcessingParameterNumber(self.WARP_MEMORY,
+                                               'Warp memory in MB (0 = GDAL default)',
+                                               type=QgsProcessingParameterNumber.Integer,
+                                               minValue=0,
+                                               defaultValue=0),
+                  QgsProcessingParameterBoolean(self.TILED,
+                                                'Tiled output (GeoTIFF only)',
+                                                defaultValue=False),
+                  QgsProcessingParameterEnum(self.COMPRESS,
+                                             'Output compression (GeoTIFF only)',
+                                             options=COMPRESSIONS,
+                                             defaultValue=0),
+                  QgsProcessingParameterNumber(self.TILES,
+                                               'Split the output in N x N tiles warped in parallel (1 = no split)',
+                                               type=QgsProcessingParameterNumber.Integer,
+                                               minValue=1,
+                                               defaultValue=1),
+                  QgsProcessingParameterBoolean(self.DISPLACEMENT_CACHE,
+                                                'Cache the displacement field and reuse it for rasters with the same extent and resolution',
+                                                defaultValue=False),
+                  QgsProcessingParameterNumber(self.ERROR_THRESHOLD,
+                                               'Acceptable error in meters (0 = gdalwarp default). Passed to gdalwarp as -et, '
+                                               'which checks its approximation against the exact transformation; with the '
+                                               'displacement cache it also sets the sampling of the cached field',
+                                               type=QgsProcessingParameterNumber.Double,
+                                               minValue=0.0,
+                                               defaultValue=0.0)]
+        for p in params:
+            p.setFlags(p.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+            self.addParameter(p)
+
+    def warpCommands(self, parameters, context, arguments, source, outFile,
+                     sourceProj=None, targetProj=None):
+        """
+        Completes the CRS arguments with the performance options, input and
+        output, and returns the gdalwarp command. sourceProj/targetProj are the PROJ definitions carrying the grids
+        of authority CRSs, used by the displacement cache.
+        """
+        outputFormat = QgsRasterFileWriter.driverForExtension(os.path.splitext(outFile)[1])
+        threads = self.parameterAsInt(parameters, self.THREADS, context)
+        memory = self.parameterAsInt(parameters, self.WARP_MEMORY, context)
+        tiled = self.parameterAsBool(parameters, self.TILED, context)
+        compress = COMPRESSIONS[self.parameterAsEnum(parameters, self.COMPRESS, context)]
+        tolerance = self.parameterAsDouble(parameters, self.ERROR_THRESHOLD, context)
+
+        pixelSize = errorThreshold = None
+        if tolerance > 0:
+            try:
+                pixelSize = pixel_size(source, arguments[arguments.index('-s_srs') + 1])
+            except RuntimeError as e:
+                raise QgsProcessingException(str(e))
+            errorThreshold = error_threshold(tolerance, pixelSize)
+
+        self.warpJob = dict(arguments=list(arguments), source=source, output=outFile,
+                            outputFormat=outputFormat, threads=threads, memory=memory,
+                            tiled=tiled, compress=compress,
+                            sourceProj=sourceProj, targetProj=targetProj,
+                            tolerance=tolerance, pixelSize=pixelSize, errorThreshold=errorThreshold)
+
+        arguments = list(arguments)
+        arguments.extend(warp_options(threads, memory, tiled, compress, outputFormat, errorThreshold))
+        arguments.append('-of')
+        arguments.append(outputFormat)
+        arguments.append(source)
+        arguments.append(outFile)
+        self.commandLine = ['gdalwarp'] + arguments
+
+        return ['gdalwarp', GdalUtils.escapeAndJoin(arguments)]
+
+    def execute(self, parameters, context, feedback):
+        tiles = self.parameterAsInt(parameters, self.TILES, context)
+        cached = self.parameterAsBool(parameters, self.DISPLACEMENT_CACHE, context)
+        if tiles <= 1 and not cached and not self.workerPoolEnabled():
+            return super().execute(parameters, context, feedback)
+
+        self.getConsoleCommands(parameters, context, feedback, executing=True)
+        pool = self.workerPool() if tiles <= 1 else None
+        job = self.warpJob
+        try:
+            if tiles > 1:
+                warp_tiled(job['arguments'], job['source'], job['output'], job['outputFormat'], tiles,
+                           job['threads'], job['memory'], job['tiled'], job['compress'],
+                           progress=feedback.setProgress,
+                           canceled=feedback.isCanceled,
+                           errorThreshold=job['errorThreshold'],
+                           metrics=self.metrics)
+            elif pool is not None and not cached:
+                pool.run(warp, job['arguments'], job['source'], job['output'], job['outputFormat'],
+                         warp_options(job['threads'], job['memory'], job['tiled'], job['compress'],
+                                      job['outputFormat'], job['errorThreshold']),
+                         canceled=feedback.isCanceled)
+            else:
+                arguments = job['arguments']
+                options = warp_options(job['threads'], job['memory'], job['tiled'], job['compress'],
+                                       job['outputFormat'], job['errorThreshold'])
+                sourceSrs = arguments[arguments.index('-s_srs') + 1]
+                targetSrs = arguments[arguments.index('-t_srs') + 1]
+                if pool is not None:
+                    # The geolocation arrays are computed with the
+                    # transformation cached in the worker
+                    hit = pool.run(cached_warp, sourceSrs, targetSrs,
+                                   job['source'], job['output'], job['outputFormat'], options,
+                                   sourceProj=job['sourceProj'],
+                                   targetProj=job['targetProj'],
+                                   tolerance=job['tolerance'],
+                                   pixelSize=job['pixelSize'],
+                                   canceled=feedback.isCanceled)
+                else:
+                    hit = cached_warp(sourceSrs, targetSrs,
+                                      job['source'], job['output'], job['outputFormat'], options,
+                                      sourceProj=job['sourceProj'],
+                                      targetProj=job['targetProj'],
+                                      tolerance=job['tolerance'],
+                                      pixelSize=job['pixelSize'],
+                                      progress=feedback.setProgress,
+                                      canceled=feedback.isCanceled)
+                feedback.pushInfo('Displacement field {} cache.'.format('read from' if hit else 'added to'))
+        except RuntimeError as e:
+            raise QgsProcessingException(str(e))
+
+        return {self.OUTPUT: job['output']}
+
+    def countInput(self):
+        return pixel_count(self.warpJob['source']), 'pixels'
+
+    def measure(self, metrics):
+        job = self.warpJob
+        metrics.count('pixelsRead', self.workload()[0])
+        metrics.count('pixelsWritten', pixel_count(job['output']))
+        metrics.count('bytesRead', dataset_size(job['source']))
+        metrics.count('bytesWritten', dataset_size(job['output']))
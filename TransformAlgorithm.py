@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    TransformAlgorithm.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import platform
+
+from qgis.PyQt.QtGui import QIcon
+
+from qgis.core import (QgsApplication,
+                       QgsProcessingException,
+                       QgsProcessingParameterEnum,
+                       QgsSettings
+                      )
+
+from processing.algs.gdal.GdalAlgorithm import GdalAlgorithm
+from processing.algs.gdal.GdalUtils import GdalUtils
+from processing.core.ProcessingConfig import ProcessingConfig
+
+from ntv2_transformations.countries import (COUNTRIES_BY_KEY, algorithm_name, display_name, group_name,
+                                            help_string, selected_transformation, tags)
+from ntv2_transformations.commands import transformation_crs
+from ntv2_transformations.gdalrunner import run_console_command
+from ntv2_transformations.manifest import MISSING_GRIDS, MISSING_GRIDS_DOWNLOADING, missing_grids, preflight_running
+from ntv2_transformations.metrics import METRICS_FILE_SETTING, RunMetrics, metrics_path, stage, write_metrics
+from ntv2_transformations.workerpool import WORKER_POOL_SETTING, transformation_key, worker_pool
+
+pluginPath = os.path.dirname(__file__)
+
+
+class TransformAlgorithm(GdalAlgorithm):
+    """
+    Base class of the vector and raster engines. Metadata, parameters and
+    transformations come from the Country descriptor given by its key.
+    """
+
+    INPUT = 'INPUT'
+    TRANSF = 'TRANSF'
+    OUTPUT = 'OUTPUT'
+
+    KIND = None
+
+    def __init__(self, country):
+        super().__init__()
+        self.country = COUNTRIES_BY_KEY[country]
+        self.metrics = None
+        self.transformationKey = None
+        # Console command of the run, as a list with | and && separators,
+        # set by getConsoleCommands()
+        self.commandLine = None
+        self._workload = None
+
+    def createInstance(self):
+        return type(self)(self.country.key)
+
+    def name(self):
+        return algorithm_name(self.country, self.KIND)
+
+    def displayName(self):
+        return display_name(self.country, self.KIND)
+
+    def group(self):
+        return group_name(self.country)
+
+    def groupId(self):
+        return self.country.groupId
+
+    def tags(self):
+        return tags(self.country, self.KIND)
+
+    def shortHelpString(self):
+        return help_string(self.country, self.KIND)
+
+    def icon(self):
+        return QIcon(os.path.join(pluginPath, 'icons', '{}.png'.format(self.country.code)))
+
+    def addTransformationParameters(self):
+        self.addParameter(QgsProcessingParameterEnum(self.TRANSF,
+                                                     'Transformation',
+                                                     options=self.country.directions,
+                                                     defaultValue=0))
+        for name, label, options in self.country.parameters:
+            self.addParameter(QgsProcessingParameterEnum(name,
+                                                         label,
+                                                         options=[o[0] for o in options],
+                                                         defaultValue=0))
+
+    def transformation(self, parameters, context):
+        """
+        Returns source CRS, target CRS and their PROJ definitions for the
+        selected transformation and direction.
+        """
+        with stage(self.metrics, 'parameters'):
+            selection = [self.parameterAsEnum(parameters, name, context) for name, label, options in self.country.parameters]
+            found, t = selected_transformation(self.country, selection)
+            if not found:
+                raise QgsProcessingException(t)
+            inverse = self.parameterAsEnum(parameters, self.TRANSF, context) == 1
+
+        # Only the grids of this transformation, without waiting for the
+        # download started with the provider
+        with stage(self.metrics, 'grids'):
+            missing = missing_grids(t.gridFiles)
+        if missing:
+            message = MISSING_GRIDS_DOWNLOADING if preflight_running() else MISSING_GRIDS
+            raise QgsProcessingException(message.format(', '.join(missing)))
+
+        self.transformationKey = transformation_key(t, inverse)
+        if self.metrics is not None:
+            self.metrics.info.update(crs=t.crs, grid=t.grid, target=t.target,
+                                     direction='inverse' if inverse else 'direct')
+        return transformation_crs(t, inverse)
+
+    def processAlgorithm(self, parameters, context, feedback):
+        """
+        Runs execute() timing its stages. The report is pushed to feedback
+        as JSON and appended to the metrics file, when configured.
+        """
+        self.metrics = RunMetrics(self.name())
+        self._workload = None
+        self.setGdalEnvironment()
+        try:
+            with self.metrics.stage('transform'):
+                results = self.execute(parameters, context, feedback)
+            with self.metrics.stage('stats'):
+                self.measure(self.metrics)
+            self.metrics.finish()
+            return results
+        except BaseException:
+            self.metrics.finish('canceled' if feedback.isCanceled() else 'failed')
+            raise
+        finally:
+            self.reportMetrics(feedback)
+
+    def setGdalEnvironment(self):
+        """
+        Puts the GDAL utilities on PATH as GdalUtils.runGdal() does: the
+        ones bundled with QGIS on macOS, otherwise the folder of the
+        GdalTools/gdalPath setting.
+        """
+        path = os.environ.get('PATH', '')
+        bundled = os.path.join(QgsApplication.prefixPath(), 'bin')
+        if platform.system() == 'Darwin' and os.path.isfile(os.path.join(bundled, 'gdalinfo')):
+            if bundled not in path.split(os.pathsep):
+                os.environ['PATH'] = '{}{}{}'.format(bundled, os.pathsep, path)
+            os.environ['DYLD_LIBRARY_PATH'] = os.path.join(QgsApplication.prefixPath(), 'lib')
+        else:
+            gdalPath = QgsSettings().value('/GdalTools/gdalPath', '')
+            if gdalPath and gdalPath.lower() not in path.lower().split(os.pathsep):
+                os.environ['PATH'] = '{}{}{}'.format(path, os.pathsep, gdalPath)
+
+    def execute(self, parameters, context, feedback):
+        """
+        Runs the console command, reporting the GDAL progress, throughput
+        and time left. Canceling terminates all of its processes.
+        """
+        self.getConsoleCommands(parameters, context, feedback, executing=True)
+        feedback.pushCommandInfo(GdalUtils.escapeAndJoin(self.commandLine))
+
+        with stage(self.metrics, 'stats'):
+            total, unit = self.workload()
+        try:
+            run_console_command(self.commandLine,
+                                progress=feedback.setProgress,
+                                canceled=feedback.isCanceled,
+                                status=feedback.setProgressText,
+                                log=feedback.pushConsoleInfo,
+                                total=total,
+                                unit=unit)
+        except RuntimeError as e:
+            raise QgsProcessingException(str(e))
+
+        return dict(self.output_values)
+
+    def workerPoolEnabled(self):
+        return bool(ProcessingConfig.getSetting(WORKER_POOL_SETTING))
+
+    def workerPool(self):
+        """
+        Returns the shared pool of warm worker processes when enabled in
+        the provider settings, otherwise None. A pool started by this run
+        builds the selected transformation, known once transformation()
+        ran, in every worker.
+        """
+        if not self.workerPoolEnabled():
+            return None
+        return worker_pool(warm=[self.transformationKey])
+
+    def workload(self):
+        """
+        Returns the number of input features or pixels and the unit, as
+        known once getConsoleCommands() ran. Counted once per run.
+        """
+        if self._workload is None:
+            self._workload = self.countInput()
+        return self._workload
+
+    def countInput(self):
+        return None, None
+
+    def measure(self, metrics):
+        """
+        Adds the counters of the run (features or pixels, bytes read and
+        written) to metrics, once the output is written.
+        """
+        pass
+
+    def reportMetrics(self, feedback):
+        feedback.pushInfo(self.metrics.to_json())
+        path = metrics_path(ProcessingConfig.getSetting(METRICS_FILE_SETTING))
+        if path:
+            try:
+                write_metrics(self.metrics, path)
+            except OSError as e:
+                feedback.reportError('Unable to write metrics to {}: {}'.format(path, e))
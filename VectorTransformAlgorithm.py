@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    VectorTransformAlgorithm.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+
+from qgis.core import (QgsProcessingException,
+                       QgsProcessingParameterDefinition,
+                       QgsProcessingParameterBoolean,
+                       QgsProcessingParameterFeatureSource,
+                       QgsProcessingParameterNumber,
+                       QgsProcessingParameterVectorDestination
+                      )
+
+from processing.algs.gdal.GdalUtils import GdalUtils
+
+from ntv2_transformations.TransformAlgorithm import TransformAlgorithm
+from ntv2_transformations.commands import SINGLE_PASS_GDAL_VERSION, gdal_version, ogr2ogr_arguments
+from ntv2_transformations.vectortranslate import BATCH_SIZE, translate, translate_chunked
+from ntv2_transformations.arrowtransform import arrow_available, transform_arrow
+from ntv2_transformations.metrics import dataset_size, feature_count, stage
+
+
+class VectorTransformAlgorithm(TransformAlgorithm):
+    """
+    Transforms a vector layer with ogr2ogr.
+    """
+
+    KIND = 'vector'
+
+    IN_PROCESS = 'IN_PROCESS'
+    BATCH_SIZE = 'BATCH_SIZE'
+    CHUNKS = 'CHUNKS'
+    ARROW = 'ARROW'
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(self.INPUT,
+                                                              'Input vector'))
+        self.addTransformationParameters()
+        self.addParameter(QgsProcessingParameterVectorDestination(self.OUTPUT,
+                                                                  'Output'))
+
+        params = [QgsProcessingParameterBoolean(self.IN_PROCESS,
+                                                'Run in process, without ogr2ogr (GDAL >= 3.0)',
+                                                defaultValue=True),
+                  QgsProcessingParameterNumber(self.BATCH_SIZE,
+                                               'Features written per transaction',
+                                               type=QgsProcessingParameterNumber.Integer,
+                                               minValue=1,
+                                               defaultValue=BATCH_SIZE),
+                  QgsProcessingParameterNumber(self.CHUNKS,
+                                               'Split the layer in N chunks transformed in parallel (1 = no split)',
+                                               type=QgsProcessingParameterNumber.Integer,
+                                               minValue=1,
+                                               defaultValue=1),
+                  QgsProcessingParameterBoolean(self.ARROW,
+                                                'Columnar transformation of Arrow batches (GDAL >= 3.8 and pyarrow)',
+                                                defaultValue=False)]
+        for p in params:
+            p.setFlags(p.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+            self.addParameter(p)
+
+    def getConsoleCommands(self, parameters, context, feedback, executing=True):
+        # The input is rewritten to a temporary file when GDAL can not read it
+        with stage(self.metrics, 'export'):
+            ogrLayer, layerName = self.getOgrCompatibleSource(self.INPUT, parameters, context, feedback, executing)
+        outFile = self.parameterAsOutputLayer(parameters, self.OUTPUT, context)
+        self.setOutputValue(self.OUTPUT, outFile)
+
+        output, outputFormat = GdalUtils.ogrConnectionStringAndFormat(outFile, context)
+        if outputFormat in ('SQLite', 'GPKG') and os.path.isfile(output):
+            raise QgsProcessingException('Output file "{}" already exists.'.format(output))
+
+        sourceSrs, targetSrs, sourceProj, targetProj = self.transformation(parameters, context)
+        self.translateJob = dict(source=ogrLayer, layerName=layerName, output=output, outFile=outFile,
+                                 sourceSrs=sourceSrs, targetSrs=targetSrs, outputFormat=outputFormat,
+                                 sourceProj=sourceProj, targetProj=targetProj)
+
+        arguments = ogr2ogr_arguments(sourceSrs, targetSrs,
+                                      output, outputFormat, ogrLayer, layerName,
+                                      sourceProj=sourceProj,
+                                      targetProj=targetProj)
+        self.commandLine = ['ogr2ogr'] + arguments
+
+        return ['ogr2ogr', GdalUtils.escapeAndJoin(arguments)]
+
+    def execute(self, parameters, context, feedback):
+        inProcess = self.parameterAsBool(parameters, self.IN_PROCESS, context)
+        chunks = self.parameterAsInt(parameters, self.CHUNKS, context)
+        arrow = self.parameterAsBool(parameters, self.ARROW, context)
+        if arrow and not arrow_available():
+            raise QgsProcessingException('The Arrow transformation requires GDAL >= 3.8 and pyarrow.')
+        if gdal_version() < SINGLE_PASS_GDAL_VERSION:
+            return super().execute(parameters, context, feedback)
+        # The worker pool runs the in-process translation and the Arrow
+        # transformation, so ogr2ogr is still used when running in process
+        # is off
+        if not inProcess and chunks <= 1 and not arrow:
+            return super().execute(parameters, context, feedback)
+
+        self.getConsoleCommands(parameters, context, feedback, executing=True)
+        pool = self.workerPool() if chunks <= 1 else None
+        job = self.translateJob
+        batchSize = self.parameterAsInt(parameters, self.BATCH_SIZE, context)
+        try:
+            if arrow and pool is not None:
+                # Uses the transformation cached in the worker
+                pool.run(transform_arrow, job['source'], job['layerName'], job['output'],
+                         job['sourceSrs'], job['targetSrs'], job['outputFormat'],
+                         sourceProj=job['sourceProj'],
+                         targetProj=job['targetProj'],
+                         batchSize=batchSize,
+                         canceled=feedback.isCanceled)
+            elif arrow:
+                transform_arrow(job['source'], job['layerName'], job['output'],
+                                job['sourceSrs'], job['targetSrs'], job['outputFormat'],
+                                sourceProj=job['sourceProj'],
+                                targetProj=job['targetProj'],
+                                batchSize=batchSize,
+                                progress=feedback.setProgress,
+                                canceled=feedback.isCanceled)
+            elif chunks > 1:
+                translate_chunked(job['source'], job['layerName'], job['output'],
+                                  job['sourceSrs'], job['targetSrs'], job['outputFormat'], chunks,
+                                  sourceProj=job['sourceProj'],
+                                  targetProj=job['targetProj'],
+                                  batchSize=batchSize,
+                                  progress=feedback.setProgress,
+                                  canceled=feedback.isCanceled,
+                                  metrics=self.metrics)
+            elif pool is not None:
+                # Progress is not reported across processes
+                pool.run(translate, job['source'], job['layerName'], job['output'],
+                         job['sourceSrs'], job['targetSrs'], job['outputFormat'],
+                         sourceProj=job['sourceProj'],
+                         targetProj=job['targetProj'],
+                         batchSize=batchSize,
+                         canceled=feedback.isCanceled)
+            else:
+                translate(job['source'], job['layerName'], job['output'],
+                          job['sourceSrs'], job['targetSrs'], job['outputFormat'],
+                          sourceProj=job['sourceProj'],
+                          targetProj=job['targetProj'],
+                          batchSize=batchSize,
+                          progress=feedback.setProgress,
+                          canceled=feedback.isCanceled)
+        except RuntimeError as e:
+            raise QgsProcessingException(str(e))
+
+        return {self.OUTPUT: job['outFile']}
+
+    def countInput(self):
+        job = self.translateJob
+        return feature_count(job['source'], job['layerName']), 'features'
+
+    def measure(self, metrics):
+        job = self.translateJob
+        metrics.count('featuresRead', self.workload()[0])
+        metrics.count('featuresWritten', feature_count(job['output']))
+        metrics.count('bytesRead', dataset_size(job['source']))
+        metrics.count('bytesWritten', dataset_size(job['output']))
@@ -25,9 +25,10 @@ __copyright__ = '(C) 2019, Giovanni Manghi'
 
 __revision__ = '$Format:%H$'
 
-from ntv2_transformations.DETransformProviderPlugin import \
-    DETransformProviderPlugin
-
 
 def classFactory(iface):
+    # Imported here, so that the package can also be used without QGIS
+    # (e.g. python -m ntv2_transformations)
+    from ntv2_transformations.DETransformProviderPlugin import \
+        DETransformProviderPlugin
     return DETransformProviderPlugin()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    algorithms.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+from collections import namedtuple
+
+from ntv2_transformations.countries import (COUNTRIES, algorithm_name, display_name, group_name,
+                                            help_string, tags)
+
+# Everything the toolbox needs to list an algorithm, so the algorithm
+# classes are only imported when an algorithm is run
+AlgorithmInfo = namedtuple('AlgorithmInfo', ['kind', 'country', 'name', 'displayName', 'group', 'groupId',
+                                             'tags', 'shortHelpString', 'icon'])
+
+KINDS = ('vector', 'raster')
+
+ALGORITHMS = [AlgorithmInfo(kind, c.key, algorithm_name(c, kind), display_name(c, kind), group_name(c),
+                            c.groupId, ','.join(tags(c, kind)), help_string(c, kind), '{}.png'.format(c.code))
+              for c in COUNTRIES for kind in KINDS]
+
+ALGORITHMS_BY_NAME = {a.name: a for a in ALGORITHMS}
+
+
+def create_algorithm(info):
+    """
+    Imports the vector or raster engine and returns the algorithm for
+    info.
+    """
+    if info.kind == 'vector':
+        from ntv2_transformations.VectorTransformAlgorithm import VectorTransformAlgorithm
+        return VectorTransformAlgorithm(info.country)
+    from ntv2_transformations.RasterTransformAlgorithm import RasterTransformAlgorithm
+    return RasterTransformAlgorithm(info.country)
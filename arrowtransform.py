@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    arrowtransform.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import importlib.util
+
+from ntv2_transformations.commands import gdal_version
+from ntv2_transformations.transformations import proj_definition
+from ntv2_transformations.transformercache import cached_transformer
+from ntv2_transformations.vectortranslate import BATCH_SIZE
+
+# Layer.GetArrowStreamAsPyArrow() with GeoArrow geometries and
+# Layer.WritePyArrow() are available since GDAL 3.8
+ARROW_GDAL_VERSION = 3080000
+
+
+def arrow_available():
+    return gdal_version() >= ARROW_GDAL_VERSION and importlib.util.find_spec('pyarrow') is not None
+
+
+def geometry_dimensions(geometryType):
+    """
+    Coordinate dimensions of an OGR geometry type, e.g. 'xym'.
+    """
+    from osgeo import ogr
+
+    return 'xy' + ('z' if ogr.GT_HasZ(geometryType) else '') + ('m' if ogr.GT_HasM(geometryType) else '')
+
+
+def _check_finite(columns, valid):
+    import numpy
+
+    bad = valid & ~numpy.logical_and.reduce([numpy.isfinite(c) for c in columns])
+    if bad.any():
+        i = numpy.flatnonzero(bad)[0]
+        raise RuntimeError('{} coordinates could not be transformed, e.g. the one at index {}: '
+                           'they are probably outside the grids of the transformation.'.format(int(bad.sum()), int(i)))
+
+
+def transform_coordinates(array, transform, dimensions=None):
+    """
+    Returns a copy of a GeoArrow geometry array with its coordinate
+    buffers transformed, keeping the nesting and validity of the input.
+
+    Only x, y and z are transformed, m is copied. The dimensions of
+    interleaved coordinates are taken from the GeoArrow child field name
+    ('xy', 'xyz', 'xym', 'xyzm'), otherwise from dimensions, e.g. given by
+    geometry_dimensions(). RuntimeError is raised when a coordinate
+    cannot be transformed (inf), e.g. outside the grids.
+    """
+    import numpy
+    import pyarrow
+    import pyarrow.compute
+
+    if isinstance(array, pyarrow.ExtensionArray):
+        return pyarrow.ExtensionArray.from_storage(array.type, transform_coordinates(array.storage, transform, dimensions))
+
+    t = array.type
+    if pyarrow.types.is_list(t) or pyarrow.types.is_large_list(t):
+        values = transform_coordinates(array.values, transform, dimensions)
+        cls = pyarrow.LargeListArray if pyarrow.types.is_large_list(t) else pyarrow.ListArray
+        result = cls.from_arrays(array.offsets, values, mask=array.is_null() if array.null_count else None)
+        return result.cast(t)
+
+    if pyarrow.types.is_fixed_size_list(t):
+        # Interleaved coordinates
+        size = t.list_size
+        names = t.value_field.name.lower()
+        if len(names) != size or set(names) - set('xyzm'):
+            names = dimensions if dimensions and len(dimensions) == size else 'xyzm'[:size]
+        dims = [names.index(n) for n in ('x', 'y', 'z') if n in names]
+        flat = array.values.to_numpy(zero_copy_only=False).reshape(-1, size).copy()
+        columns = transform(*[flat[:, i] for i in dims])
+        for i, column in zip(dims, columns):
+            flat[:, i] = column
+
+        # Null points still have (meaningless) coordinates
+        valid = numpy.zeros(len(flat), dtype=bool)
+        valid[array.offset:array.offset + len(array)] = True
+        if array.null_count:
+            valid[array.offset:array.offset + len(array)] &= ~array.is_null().to_numpy(zero_copy_only=False)
+        _check_finite([flat[:, i] for i in dims], valid)
+
+        result = pyarrow.FixedSizeListArray.from_arrays(pyarrow.array(flat.ravel()), size)
+        result = result.slice(array.offset, len(array))
+        if array.null_count:
+            result = pyarrow.compute.if_else(array.is_null(), pyarrow.nulls(len(array), t), result)
+        return result.cast(t)
+
+    if pyarrow.types.is_struct(t):
+        # Separated coordinates, the fields are named after the dimension
+        names = [t.field(i).name.lower() for i in range(t.num_fields)]
+        columns = [c.to_numpy(zero_copy_only=False) for c in array.flatten()]
+        dims = [names.index(n) for n in ('x', 'y', 'z') if n in names]
+        transformed = transform(*[columns[i] for i in dims])
+        for i, column in zip(dims, transformed):
+            columns[i] = numpy.asarray(column)
+        valid = ~array.is_null().to_numpy(zero_copy_only=False)
+        _check_finite([columns[i] for i in dims], valid)
+        return pyarrow.StructArray.from_arrays([pyarrow.array(c) for c in columns], fields=list(t),
+                                               mask=array.is_null() if array.null_count else None)
+
+    raise RuntimeError('Unsupported geometry encoding {}.'.format(t))
+
+
+def transform_arrow(source, layerName, output, sourceSrs, targetSrs, outputFormat, sourceProj=None,
+                    targetProj=None, batchSize=BATCH_SIZE, progress=None, canceled=None):
+    """
+    Transforms a layer reading and writing Arrow record batches with
+    GeoArrow geometries. Coordinates are transformed a whole buffer at a
+    time, no feature is materialised in Python. Requires GDAL >= 3.8 and
+    pyarrow.
+    """
+    import pyarrow
+    from osgeo import ogr, osr
+
+    sourceDefinition = proj_definition(sourceSrs, sourceProj)
+    targetDefinition = proj_definition(targetSrs, targetProj)
+    if sourceDefinition is None or targetDefinition is None:
+        raise RuntimeError('No PROJ definition for {}.'.format(sourceSrs if sourceDefinition is None else targetSrs))
+    # PROJ definitions on both ends, so no axis swap: GeoArrow coordinates
+    # are always easting/longitude first
+    transform = cached_transformer(sourceDefinition, targetDefinition)
+
+    ds = ogr.Open(source)
+    if ds is None:
+        raise RuntimeError('Unable to open {}.'.format(source))
+    layer = ds.GetLayerByName(layerName) if layerName else ds.GetLayer(0)
+    geometryName = layer.GetGeometryColumn() or 'wkb_geometry'
+    total = max(layer.GetFeatureCount(), 1)
+
+    stream = layer.GetArrowStreamAsPyArrow(['GEOMETRY_ENCODING=GEOARROW',
+                                            'INCLUDE_FID=NO',
+                                            'MAX_FEATURES_IN_BATCH={}'.format(batchSize)])
+    schema = stream.schema
+    # Checked before the output is created
+    geometryIndex = schema.get_field_index(geometryName)
+    if geometryIndex < 0:
+        raise RuntimeError('Geometry column "{}" not found in the Arrow stream of {}.'.format(geometryName, source))
+
+    reference = osr.SpatialReference()
+    reference.SetFromUserInput(targetSrs)
+    reference.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+
+    driver = ogr.GetDriverByName(outputFormat)
+    out = driver.CreateDataSource(output)
+    if out is None:
+        raise RuntimeError('Unable to create {}.'.format(output))
+    outLayer = out.CreateLayer(layer.GetName(), reference, layer.GetGeomType(), ['ENCODING=UTF-8'])
+    dimensions = geometry_dimensions(layer.GetGeomType())
+
+    for field in schema:
+        if field.name != geometryName:
+            outLayer.CreateFieldFromPyArrowSchema(field)
+
+    done = 0
+    outLayer.StartTransaction()
+    for batch in stream:
+        if canceled is not None and canceled():
+            outLayer.RollbackTransaction()
+            raise RuntimeError('Canceled.')
+        columns = batch.columns
+        try:
+            columns[geometryIndex] = transform_coordinates(columns[geometryIndex], transform, dimensions)
+        except RuntimeError:
+            outLayer.RollbackTransaction()
+            raise
+        outLayer.WritePyArrow(pyarrow.RecordBatch.from_arrays(columns, schema=batch.schema))
+        done += batch.num_rows
+        if progress is not None:
+            progress(min(100.0, 100.0 * done / total))
+    outLayer.CommitTransaction()
+
+    out = None
+    ds = None
+    return output
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    batch.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from ntv2_transformations.transformations import transformations
+from ntv2_transformations.manifest import GRID_GROUPS, convert, missing_grids, preflight
+from ntv2_transformations.download import GridDownloadError
+from ntv2_transformations.commands import (ogr2ogr_arguments,
+                                           gdalwarp_arguments,
+                                           transformation_crs)
+from ntv2_transformations.rasterwarp import COMPRESSIONS, warp_options
+
+VECTOR_FORMATS = {'.shp': 'ESRI Shapefile',
+                  '.gpkg': 'GPKG',
+                  '.geojson': 'GeoJSON',
+                  '.json': 'GeoJSON',
+                  '.fgb': 'FlatGeobuf',
+                  '.sqlite': 'SQLite',
+                  '.gml': 'GML',
+                  '.kml': 'KML',
+                  '.tab': 'MapInfo File',
+                  '.csv': 'CSV',
+                 }
+
+RASTER_FORMATS = {'.tif': 'GTiff',
+                  '.tiff': 'GTiff',
+                  '.img': 'HFA',
+                  '.vrt': 'VRT',
+                  '.nc': 'netCDF',
+                  '.asc': 'AAIGrid',
+                 }
+
+
+def _crs(value):
+    # Plain numbers are EPSG codes
+    return 'EPSG:{}'.format(value) if value.isdigit() else value
+
+
+def find(country, crs, grid=None, target=None):
+    """
+    Returns the registry transformation matching the given spec. grid and
+    target can be omitted when only one transformation matches.
+    """
+    crs = _crs(crs)
+    target = _crs(target) if target else None
+    matches = [t for t in transformations(country)
+               if t.crs == crs and
+               (grid is None or t.grid == grid) and
+               (target is None or t.target == target)]
+    if not matches:
+        raise ValueError('No transformation found for given parameters combination.')
+    if len(matches) > 1:
+        raise ValueError('Several transformations match, please set grid and/or target: {}'.format(
+            ', '.join('{} -> {}'.format(t.grid, t.target) for t in matches)))
+    return matches[0]
+
+
+def _globRoot(pattern):
+    # Folder of a glob pattern before its first wildcard
+    parts = []
+    for part in pattern.replace('\\', '/').split('/'):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return '/'.join(parts) or ('/' if pattern.startswith('/') else '.')
+
+
+def expand_inputs(inputs, kind, recursive=False):
+    """
+    Returns the input files given as files, directories or glob patterns,
+    as (path, relative path) pairs. Directories and patterns only give
+    the files with a known extension, not e.g. the .dbf/.shx/.prj of a
+    shapefile. The relative path is the one under the
+    directory, or under the folder part of the pattern, so that outputs
+    can mirror the inputs tree.
+    """
+    formats = VECTOR_FORMATS if kind == 'vector' else RASTER_FORMATS
+
+    def matches(pattern):
+        return [f for f in sorted(glob.glob(pattern, recursive=recursive))
+                if os.path.isfile(f) and os.path.splitext(f)[1].lower() in formats]
+
+    files = []
+    for value in inputs:
+        if os.path.isdir(value):
+            pattern = os.path.join(value, '**', '*') if recursive else os.path.join(value, '*')
+            files.extend((f, os.path.relpath(f, value)) for f in matches(pattern))
+        elif glob.has_magic(value):
+            root = _globRoot(value)
+            files.extend((f, os.path.relpath(f, root)) for f in matches(value))
+        else:
+            files.append((value, os.path.basename(value)))
+    return files
+
+
+def build_job(transformation, inverse, kind, source, output, outputFormat=None, warpOptions=None):
+    """
+    Returns the command line (program and arguments) for one input.
+    warpOptions are the gdalwarp performance settings, as keyword
+    arguments of rasterwarp.warp_options().
+    """
+    sourceSrs, targetSrs, sourceProj, targetProj = transformation_crs(transformation, inverse)
+    ext = os.path.splitext(output)[1].lower()
+
+    if kind == 'vector':
+        outputFormat = outputFormat or VECTOR_FORMATS.get(ext)
+        if outputFormat is None:
+            raise ValueError('Unable to guess output format for "{}".'.format(output))
+        return ['ogr2ogr'] + ogr2ogr_arguments(sourceSrs, targetSrs, output, outputFormat, source, None,
+                                               sourceProj, targetProj, singlePass=True)
+
+    outputFormat = outputFormat or RASTER_FORMATS.get(ext)
+    if outputFormat is None:
+        raise ValueError('Unable to guess output format for "{}".'.format(output))
+    options = warp_options(outputFormat=outputFormat, **(warpOptions or {}))
+    return ['gdalwarp'] + gdalwarp_arguments(sourceSrs, targetSrs, source, output, outputFormat,
+                                             sourceProj, targetProj, options)
+
+
+def run_job(command):
+    """
+    Runs a command in a worker process, returns its exit code, error
+    output and duration.
+    """
+    start = time.monotonic()
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    return result.returncode, result.stderr.strip(), time.monotonic() - start
+
+
+def run_batch(commands, jobs=None, log=None):
+    """
+    Runs (name, command) pairs on a process pool, with at most jobs
+    commands running and queued at any time. Returns the names of the
+    failed commands.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    log = log or (lambda message: print(message, file=sys.stderr))
+    failed = []
+    total = len(commands)
+    done = 0
+    pending = {}
+    queue = iter(commands)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while True:
+            # Keep the queue bounded, 40k layers must not mean 40k futures
+            for name, command in queue:
+                pending[pool.submit(run_job, command)] = name
+                if len(pending) >= jobs * 2:
+                    break
+
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = pending.pop(future)
+                done += 1
+                try:
+                    code, errors, seconds = future.result()
+                except Exception as e:
+                    code, errors, seconds = -1, str(e), 0.0
+                if code == 0:
+                    log('[{}/{}] {}: done in {:.1f} s'.format(done, total, name, seconds))
+                else:
+                    failed.append(name)
+                    log('[{}/{}] {}: failed ({})'.format(done, total, name, code))
+                    if errors:
+                        log(errors)
+
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ntv2_transformations',
+                                     description='Batch NTv2 datum transformations with ogr2ogr/gdalwarp.')
+    parser.add_argument('--list', action='store_true', help='list the supported transformations and exit')
+    parser.add_argument('--fetch-grids', nargs='*', metavar='GROUP',
+                        help='download the missing grids (all, or the given groups: {}) and exit'.format(', '.join(sorted(GRID_GROUPS))))
+    parser.add_argument('--convert-grids', nargs='*', metavar='GROUP',
+                        help='convert the NTv2 grids (all, or the given groups) to GeoTIFF grids, used instead of the .gsb files with PROJ >= 7, and exit')
+    parser.add_argument('-c', '--country', help='country code, e.g. pt')
+    parser.add_argument('-s', '--crs', help='old CRS, e.g. EPSG:20791 or 20791')
+    parser.add_argument('-g', '--grid', help='NTv2 grid, e.g. pt_e89')
+    parser.add_argument('-t', '--target', help='new CRS, e.g. EPSG:3763')
+    parser.add_argument('-i', '--inverse', action='store_true', help='inverse transformation (new CRS -> old CRS)')
+    parser.add_argument('-k', '--kind', choices=('vector', 'raster'), default='vector', help='type of the inputs')
+    parser.add_argument('-o', '--output-dir', help='directory for the outputs')
+    parser.add_argument('-f', '--format', help='output format (GDAL driver), default from the output extension')
+    parser.add_argument('-e', '--extension', help='output extension, default the same of the input')
+    parser.add_argument('--threads', type=int, default=0, help='gdalwarp threads per job, default the CPUs shared among the jobs')
+    parser.add_argument('--warp-memory', type=int, default=0, help='gdalwarp memory in MB, default the GDAL one')
+    parser.add_argument('--tiled', action='store_true', help='write tiled GeoTIFF outputs')
+    parser.add_argument('--compress', choices=COMPRESSIONS, help='GeoTIFF output compression')
+    parser.add_argument('-r', '--recursive', action='store_true', help='scan directories recursively')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of parallel jobs, default the number of CPUs')
+    parser.add_argument('--overwrite', action='store_true', help='overwrite existing outputs, otherwise they are skipped')
+    parser.add_argument('--dry-run', action='store_true', help='only print the commands')
+    parser.add_argument('inputs', nargs='*', help='input files, directories or glob patterns')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for t in transformations(args.country):
+            print('{}\t{}\t{}\t{}'.format(t.country, t.crs, t.grid, t.target))
+        return 0
+
+    if args.fetch_grids is not None:
+        unknown = [g for g in args.fetch_grids if g not in GRID_GROUPS]
+        if unknown:
+            parser.error('Unknown grid groups: {}'.format(', '.join(unknown)))
+        try:
+            for path in preflight(args.fetch_grids or None):
+                print(path)
+        except GridDownloadError as e:
+            print(e, file=sys.stderr)
+            return 1
+        return 0
+
+    if args.convert_grids is not None:
+        unknown = [g for g in args.convert_grids if g not in GRID_GROUPS]
+        if unknown:
+            parser.error('Unknown grid groups: {}'.format(', '.join(unknown)))
+        try:
+            for path in convert(args.convert_grids or None):
+                print(path)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+        return 0
+
+    if not (args.country and args.crs and args.inputs and args.output_dir):
+        parser.error('--country, --crs, --output-dir and at least one input are required')
+
+    try:
+        transformation = find(args.country, args.crs, args.grid, args.target)
+    except ValueError as e:
+        parser.error(str(e))
+
+    missing = missing_grids(transformation.gridFiles)
+    if missing:
+        parser.error('Grid files not found: {}, run with --fetch-grids first.'.format(', '.join(missing)))
+
+    # Jobs run side by side, the CPUs are shared among their warps
+    jobs = args.jobs or os.cpu_count() or 1
+    threads = args.threads or max(1, (os.cpu_count() or 1) // jobs)
+
+    outputs = {}
+    for source, relative in expand_inputs(args.inputs, args.kind, args.recursive):
+        if not os.path.exists(source):
+            parser.error('Input "{}" not found.'.format(source))
+        # Outputs mirror the inputs tree, so same named inputs of
+        # different folders do not collide
+        stem, ext = os.path.splitext(relative)
+        output = os.path.normpath(os.path.join(args.output_dir, stem + (args.extension or ext)))
+        if output in outputs:
+            parser.error('Inputs "{}" and "{}" would both be written to "{}".'.format(outputs[output], source, output))
+        outputs[output] = source
+
+    commands = []
+    skipped = 0
+    for output, source in outputs.items():
+        if os.path.exists(output) and not args.overwrite:
+            print('Skipping "{}": "{}" exists, use --overwrite to replace it.'.format(source, output), file=sys.stderr)
+            skipped += 1
+            continue
+        try:
+            command = build_job(transformation, args.inverse, args.kind, source, output, args.format,
+                                dict(threads=threads, memory=args.warp_memory,
+                                     tiled=args.tiled, compress=args.compress))
+        except ValueError as e:
+            parser.error(str(e))
+        if args.overwrite:
+            # ogr2ogr deletes the whole layer, with its sidecar files
+            command.insert(1, '-overwrite')
+        commands.append((source, command))
+
+    if skipped:
+        print('{} of {} inputs skipped, their outputs exist.'.format(skipped, len(outputs)), file=sys.stderr)
+
+    if not args.dry_run:
+        for output in outputs:
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+    if args.dry_run:
+        for name, command in commands:
+            print(subprocess.list2cmdline(command))
+        return 0
+
+    failed = run_batch(commands, jobs)
+    return 1 if failed else 0
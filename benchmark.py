@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    benchmark.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import time
+
+from ntv2_transformations.gridgen import constant_field, nested_subgrids, smooth_field, write_gsb, write_gtx
+from ntv2_transformations.manifest import GRIDS_PATH_VARIABLE, MANIFEST
+from ntv2_transformations.transformations import proj_definition, transformations
+from ntv2_transformations.commands import gdalwarp_crs_arguments, transformation_crs
+
+# Benchmarks run offline: every grid of the manifest is replaced by a
+# small synthetic one covering the area of its country, with a constant
+# shift. Timings are then comparable between runs and machines, not with
+# the real grids.
+
+SIZES = {'1k': 1000,
+         '100k': 100000,
+         '10M': 10000000,
+        }
+
+KINDS = ('point', 'line', 'polygon', 'raster')
+MODES = ('subprocess', 'inprocess', 'arrow')
+
+# Area of the grids of each country as (west, south, east, north), degrees
+EXTENTS = {'at': (9.5, 46.4, 17.2, 49.0),
+           'au': (112.0, -44.0, 154.0, -10.0),
+           'cat': (0.1, 40.5, 3.4, 42.9),
+           'ch': (5.9, 45.8, 10.5, 47.8),
+           'de': (5.8, 47.2, 15.1, 55.1),
+           'es': (-9.4, 35.9, 3.4, 43.8),
+           'hr': (13.4, 42.3, 19.5, 46.6),
+           'it': (9.2, 43.7, 12.8, 45.2),
+           'nl': (3.2, 50.7, 7.3, 53.6),
+           'pt': (-9.6, 36.9, -6.1, 42.2),
+           'uk': (-8.2, 49.8, 2.0, 60.9),
+          }
+
+# Cells per side of the synthetic grids
+GRID_CELLS = 64
+
+# Grid lookup sweep: nesting depths, root resolutions (degrees) and points
+LOOKUP_DEPTHS = (0, 1, 2, 3)
+LOOKUP_RESOLUTIONS = (0.1, 0.02)
+LOOKUP_EXTENT = (-10.0, 36.0, -6.0, 42.0)
+LOOKUP_POINTS = 1000000
+
+# Vertices of the synthetic lines and size of lines and polygons, degrees
+LINE_VERTICES = 8
+FEATURE_SIZE = 0.001
+
+LAYER_NAME = 'data'
+SEED = 12345
+
+
+def _country(name):
+    return MANIFEST[name].group.split('_')[0]
+
+
+def write_grids(path):
+    """
+    Writes a synthetic replacement of every grid of the manifest in path.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name in MANIFEST:
+        extent = EXTENTS[_country(name)]
+        west, south, east, north = extent
+        resolution = max(east - west, north - south) / GRID_CELLS
+        if name.lower().endswith('.gtx'):
+            write_gtx(os.path.join(path, name), extent, resolution)
+        else:
+            write_gsb(os.path.join(path, name), nested_subgrids(extent, resolution), constant_field())
+    return path
+
+
+def sample_extent(sourceSrs, targetSrs, sourceProj, targetProj, country):
+    """
+    Part of the country grids the data is generated in: the central half,
+    within the UTM zone when either side is UTM.
+    """
+    west, south, east, north = EXTENTS[country]
+    for definition in (proj_definition(sourceSrs, sourceProj), proj_definition(targetSrs, targetProj)):
+        zone = re.search(r'\+zone=(\d+)', definition or '')
+        if zone:
+            meridian = int(zone.group(1)) * 6 - 183
+            west, east = max(west, meridian - 3.0), min(east, meridian + 3.0)
+    if west >= east:
+        raise ValueError('The grid area is outside the UTM zone.')
+    dx, dy = (east - west) / 4.0, (north - south) / 4.0
+    return west + dx, south + dy, east - dx, north - dy
+
+
+def _reference(srs):
+    from osgeo import osr
+
+    reference = osr.SpatialReference()
+    reference.SetFromUserInput(srs)
+    reference.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return reference
+
+
+def _project(srs):
+    """
+    Returns a function projecting (N, 2) longitudes/latitudes of the datum
+    of srs to srs coordinates. No datum shift is involved.
+    """
+    import numpy
+    from osgeo import osr
+
+    reference = _reference(srs)
+    geographic = reference.CloneGeogCS()
+    geographic.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    ct = osr.CoordinateTransformation(geographic, reference)
+
+    def project(points):
+        return numpy.array(ct.TransformPoints(points.tolist()))[:, :2]
+
+    return project
+
+
+def write_vector(path, srs, kind, count, extent, seed=SEED):
+    """
+    Writes a GeoPackage layer of count random points, lines or polygons
+    in extent, in the srs coordinates.
+    """
+    import numpy
+    from osgeo import ogr
+
+    west, south, east, north = extent
+    rng = numpy.random.default_rng(seed)
+    project = _project(srs)
+    types = {'point': ogr.wkbPoint, 'line': ogr.wkbLineString, 'polygon': ogr.wkbPolygon}
+    if kind == 'point':
+        offsets = numpy.zeros((1, 2))
+    elif kind == 'line':
+        offsets = numpy.cumsum(rng.uniform(-FEATURE_SIZE, FEATURE_SIZE, (LINE_VERTICES, 2)), axis=0)
+    else:
+        offsets = numpy.array([(0, 0), (FEATURE_SIZE, 0), (FEATURE_SIZE, FEATURE_SIZE), (0, FEATURE_SIZE), (0, 0)])
+
+    ds = ogr.GetDriverByName('GPKG').CreateDataSource(path)
+    layer = ds.CreateLayer(LAYER_NAME, _reference(srs), types[kind])
+    layer.CreateField(ogr.FieldDefn('id', ogr.OFTInteger64))
+    definition = layer.GetLayerDefn()
+
+    batch = 100000
+    for start in range(0, count, batch):
+        n = min(batch, count - start)
+        anchors = numpy.column_stack((rng.uniform(west, east, n), rng.uniform(south, north, n)))
+        vertices = project((anchors[:, None, :] + offsets[None, :, :]).reshape(-1, 2)).reshape(n, len(offsets), 2)
+        layer.StartTransaction()
+        for i in range(n):
+            if kind == 'point':
+                wkt = 'POINT ({} {})'.format(*vertices[i, 0])
+            else:
+                coordinates = ','.join('{} {}'.format(x, y) for x, y in vertices[i])
+                wkt = 'LINESTRING ({})'.format(coordinates) if kind == 'line' else 'POLYGON (({}))'.format(coordinates)
+            feature = ogr.Feature(definition)
+            feature.SetField(0, start + i)
+            feature.SetGeometryDirectly(ogr.CreateGeometryFromWkt(wkt))
+            layer.CreateFeature(feature)
+        layer.CommitTransaction()
+    ds = None
+    return path
+
+
+def write_raster(path, srs, pixels, extent):
+    """
+    Writes a square Float32 GeoTIFF of about the given number of pixels
+    covering extent, in the srs coordinates.
+    """
+    import numpy
+    from osgeo import gdal
+
+    west, south, east, north = extent
+    corners = _project(srs)(numpy.array([(west, south), (west, north), (east, south), (east, north)]))
+    x0, y0 = corners.min(axis=0)
+    x1, y1 = corners.max(axis=0)
+    side = int(math.ceil(math.sqrt(pixels)))
+
+    ds = gdal.GetDriverByName('GTiff').Create(path, side, side, 1, gdal.GDT_Float32, ['TILED=YES'])
+    ds.SetProjection(_reference(srs).ExportToWkt())
+    ds.SetGeoTransform((x0, (x1 - x0) / side, 0.0, y1, 0.0, -(y1 - y0) / side))
+    band = ds.GetRasterBand(1)
+    rows = max(1, 4 * 1024 * 1024 // side)
+    for row in range(0, side, rows):
+        n = min(rows, side - row)
+        band.WriteArray(numpy.add.outer(numpy.arange(row, row + n, dtype=numpy.float32), numpy.arange(side, dtype=numpy.float32)), 0, row)
+    ds = None
+    return path
+
+
+def cases(countries=None, kinds=KINDS, sizes=('1k',), modes=MODES):
+    """
+    Returns the benchmark cases, as dicts, for every transformation and
+    direction of the given countries (all by default).
+    """
+    result = []
+    for t in transformations():
+        if countries and t.country not in countries:
+            continue
+        for inverse in (False, True):
+            for kind in kinds:
+                for size in sizes:
+                    for mode in modes:
+                        if kind == 'raster' and mode == 'arrow':
+                            continue
+                        result.append(dict(country=t.country, crs=t.crs, grid=t.grid, target=t.target,
+                                           direction='inverse' if inverse else 'direct',
+                                           kind=kind, size=size, mode=mode))
+    return result
+
+
+def case_id(case):
+    return '{country}:{crs}:{grid}:{target}:{direction}:{kind}:{size}:{mode}'.format(**case)
+
+
+def _input(case, workPath, write=True):
+    """
+    Returns the input of a case, written on first use and shared by the
+    cases with the same source CRS, area, kind and size. With write off,
+    a missing input raises RuntimeError.
+    """
+    from ntv2_transformations.transformations import find_transformation
+
+    t = find_transformation(case['country'], case['crs'], case['grid'], case['target'])
+    sourceSrs, targetSrs, sourceProj, targetProj = transformation_crs(t, case['direction'] == 'inverse')
+    extent = sample_extent(sourceSrs, targetSrs, sourceProj, targetProj, t.country)
+    key = re.sub(r'[^A-Za-z0-9]+', '_', '{}_{}_{}_{}'.format(sourceSrs, '_'.join('{:.3f}'.format(v) for v in extent), case['kind'], case['size']))
+    if case['kind'] == 'raster':
+        path = os.path.join(workPath, 'inputs', key + '.tif')
+    else:
+        path = os.path.join(workPath, 'inputs', key + '.gpkg')
+    if not os.path.exists(path):
+        if not write:
+            raise RuntimeError('Input {} not written.'.format(path))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmpPath = path + '.tmp' + os.path.splitext(path)[1]
+        if case['kind'] == 'raster':
+            write_raster(tmpPath, sourceSrs, SIZES[case['size']], extent)
+        else:
+            write_vector(tmpPath, sourceSrs, case['kind'], SIZES[case['size']], extent)
+        os.replace(tmpPath, path)
+    return t, sourceSrs, targetSrs, sourceProj, targetProj, path
+
+
+def _peak_rss():
+    """
+    Peak resident memory of this process and its children, in MB, None
+    when not available (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def run_case(case, workPath, connection=None):
+    """
+    Runs a case and returns the case with its wall time (seconds), peak
+    RSS (MB) and throughput (features or pixels per second). Meant to run
+    in a fresh process, so the peak RSS is the one of this case only.
+    """
+    import subprocess
+    from ntv2_transformations.batch import build_job
+    from ntv2_transformations.rasterwarp import warp_options
+
+    result = dict(case)
+    try:
+        # Written beforehand by prepare_input(), not to measure it here
+        t, sourceSrs, targetSrs, sourceProj, targetProj, source = _input(case, workPath, write=False)
+        raster = case['kind'] == 'raster'
+        output = os.path.join(workPath, 'outputs', '{}.{}'.format(re.sub(r'[^A-Za-z0-9]+', '_', case_id(case)), 'tif' if raster else 'gpkg'))
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        if os.path.exists(output):
+            os.remove(output)
+
+        start = time.perf_counter()
+        if case['mode'] == 'subprocess':
+            command = build_job(t, case['direction'] == 'inverse', 'raster' if raster else 'vector', source, output)
+            process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+            if process.returncode != 0:
+                raise RuntimeError(process.stderr.strip() or '{} failed.'.format(command[0]))
+        elif raster:
+            from osgeo import gdal
+            options = gdalwarp_crs_arguments(sourceSrs, targetSrs, sourceProj, targetProj) + warp_options()
+            if gdal.Warp(output, source, options=options) is None:
+                raise RuntimeError(gdal.GetLastErrorMsg() or 'gdal.Warp failed.')
+        elif case['mode'] == 'inprocess':
+            from ntv2_transformations.vectortranslate import translate
+            translate(source, LAYER_NAME, output, sourceSrs, targetSrs, 'GPKG', sourceProj, targetProj)
+        else:
+            from ntv2_transformations.arrowtransform import arrow_available, transform_arrow
+            if not arrow_available():
+                raise RuntimeError('Arrow requires GDAL >= 3.8 and pyarrow.')
+            transform_arrow(source, LAYER_NAME, output, sourceSrs, targetSrs, 'GPKG', sourceProj, targetProj)
+        seconds = time.perf_counter() - start
+
+        count = SIZES[case['size']]
+        if raster:
+            count = int(math.ceil(math.sqrt(count))) ** 2
+        result.update(status='ok', seconds=seconds, peakRss=_peak_rss(), throughput=count / seconds if seconds else None)
+    except Exception as e:
+        result.update(status='failed', error=str(e))
+
+    if connection is not None:
+        connection.send(result)
+        connection.close()
+    return result
+
+
+def _write_input(case, workPath):
+    _input(case, workPath)
+
+
+def prepare_input(case, workPath):
+    """
+    Writes the input of a case in a new process, so that neither the
+    case nor this process keep the memory used to generate it.
+    """
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=_write_input, args=(case, workPath))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError('Input generation exited with code {}.'.format(process.exitcode))
+
+
+def run_isolated(case, workPath):
+    """
+    Writes the input of a case, then runs the case in a new process.
+    """
+    try:
+        prepare_input(case, workPath)
+    except RuntimeError as e:
+        return dict(case, status='failed', error=str(e))
+
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=run_case, args=(case, workPath, sender))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = dict(case, status='failed', error='Process exited with code {}.'.format(process.exitcode))
+    process.join()
+    return result
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns (case id, baseline seconds, seconds) of the cases slower than
+    threshold times their baseline.
+    """
+    previous = {case_id(r): r for r in baseline if r.get('status') == 'ok'}
+    slower = []
+    for r in results:
+        before = previous.get(case_id(r))
+        if r.get('status') == 'ok' and before is not None and r['seconds'] > before['seconds'] * threshold:
+            slower.append((case_id(r), before['seconds'], r['seconds']))
+    return slower
+
+
+def lookup(workPath, depths=LOOKUP_DEPTHS, resolutions=LOOKUP_RESOLUTIONS, points=LOOKUP_POINTS, branching=2, refinement=2):
+    """
+    Times the NTv2 shift of points random points on synthetic grids of
+    growing sub-grid count and density, and checks the interpolation
+    against the analytic field. Returns a result dict for every grid.
+    """
+    import numpy
+    from ntv2_transformations.gridgen import field_error
+    from ntv2_transformations.gridshift import shift_points
+    from ntv2_transformations.gsb import GsbFile
+
+    field = smooth_field()
+    west, south, east, north = LOOKUP_EXTENT
+    rng = numpy.random.default_rng(SEED)
+    lon = rng.uniform(west, east, points)
+    lat = rng.uniform(south, north, points)
+
+    results = []
+    os.makedirs(os.path.join(workPath, 'lookup'), exist_ok=True)
+    for resolution in resolutions:
+        for depth in depths:
+            subgrids = nested_subgrids(LOOKUP_EXTENT, resolution, depth, branching, refinement)
+            path = os.path.join(workPath, 'lookup', 'grid_{}_{}.gsb'.format(resolution, depth))
+            write_gsb(path, subgrids, field)
+
+            # Opening and indexing are timed apart from the shift itself
+            start = time.perf_counter()
+            grid = GsbFile(path)
+            grid.index
+            indexSeconds = time.perf_counter() - start
+            start = time.perf_counter()
+            shift_points(lon, lat, grid)
+            seconds = time.perf_counter() - start
+            maximum, rms = field_error(grid, field)
+            grid.close()
+
+            results.append(dict(kind='lookup', resolution=resolution, depth=depth, subgrids=len(subgrids),
+                                size=os.path.getsize(path), points=points, indexSeconds=indexSeconds,
+                                seconds=seconds, throughput=points / seconds if seconds else None,
+                                maxError=maximum, rmsError=rms, status='ok'))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ntv2_transformations.benchmark',
+                                     description='Benchmark the transformations on synthetic data and grids, offline.')
+    parser.add_argument('-c', '--country', action='append', help='country code, can be repeated, default all')
+    parser.add_argument('-k', '--kind', action='append', choices=KINDS, help='data kind, can be repeated, default all')
+    parser.add_argument('-s', '--size', action='append', choices=sorted(SIZES), help='data size, can be repeated, default 1k')
+    parser.add_argument('-m', '--mode', action='append', choices=MODES,
+                        help='execution path: ogr2ogr/gdalwarp subprocess, in-process GDAL or Arrow batches, default all')
+    parser.add_argument('-w', '--work-dir', help='directory for grids, inputs and outputs, kept between runs to reuse the inputs')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=1.2, help='slowdown ratio reported as a regression, default 1.2')
+    parser.add_argument('--list', action='store_true', help='only list the cases')
+    parser.add_argument('--lookup', action='store_true',
+                        help='only time the grid lookup and interpolation on synthetic grids of growing sub-grid count and density')
+    args = parser.parse_args(argv)
+
+    if args.lookup:
+        results = lookup(args.work_dir or tempfile.mkdtemp(prefix='ntv2_benchmark_'))
+        for r in results:
+            print('{} sub-grids ({} deg, depth {}): index {:.3f} s, {:.0f} points/s, max error {:.6f}", RMS {:.6f}"'.format(
+                r['subgrids'], r['resolution'], r['depth'], r['indexSeconds'], r['throughput'], r['maxError'], r['rmsError']))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=1)
+        return 0
+
+    selected = cases(args.country, args.kind or KINDS, args.size or ('1k',), args.mode or MODES)
+    if args.list:
+        for case in selected:
+            print(case_id(case))
+        return 0
+
+    workPath = args.work_dir or tempfile.mkdtemp(prefix='ntv2_benchmark_')
+    # Inherited by the case processes, so they load the synthetic grids
+    os.environ[GRIDS_PATH_VARIABLE] = write_grids(os.path.join(workPath, 'grids'))
+
+    results = []
+    for i, case in enumerate(selected):
+        result = run_isolated(case, workPath)
+        results.append(result)
+        if result['status'] == 'ok':
+            rss = '{:.0f} MB'.format(result['peakRss']) if result['peakRss'] is not None else '-'
+            print('[{}/{}] {}: {:.3f} s, {}, {:.0f}/s'.format(i + 1, len(selected), case_id(case), result['seconds'], rss, result['throughput']))
+        else:
+            print('[{}/{}] {}: failed ({})'.format(i + 1, len(selected), case_id(case), result['error']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+
+    failed = [r for r in results if r['status'] != 'ok']
+    slower = []
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(results, json.load(f), args.threshold)
+        for name, before, seconds in slower:
+            print('Regression: {} {:.3f} s -> {:.3f} s'.format(name, before, seconds))
+    return 1 if failed or slower else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
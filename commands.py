@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    commands.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+from ntv2_transformations.transformations import proj_pipeline
+from ntv2_transformations.rasterwarp import warp_options
+
+# ogr2ogr -ct is available since GDAL 3.0
+SINGLE_PASS_GDAL_VERSION = 3000000
+
+
+def gdal_version():
+    try:
+        from osgeo import gdal
+    except ImportError:
+        return 0
+    return int(gdal.VersionInfo('VERSION_NUM'))
+
+
+def ogr2ogr_options(sourceSrs, targetSrs, outputFormat, sourceProj=None, targetProj=None):
+    """
+    Single pass ogr2ogr options, without the datasets and layer names, as
+    also taken by gdal.VectorTranslate().
+    """
+    arguments = []
+    arguments.append('-s_srs')
+    arguments.append(sourceSrs)
+    arguments.append('-t_srs')
+    arguments.append(targetSrs)
+    arguments.append('-ct')
+    arguments.append(proj_pipeline(sourceSrs, targetSrs, sourceProj, targetProj))
+
+    arguments.append('-f')
+    arguments.append(outputFormat)
+    arguments.append('-lco')
+    arguments.append('ENCODING=UTF-8')
+    return arguments
+
+
+def ogr2ogr_arguments(sourceSrs, targetSrs, output, outputFormat, ogrLayer, layerName, sourceProj=None, targetProj=None, singlePass=None):
+    """
+    ogr2ogr arguments transforming a layer from sourceSrs to targetSrs and
+    writing it with targetSrs as CRS. sourceProj/targetProj are the PROJ
+    definitions carrying the grids, when the CRSs are authority codes.
+
+    In single pass mode the grid shift is given to ogr2ogr as an explicit
+    pipeline and the output is written directly. Otherwise, with GDAL
+    older than 3.0, features are piped as GeoJSON to a second ogr2ogr
+    which assigns the target CRS.
+    """
+    if singlePass is None:
+        singlePass = gdal_version() >= SINGLE_PASS_GDAL_VERSION
+
+    arguments = []
+
+    if singlePass:
+        arguments.extend(ogr2ogr_options(sourceSrs, targetSrs, outputFormat, sourceProj, targetProj))
+        arguments.append(output)
+        arguments.append(ogrLayer)
+        if layerName:
+            arguments.append(layerName)
+    else:
+        arguments.append('-s_srs')
+        arguments.append(sourceProj or sourceSrs)
+        arguments.append('-t_srs')
+        arguments.append(targetProj or targetSrs)
+        arguments.append('-f')
+        arguments.append('Geojson')
+        arguments.append('/vsistdout/')
+        arguments.append(ogrLayer)
+        if layerName:
+            arguments.append(layerName)
+        arguments.append('|')
+        arguments.append('ogr2ogr')
+        arguments.append('-f')
+        arguments.append(outputFormat)
+        arguments.append('-a_srs')
+        arguments.append(targetSrs)
+        arguments.append(output)
+        arguments.append('/vsistdin/')
+        arguments.append('-lco')
+        arguments.append('ENCODING=UTF-8')
+
+    return arguments
+
+
+def gdalwarp_crs_arguments(sourceSrs, targetSrs, sourceProj=None, targetProj=None):
+    """
+    gdalwarp CRS arguments, with the grid shift given as an explicit
+    pipeline (GDAL >= 3.0).
+    """
+    arguments = []
+    arguments.append('-s_srs')
+    arguments.append(sourceSrs)
+    arguments.append('-t_srs')
+    arguments.append(targetSrs)
+    arguments.append('-ct')
+    arguments.append(proj_pipeline(sourceSrs, targetSrs, sourceProj, targetProj))
+    return arguments
+
+
+def gdalwarp_arguments(sourceSrs, targetSrs, source, output, outputFormat, sourceProj=None, targetProj=None, options=None):
+    """
+    gdalwarp arguments warping a raster from sourceSrs to targetSrs.
+    options are the performance arguments, see rasterwarp.warp_options().
+    """
+    arguments = gdalwarp_crs_arguments(sourceSrs, targetSrs, sourceProj, targetProj)
+    arguments.extend(options if options is not None else warp_options(outputFormat=outputFormat))
+    arguments.append('-of')
+    arguments.append(outputFormat)
+    arguments.append(source)
+    arguments.append(output)
+    return arguments
+
+
+def transformation_crs(transformation, inverse=False):
+    """
+    Returns source CRS, target CRS and their PROJ definitions for the given
+    registry Transformation and direction.
+    """
+    t = transformation
+    if inverse:
+        return t.target, t.srs, t.targetProj, t.proj
+    return t.srs, t.target, t.proj, t.targetProj
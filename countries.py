@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    countries.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+from collections import namedtuple
+
+# A country, or a family of transformations of one country, as shown in
+# the toolbox by one vector and one raster algorithm.
+#
+# key is the grid group of the manifest, country the registry country.
+# parameters are the enum parameters of the algorithms as (name, label,
+# options), each option being (label, values). The values of the selected
+# options update defaults and give the registry crs, grid and target,
+# where {zone} is replaced by the selected zone.
+Country = namedtuple('Country', ['key', 'country', 'code', 'name', 'groupId', 'tag', 'helpName',
+                                 'title', 'suffix', 'directions', 'parameters', 'defaults'])
+
+TO_ETRS89 = ['Direct: Old Data -> ETRS89 [EPSG:4258]',
+             'Inverse: ETRS89 [EPSG:4258] -> Old Data'
+            ]
+
+OLD_NEW_CRS = ['Direct: Old CRS -> New CRS',
+               'Inverse: New CRS -> Old CRS'
+              ]
+
+AU_ZONES = (('n/a', {'zone': ''}),
+            ('49', {'zone': '49'}),
+            ('50', {'zone': '50'}),
+            ('51', {'zone': '51'}),
+            ('52', {'zone': '52'}),
+            ('53', {'zone': '53'}),
+            ('54', {'zone': '54'}),
+            ('55', {'zone': '55'}),
+            ('56', {'zone': '56'}))
+
+
+def _datums(*options):
+    return tuple((label, {'crs': crs}) for label, crs in options)
+
+
+def _grids(*options):
+    return tuple((label, {'grid': grid}) for label, grid in options)
+
+
+COUNTRIES = [
+    Country('pt', 'pt', 'pt', 'Portugal (mainland)', 'portugal', 'portugal', 'Portugal (mainland)', '', '',
+            ['Direct: Old Data -> PT-TM06/ETRS89 [EPSG:3763]',
+             'Inverse: PT-TM06/ETRS89 [EPSG:3763] -> Old Data'
+            ],
+            (('CRS', 'Old Datum', _datums(('Datum Lisboa [EPSG:20791/EPSG:5018/ESRI:102165]', 'EPSG:20791'),
+                                          ('Datum Lisboa Militar [EPSG:20790/ESRI:102164]', 'EPSG:20790'),
+                                          ('Datum 73 [EPSG:27493/ESRI:102161]', 'EPSG:27493'),
+                                          ('Datum 73 Militar [ESRI:102160]', 'ESRI:102160'),
+                                          ('ED50 UTM 29N [EPSG:23029] (Only grid from José Alberto Gonçalves)', 'EPSG:23029'))),
+             ('GRID', 'NTv2 Grid', _grids(('José Alberto Gonçalves', 'pt_e89'),
+                                          ('Direção-Geral do Territorio', 'PT_ETRS89_geo')))),
+            {'target': 'EPSG:3763'}),
+
+    Country('de', 'de', 'de', 'Germany', 'germany', 'germany', 'Germany', '', '',
+            TO_ETRS89,
+            (('CRS', 'Old Datum', _datums(('Gauss-Krüger zone 3 [EPSG:31467]', 'EPSG:31467'))),
+             ('GRID', 'NTv2 Grid', _grids(('BETA2007', 'BETA2007')))),
+            {'target': 'EPSG:4258'}),
+
+    Country('es', 'es', 'es', 'Spain (mainland)', 'spain', 'spain', 'Spain (mainland)', '', '',
+            TO_ETRS89,
+            (('CRS', 'Old Datum', _datums(('ED50/UTM 29N [EPSG:23029]', 'EPSG:23029'),
+                                          ('ED50/UTM 30N [EPSG:23030]', 'EPSG:23030'),
+                                          ('ED50/UTM 31N [EPSG:23031]', 'EPSG:23031'))),
+             ('GRID', 'NTv2 Grid', _grids(('PENR2009', 'PENR2009')))),
+            {'target': 'EPSG:4258'}),
+
+    Country('it', 'it', 'it', 'Italy (Emilia-Romagna)', 'italy', 'italy', 'Italy (Emilia-Romagna)', '', '',
+            TO_ETRS89,
+            (('CRS', 'Old Datum', _datums(('Monte Mario - GBO [EPSG:3003]', 'EPSG:3003'),
+                                          ('UTM - ED50 [EPSG:23032]', 'EPSG:23032'))),
+             ('GRID', 'NTv2 Grid', _grids(('Grigliati NTv2 RER 2013 la trasformazione di coordinate in Emilia-Romagna', 'RER_ETRS89')))),
+            {'target': 'EPSG:4258'}),
+
+    Country('ch', 'ch', 'ch', 'Switzerland', 'switzerland', 'switzerland', 'Switzerland', '', '',
+            ['Direct: CH1903/LV03 [EPSG:21781] -> New Data',
+             'Inverse: New Data -> CH1903/LV03 [EPSG:21781]'
+            ],
+            (('CRS', 'New Datum', (('ETRS89 [EPSG:4258]', {'target': 'EPSG:4258'}),
+                                   ('CH1903+ [EPSG:2056]', {'target': 'EPSG:2056'}))),
+             ('GRID', 'NTv2 Grid', _grids(('CHENyx06', 'CHENyx06')))),
+            {'crs': 'EPSG:21781'}),
+
+    Country('uk', 'uk', 'uk', 'United Kingdom', 'unitedkingdom', 'united kingdom', 'United Kingdom', '', '',
+            TO_ETRS89,
+            (('CRS', 'Old Datum', _datums(('OSGB 1936/British National Grid [EPSG:27700]', 'EPSG:27700'))),
+             ('GRID', 'NTv2 Grid', _grids(('OSTN02_NTv2', 'OSTN02_NTv2')))),
+            {'target': 'EPSG:4258'}),
+
+    Country('hr', 'hr', 'hr', 'Croatia', 'croatia', 'croatia', 'Croatia', '', '',
+            ['Direct: Old Data -> HTRS96/Croatia TM [EPSG:3765]',
+             'Inverse: HTRS96/Croatia TM [EPSG:3765] -> Old Data'
+            ],
+            (('CRS', 'Old Datum', _datums(('HDKS5 [Custom]', 'HDKS5'),
+                                          ('HDKS6 [Custom]', 'HDKS6'))),
+             ('GRID', 'NTv2 Grid', _grids(('HRNTv2', 'HRNTv2')))),
+            {'target': 'EPSG:3765'}),
+
+    Country('cat', 'cat', 'cat', 'Catalonia', 'catalonia', 'catalonia', 'Catalonian', '', '',
+            ['Direct: Old Data -> ETRS89 UTM 31N [EPSG:25831]',
+             'Inverse: ETRS89 UTM 31N [EPSG:25831] -> Old Data'
+            ],
+            (('CRS', 'Old Datum', _datums(('ED50/UTM 31N [EPSG:23031]', 'EPSG:23031'))),
+             ('GRID', 'NTv2 Grid', _grids(('100800401', '100800401')))),
+            {'target': 'EPSG:25831'}),
+
+    Country('nl', 'nl', 'nl', 'Netherlands', 'netherlands', 'netherlands', 'Netherlands', '', '',
+            TO_ETRS89,
+            (('CRS', 'Old Datum', _datums(('Amersfoort/RD [EPSG:28992]', 'EPSG:28992'))),
+             ('GRID', 'NTv2 Grid', _grids(('RDNAPTRANS [NTv2 + VDatum]', 'naptrans2008'),
+                                          ('RDNAPTRANS [NTv2 only]', 'rdtrans2008')))),
+            {'target': 'EPSG:4258'}),
+
+    Country('at', 'at', 'at', 'Austria', 'austria', 'austria', 'Austrian', '', '',
+            TO_ETRS89,
+            (('CRS', 'Old Datum', _datums(('MGI [EPSG:4312]', 'EPSG:4312'),
+                                          ('MGI/Austria GK west [EPSG:31254]', 'EPSG:31254'),
+                                          ('MGI/Austria GK central [EPSG:31255]', 'EPSG:31255'),
+                                          ('MGI/Austria GK east [EPSG:31256]', 'EPSG:31256'),
+                                          ('MGI/Austria GK M28 [EPSG:31257]', 'EPSG:31257'),
+                                          ('MGI/Austria GK M31 [EPSG:31258]', 'EPSG:31258'),
+                                          ('MGI/Austria GK M34 [EPSG:31259]', 'EPSG:31259'))),
+             ('GRID', 'NTv2 Grid', _grids(('AT_GIS_GRID', 'AT_GIS_GRID')))),
+            {'target': 'EPSG:4258'}),
+
+    Country('au_agd', 'au', 'au', 'Australia', 'australia', 'australia', 'Australia', 'AGD66/84 to GDA94 ', 'agd',
+            OLD_NEW_CRS,
+            (('SRC_CRS', 'Old CRS', _datums(('AGD66 AMG [EPSG:202XX]', 'EPSG:202{zone}'),
+                                            ('AGD66 Latitude and Longitude [EPSG:4202]', 'EPSG:4202'),
+                                            ('AGD84 AMG [EPSG:203XX]', 'EPSG:203{zone}'),
+                                            ('AGD84 Latitude and Longitude [EPSG:4203]', 'EPSG:4203'),
+                                            ('GDA94 MGA [EPSG:283XX]', 'EPSG:283{zone}'),
+                                            ('GDA94 Latitude and Longitude [EPSG:4283]', 'EPSG:4283'))),
+             ('DST_CRS', 'New CRS', (('GDA94 MGA [EPSG:283XX]', {'target': 'EPSG:283{zone}'}),
+                                     ('GDA94 Latitude and Longitude [EPSG:4283]', {'target': 'EPSG:4283'}))),
+             ('ZONE', 'UTM Zone', AU_ZONES)),
+            {'grid': 'AGD'}),
+
+    Country('au_gda', 'au', 'au', 'Australia', 'australia', 'australia', 'Australia', 'GDA94 to GDA2020 ', 'gda',
+            OLD_NEW_CRS,
+            (('SRC_CRS', 'Old CRS', (('GDA94 MGA [EPSG:283XX] (Conformal only)',
+                                      {'crs': 'EPSG:283{zone}', 'grid': 'GDA94_GDA2020_conformal'}),
+                                     ('GDA94 Latitude and Longitude [EPSG:4283] (Conformal only)',
+                                      {'crs': 'EPSG:4283', 'grid': 'GDA94_GDA2020_conformal'}),
+                                     ('GDA94 MGA [EPSG:283XX] (Conformal and Distortion)',
+                                      {'crs': 'EPSG:283{zone}', 'grid': 'GDA94_GDA2020_conformal_and_distortion'}),
+                                     ('GDA94 Latitude and Longitude [EPSG:4283] (Conformal and Distortion)',
+                                      {'crs': 'EPSG:4283', 'grid': 'GDA94_GDA2020_conformal_and_distortion'}))),
+             ('DST_CRS', 'New CRS', (('GDA2020 MGA [EPSG:78XX]', {'target': 'EPSG:78{zone}'}),
+                                     ('GDA2020 Latitude and Longitude [EPSG:7844]', {'target': 'EPSG:7844'}))),
+             ('ZONE', 'UTM Zone', AU_ZONES)),
+            {}),
+]
+
+COUNTRIES_BY_KEY = {c.key: c for c in COUNTRIES}
+
+
+def algorithm_name(country, kind):
+    return '{}{}transform{}'.format(country.code, kind, country.suffix)
+
+
+def display_name(country, kind):
+    return '[{}] {}Direct and inverse {} Transformation'.format(country.code.upper(), country.title, kind.capitalize())
+
+
+def group_name(country):
+    return '[{}] {}'.format(country.code.upper(), country.name)
+
+
+def tags(country, kind):
+    return [kind, 'grid', 'ntv2', 'direct', 'inverse', country.tag]
+
+
+def help_string(country, kind):
+    return 'Direct and inverse {} transformations using {} NTv2 grids.'.format(kind, country.helpName)
+
+
+def selected_transformation(country, selection):
+    """
+    Returns (True, Transformation) for the option indexes selected in the
+    enum parameters of country, or (False, reason) when the combination is
+    not supported.
+    """
+    # The registry is only built when an algorithm runs, not to slow down
+    # the toolbox listing
+    from ntv2_transformations.transformations import NO_TRANSFORMATION, UNSUPPORTED, find_transformation
+
+    values = dict(country.defaults)
+    for (name, label, options), index in zip(country.parameters, selection):
+        values.update(options[index][1])
+
+    zone = values.get('zone', '')
+    key = (country.country,
+           values['crs'].format(zone=zone),
+           values['grid'],
+           values['target'].format(zone=zone))
+    t = find_transformation(*key)
+    if t is None:
+        return False, UNSUPPORTED.get(key, NO_TRANSFORMATION)
+    return True, t
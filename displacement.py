@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    displacement.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from ntv2_transformations.download import file_digest
+from ntv2_transformations.gdalrunner import run_console_command
+from ntv2_transformations.gridconvert import source_grid
+from ntv2_transformations.gridshift import MAX_SAMPLING_STEP, interpolation_error
+from ntv2_transformations.rasterwarp import METRES_PER_DEGREE
+from ntv2_transformations.transformations import proj_definition, proj_pipeline, without_grids
+from ntv2_transformations.transformercache import cached_transformer
+
+CACHE_PATH_VARIABLE = 'NTV2_DISPLACEMENT_CACHE'
+BUDGET_VARIABLE = 'NTV2_DISPLACEMENT_BUDGET'
+
+# Disk budget of the cache, in MB
+BUDGET = 2048
+
+# Changes when the fields of a key are computed differently, e.g. the
+# sampling step of a tolerance, so that older entries are not reused
+CACHE_VERSION = 2
+
+# Geolocation arrays are sampled every STEP source pixels, gdalwarp
+# interpolates in between
+STEP = 16
+
+# Footprints are widened by this many degrees, covering the datum shift
+# between the source and the grid frames
+FOOTPRINT_MARGIN = 0.01
+
+# The projection error is measured on up to this many cells along each
+# side of the raster
+CHECK_CELLS = 32
+
+_digests = {}
+_digestsLock = threading.Lock()
+
+_errors = {}
+_errorsLock = threading.Lock()
+
+_cache = None
+_cacheLock = threading.Lock()
+
+
+def cache_path():
+    return os.environ.get(CACHE_PATH_VARIABLE) or os.path.join(os.path.expanduser('~'), '.cache', 'ntv2_transformations', 'displacement')
+
+
+def grid_digest(path):
+    """
+    SHA-256 of a grid file, computed once per file version.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _digestsLock:
+        digest = _digests.get(key)
+    if digest is None:
+        digest = file_digest(path)
+        with _digestsLock:
+            _digests[key] = digest
+    return digest
+
+
+def _grids(definition):
+    grids = []
+    for token in definition.split():
+        key, _, value = token.lstrip('+').partition('=')
+        if key in ('nadgrids', 'geoidgrids') and value != '@null':
+            grids.extend(g.lstrip('@') for g in value.split(','))
+    return grids
+
+
+def grid_error(path, span, extent=None):
+    """
+    Bound, in metres, of the error on the NTv2 shift of the grid at path
+    (.gsb, or converted to GeoTIFF) interpolated between samples span
+    metres apart, over extent (degrees) if given, see
+    interpolation_error(). Computed once per grid version, span and
+    extent.
+    """
+    key = (grid_digest(path), round(span, 6),
+           tuple(round(v, 6) for v in extent) if extent is not None else None)
+    with _errorsLock:
+        error = _errors.get(key)
+    if error is None:
+        error = interpolation_error(path, span, extent)
+        with _errorsLock:
+            _errors[key] = error
+    return error
+
+
+def _geographic(definition):
+    for token in definition.split():
+        key, _, value = token.lstrip('+').partition('=')
+        if key == 'proj':
+            return value in ('longlat', 'latlong', 'lonlat', 'latlon')
+    return False
+
+
+def projection_error(sourceDefinition, targetDefinition, geotransform, xsize, ysize, step, cells=CHECK_CELLS):
+    """
+    Error, in metres, of interpolating the transformation without its
+    grids between the corners of cells of step source pixels, measured
+    against the exact transformation at the centre and edge midpoints of
+    up to cells x cells cells spread over the raster. This is the share
+    of the projections themselves, which the grid bound does not cover.
+    """
+    import numpy
+
+    transform = cached_transformer(without_grids(sourceDefinition), without_grids(targetDefinition))
+    nx, ny = -(-xsize // step), -(-ysize // step)
+    i = numpy.unique(numpy.linspace(0, nx - 1, min(nx, cells)).round())
+    j = numpy.unique(numpy.linspace(0, ny - 1, min(ny, cells)).round())
+    u, v = numpy.meshgrid(i * step, j * step)
+    u, v = u.ravel(), v.ravel()
+
+    x0, dx, rx, y0, ry, dy = geotransform
+    half = step / 2.0
+    # Corners, then midpoints with the corners they are interpolated from
+    offsets = [(0, 0), (step, 0), (0, step), (step, step)]
+    midpoints = [((half, half), (0, 1, 2, 3)),
+                 ((half, 0), (0, 1)), ((0, half), (0, 2)),
+                 ((step, half), (1, 3)), ((half, step), (2, 3))]
+    pu = numpy.concatenate([u + a for a, b in offsets] + [u + a for (a, b), c in midpoints])
+    pv = numpy.concatenate([v + b for a, b in offsets] + [v + b for (a, b), c in midpoints])
+    tx, ty = transform(x0 + pu * dx + pv * rx, y0 + pu * ry + pv * dy)
+    tx = numpy.asarray(tx, dtype=numpy.float64).reshape(-1, u.size)
+    ty = numpy.asarray(ty, dtype=numpy.float64).reshape(-1, u.size)
+
+    geographic = _geographic(targetDefinition)
+    error = 0.0
+    for k, (offset, corners) in enumerate(midpoints, len(offsets)):
+        ex = tx[k] - tx[list(corners)].mean(axis=0)
+        ey = ty[k] - ty[list(corners)].mean(axis=0)
+        if geographic:
+            ex = ex * METRES_PER_DEGREE * numpy.cos(numpy.radians(ty[k]))
+            ey = ey * METRES_PER_DEGREE
+        e = numpy.hypot(ex, ey)
+        e = e[numpy.isfinite(e)]
+        if e.size:
+            error = max(error, float(e.max()))
+    return error
+
+
+def sampling_step(sourceDefinition, targetDefinition, gridFiles, geotransform, xsize, ysize,
+                  tolerance, pixelSize, max_step=MAX_SAMPLING_STEP):
+    """
+    Coarsest power of two step, in source pixels of pixelSize metres,
+    keeping the interpolated geolocation arrays within tolerance metres:
+    the bound on the shift of every NTv2 grid over the raster footprint
+    plus the measured error of the projections.
+    """
+    extent = footprint(sourceDefinition, geotransform, xsize, ysize)
+    grids = [p for p in (source_grid(g) for g in gridFiles) if p is not None]
+    step = 1
+    while step * 2 <= max_step:
+        span = step * 2
+        error = sum(grid_error(p, span * pixelSize, extent) for p in grids)
+        if error > tolerance:
+            break
+        error += projection_error(sourceDefinition, targetDefinition, geotransform, xsize, ysize, span)
+        if error > tolerance:
+            break
+        step = span
+    return step
+
+
+def footprint(definition, geotransform, xsize, ysize, margin=FOOTPRINT_MARGIN, samples=16):
+    """
+    Extent (west, south, east, north), in geographic degrees of the datum
+    of definition, of a raster, sampling its edges.
+    """
+    import numpy
+
+    transform = cached_transformer(without_grids(definition), '+proj=longlat')
+    t = numpy.linspace(0.0, 1.0, samples + 1)
+    px = numpy.concatenate((t * xsize, numpy.full(t.size, float(xsize)), t[::-1] * xsize, numpy.zeros(t.size)))
+    py = numpy.concatenate((numpy.zeros(t.size), t * ysize, numpy.full(t.size, float(ysize)), t[::-1] * ysize))
+    x0, dx, rx, y0, ry, dy = geotransform
+    lon, lat = transform(x0 + px * dx + py * rx, y0 + px * ry + py * dy)
+    lon, lat = numpy.asarray(lon), numpy.asarray(lat)
+    valid = numpy.isfinite(lon) & numpy.isfinite(lat)
+    if not valid.any():
+        return None
+    return (float(lon[valid].min()) - margin, float(lat[valid].min()) - margin,
+            float(lon[valid].max()) + margin, float(lat[valid].max()) + margin)
+
+
+def _definition(srs, proj):
+    definition = proj_definition(srs, proj)
+    if definition is None:
+        raise RuntimeError('No PROJ definition for {}, the displacement field can not be computed.'.format(srs))
+    return definition
+
+
+class DisplacementCache:
+    """
+    Directory of geolocation arrays (GeoTIFF), evicted least recently used
+    first when they exceed the disk budget (MB). Entries are written to a
+    temporary file and renamed, so concurrent users never read partial
+    files, and are used through a hard link, so that another process
+    evicting them does not remove the data in use.
+    """
+
+    def __init__(self, path=None, budget=None):
+        self.path = path or cache_path()
+        if budget is None:
+            budget = int(os.environ.get(BUDGET_VARIABLE) or BUDGET)
+        self.budget = budget * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def entry(self, key):
+        return os.path.join(self.path, '{}.tif'.format(key))
+
+    def workspace(self):
+        """
+        Temporary folder of a user of the cache, in the cache folder so
+        that entries can be linked into it. Removed by the user.
+        """
+        return tempfile.mkdtemp(prefix='tmp', dir=self.path)
+
+    def _link(self, path, workPath):
+        link = os.path.join(workPath, os.path.basename(path))
+        try:
+            os.link(path, link)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            # No hard links on this file system, an open file is not
+            # removed by an eviction on POSIX
+            shutil.copyfile(path, link)
+        return link
+
+    def get(self, key, workPath):
+        """
+        Returns a link to the entry of key in workPath, see workspace(),
+        or None if there is no entry.
+        """
+        path = self.entry(key)
+        try:
+            link = self._link(path, workPath)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            # Last use is tracked with the modification time
+            os.utime(path)
+        except OSError:
+            # Evicted meanwhile, the link still holds the data
+            pass
+        with self._lock:
+            self.hits += 1
+        return link
+
+    def put(self, key, build, workPath):
+        """
+        Stores the entry written by build(path) and returns a link to it
+        in workPath.
+        """
+        path = self.entry(key)
+        fd, tmpPath = tempfile.mkstemp(suffix='.tif', dir=self.path)
+        os.close(fd)
+        try:
+            build(tmpPath)
+            link = self._link(tmpPath, workPath)
+            os.replace(tmpPath, path)
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+        self.evict(keep=path)
+        return link
+
+    def entries(self):
+        """
+        Returns (path, size, last use) of the entries, least recently used
+        first.
+        """
+        result = []
+        for name in os.listdir(self.path):
+            if not name.endswith('.tif') or name.startswith('tmp'):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            result.append((path, stat.st_size, stat.st_mtime))
+        return sorted(result, key=lambda e: e[2])
+
+    def size(self):
+        return sum(e[1] for e in self.entries())
+
+    def evict(self, keep=None):
+        with self._lock:
+            entries = self.entries()
+            total = sum(e[1] for e in entries)
+            for path, size, used in entries:
+                if total <= self.budget:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+    def clear(self):
+        for path, size, used in self.entries():
+            os.remove(path)
+
+
+def displacement_cache():
+    """
+    Cache shared by all the warps, so its hit and miss counters and its
+    lock cover every run. Created again when the cache path changes.
+    """
+    global _cache
+    with _cacheLock:
+        if _cache is None or _cache.path != cache_path():
+            _cache = DisplacementCache()
+        return _cache
+
+
+def cache_key(pipeline, gridFiles, geotransform, xsize, ysize, step=STEP, tolerance=None, pixelSize=None):
+    """
+    Key of a displacement field: content of the grids, transformation,
+    extent, resolution and sampling. With a tolerance the sampling step
+    follows from it and the pixel size (see sampling_step()), which are
+    used instead, so that the step is only computed on a miss.
+    """
+    data = {'version': CACHE_VERSION,
+            'grids': sorted(grid_digest(g) for g in gridFiles),
+            'pipeline': pipeline,
+            'geotransform': list(geotransform),
+            'size': [xsize, ysize],
+            'step': None if tolerance else step,
+            'tolerance': [tolerance, pixelSize] if tolerance else None}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def write_geolocation(path, transform, geotransform, xsize, ysize, step=STEP):
+    """
+    Writes the target coordinates of the source pixel corners, every step
+    pixels, as a 2 band (x, y) GeoTIFF. transform is a point
+    transformation function, see cached_transformer().
+    """
+    import numpy
+    from osgeo import gdal
+
+    nx = -(-xsize // step) + 1
+    ny = -(-ysize // step) + 1
+    px = numpy.arange(nx, dtype=numpy.float64) * step
+
+    ds = gdal.GetDriverByName('GTiff').Create(path, nx, ny, 2, gdal.GDT_Float64,
+                                              ['COMPRESS=DEFLATE', 'PREDICTOR=3', 'TILED=YES'])
+    ds.SetMetadataItem('STEP', str(step))
+    x0, dx, rx, y0, ry, dy = geotransform
+    for j in range(ny):
+        py = j * step
+        xs = x0 + px * dx + py * rx
+        ys = y0 + px * ry + py * dy
+        tx, ty = transform(xs, ys)
+        ds.GetRasterBand(1).WriteArray(numpy.asarray(tx).reshape(1, -1), 0, j)
+        ds.GetRasterBand(2).WriteArray(numpy.asarray(ty).reshape(1, -1), 0, j)
+    ds = None
+
+
+def cached_warp(sourceSrs, targetSrs, source, output, outputFormat, options, sourceProj=None,
+                targetProj=None, cache=None, step=STEP, tolerance=None, pixelSize=None,
+                progress=None, canceled=None):
+    """
+    Warps source with gdalwarp -geoloc, using the cached geolocation
+    arrays of the source footprint, computed on the first run. The NTv2
+    shift is then not evaluated again for later rasters with the same
+    extent and resolution. options are the gdalwarp performance arguments.
+    Returns True if the cache was used.
+
+    With a tolerance (metres) and the source pixelSize (metres), step is
+    the coarsest sampling keeping the grid shift and the projection
+    error within tolerance, see sampling_step().
+
+    gdalwarp progress goes to progress (percentage) and the run is
+    terminated when canceled() becomes true, raising RuntimeError.
+    """
+    from osgeo import gdal
+
+    cache = cache or displacement_cache()
+    sourceDefinition = _definition(sourceSrs, sourceProj)
+    targetDefinition = _definition(targetSrs, targetProj)
+    # PROJ definitions on both ends, so no axis swap: x is easting/longitude
+    pipeline = proj_pipeline(sourceDefinition, targetDefinition)
+    outputSrs = without_grids(targetSrs) if targetSrs.startswith('+') else targetSrs
+
+    ds = gdal.Open(source)
+    if ds is None:
+        raise RuntimeError('Unable to open {}.'.format(source))
+    geotransform, xsize, ysize = ds.GetGeoTransform(), ds.RasterXSize, ds.RasterYSize
+    ds = None
+
+    gridFiles = _grids(sourceDefinition) + _grids(targetDefinition)
+    key = cache_key(pipeline, gridFiles, geotransform, xsize, ysize, step, tolerance, pixelSize)
+    workPath = cache.workspace()
+    try:
+        entry = cache.get(key, workPath)
+        hit = entry is not None
+        if hit:
+            ds = gdal.Open(entry)
+            step = int(ds.GetMetadataItem('STEP') or step)
+            ds = None
+        else:
+            if tolerance:
+                step = sampling_step(sourceDefinition, targetDefinition, gridFiles, geotransform, xsize, ysize,
+                                     tolerance, pixelSize)
+            transform = cached_transformer(sourceDefinition, targetDefinition)
+            entry = cache.put(key, lambda path: write_geolocation(path, transform, geotransform, xsize, ysize, step),
+                              workPath)
+
+        vrtPath = os.path.join(workPath, 'source.vrt')
+        vrt = gdal.Translate(vrtPath, source, format='VRT')
+        vrt.SetMetadata({'SRS': outputSrs,
+                         'X_DATASET': entry,
+                         'X_BAND': '1',
+                         'Y_DATASET': entry,
+                         'Y_BAND': '2',
+                         'PIXEL_OFFSET': '0',
+                         'LINE_OFFSET': '0',
+                         'PIXEL_STEP': str(step),
+                         'LINE_STEP': str(step),
+                         'GEOREFERENCING_CONVENTION': 'TOP_LEFT_CORNER'}, 'GEOLOCATION')
+        vrt = None
+
+        command = ['gdalwarp', '-overwrite', '-geoloc', '-t_srs', outputSrs] + list(options)
+        command.extend(['-of', outputFormat, vrtPath, output])
+        run_console_command(command, progress=progress, canceled=canceled)
+    finally:
+        shutil.rmtree(workPath, ignore_errors=True)
+
+    return hit
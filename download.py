@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    download.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 60
+RETRIES = 3
+WORKERS = 4
+
+# Suffix of the partial downloads, kept between runs so they can be resumed
+PART_SUFFIX = '.part'
+
+_locks = {}
+_locksLock = threading.Lock()
+
+
+class GridDownloadError(Exception):
+    pass
+
+
+def _lock(path):
+    with _locksLock:
+        return _locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify(path, size=None, sha256=None, check=None):
+    """
+    Returns True if path exists and matches the expected size and SHA-256,
+    when they are given, and check(path), a structural check raising
+    ValueError for invalid files, when given.
+    """
+    if not os.path.isfile(path):
+        return False
+    if size is not None and os.path.getsize(path) != size:
+        return False
+    if sha256 is not None and file_digest(path) != sha256.lower():
+        return False
+    if check is not None:
+        try:
+            check(path)
+        except (ValueError, OSError):
+            return False
+    return True
+
+
+def _transfer(url, partPath, size, timeout):
+    offset = os.path.getsize(partPath) if os.path.isfile(partPath) else 0
+    if size is not None and offset > size:
+        offset = 0
+
+    request = Request(url)
+    if offset:
+        request.add_header('Range', 'bytes={}-'.format(offset))
+
+    try:
+        response = urlopen(request, timeout=timeout)
+    except HTTPError as e:
+        # The partial file is already complete
+        if e.code == 416 and offset:
+            return
+        raise
+
+    with response:
+        if offset and response.status != 206:
+            # Range not supported by the server, start again
+            offset = 0
+        length = response.headers.get('Content-Length')
+        written = 0
+        with open(partPath, 'ab' if offset else 'wb') as f:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+
+    if length is not None and written != int(length):
+        raise GridDownloadError('Download of {} interrupted after {} of {} bytes.'.format(url, written, length))
+
+
+def fetch(url, path, size=None, sha256=None, timeout=TIMEOUT, retries=RETRIES, check=None):
+    """
+    Downloads url to path, unless path is already there and valid.
+
+    Data is written to path + PART_SUFFIX and moved to path only once the
+    size, SHA-256 and structure (when given, see verify()) are verified,
+    so path is either missing or complete. Interrupted downloads are
+    resumed with a HTTP Range request, on the next retry or on the next
+    call. Network and protocol errors are retried, then raised as
+    GridDownloadError.
+    """
+    with _lock(path):
+        if verify(path, size, sha256, check):
+            return path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        partPath = path + PART_SUFFIX
+        for attempt in range(retries):
+            try:
+                _transfer(url, partPath, size, timeout)
+                break
+            except (GridDownloadError, HTTPException, OSError) as e:
+                # URLError, timeouts and connection resets are OSError,
+                # truncated or malformed responses are HTTPException
+                if isinstance(e, HTTPError) or attempt == retries - 1:
+                    raise GridDownloadError('Unable to download {}: {}'.format(url, e))
+
+        if not verify(partPath, size, sha256, check):
+            os.remove(partPath)
+            raise GridDownloadError('Checksum or structure mismatch for {}, the file has been removed.'.format(url))
+
+        os.replace(partPath, path)
+        return path
+
+
+def fetch_all(files, workers=WORKERS, timeout=TIMEOUT, retries=RETRIES, check=None):
+    """
+    Downloads in parallel a list of (url, path, size, sha256) tuples,
+    checking each file with check (see verify()) when given. Returns the
+    paths. All the downloads are attempted, then a
+    GridDownloadError is raised if any of them failed.
+    """
+    files = list(files)
+    if not files:
+        return []
+
+    def run(item):
+        url, path, size, sha256 = item
+        try:
+            return fetch(url, path, size, sha256, timeout, retries, check), None
+        except (GridDownloadError, OSError) as e:
+            return path, e
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        results = list(pool.map(run, files))
+
+    errors = [str(e) for path, e in results if e is not None]
+    if errors:
+        raise GridDownloadError('\n'.join(errors))
+    return [path for path, e in results]
+
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    gdalrunner.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+# Seconds between two checks of the processes and of the cancel flag
+POLL_INTERVAL = 0.1
+
+# Seconds given to canceled processes to exit before they are killed
+KILL_TIMEOUT = 5.0
+
+# Seconds between two throughput reports
+STATUS_INTERVAL = 2.0
+
+# Programs printing "0...10...20..." on stdout. gdalwarp and
+# gdal_translate do it by default, ogr2ogr only with -progress.
+PROGRESS_PROGRAMS = ('ogr2ogr', 'gdalwarp', 'gdal_translate')
+PROGRESS_OPTION_PROGRAMS = ('ogr2ogr',)
+
+# Command separators, as used in the console commands
+PIPE = '|'
+AND = '&&'
+
+
+class ProgressParser:
+    """
+    Parses the -progress output of the GDAL utilities, where every dot
+    after a tens value is 2.5 %. Lines with anything else than the
+    progress (e.g. "Creating output file...") are ignored.
+    """
+
+    def __init__(self):
+        self.percent = None
+        self._number = ''
+        self._last = None
+        self._dots = 0
+        self._noise = False
+
+    def feed(self, text):
+        for c in text:
+            if c in '\r\n':
+                self._number = ''
+                self._noise = False
+                continue
+            if self._noise:
+                continue
+            if c.isdigit():
+                self._number += c
+                continue
+            if self._number:
+                self._last = float(self._number)
+                self._dots = 0
+                self._number = ''
+                self.percent = self._last
+            if c == '.' and self._last is not None:
+                self._dots += 1
+                self.percent = min(100.0, self._last + 2.5 * self._dots)
+            elif c not in ' -':
+                self._noise = True
+        return self.percent
+
+
+def split_command(commandLine):
+    """
+    Splits a console command (program and arguments, with | and &&
+    separators) in steps run one after the other, each one a list of
+    commands piped together.
+    """
+    steps = [[[]]]
+    for argument in commandLine:
+        if argument == AND:
+            steps.append([[]])
+        elif argument == PIPE:
+            steps[-1].append([])
+        else:
+            steps[-1][-1].append(argument)
+    return [[command for command in step if command] for step in steps if any(step)]
+
+
+def python_executable():
+    """
+    Python interpreter to start worker processes with.
+    sys.executable is not Python when it is embedded, e.g. in QGIS, the
+    interpreter is then looked up in sys.exec_prefix: the one on PATH
+    may be another installation, without osgeo.
+    """
+    interpreter = sys.executable
+    if os.path.basename(interpreter).lower().startswith('python'):
+        return interpreter
+    version = '{}.{}'.format(*sys.version_info[:2])
+    for name in ('python.exe',
+                 os.path.join('bin', 'python' + version),
+                 os.path.join('bin', 'python3'),
+                 os.path.join('bin', 'python')):
+        candidate = os.path.join(sys.exec_prefix, name)
+        if os.path.isfile(candidate):
+            return candidate
+    return interpreter
+
+
+def _programName(command):
+    return os.path.splitext(os.path.basename(command[0]))[0]
+
+
+def _start(command, stdin=None, stdout=None):
+    options = dict(stdin=stdin, stdout=stdout, stderr=subprocess.PIPE)
+    # Every process leads its own group, so it is killed with its children
+    if os.name == 'nt':
+        options['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options['start_new_session'] = True
+    return subprocess.Popen(command, **options)
+
+
+def terminate(processes, timeout=KILL_TIMEOUT):
+    """
+    Terminates the process groups of the given processes, killing them if
+    they are still running after timeout seconds.
+    """
+    alive = [p for p in processes if p.poll() is None]
+    for p in alive:
+        try:
+            if os.name == 'nt':
+                subprocess.run(['taskkill', '/F', '/T', '/PID', str(p.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                os.killpg(p.pid, signal.SIGTERM)
+        except (OSError, ProcessLookupError):
+            pass
+
+    deadline = time.monotonic() + timeout
+    for p in alive:
+        try:
+            p.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            if os.name != 'nt':
+                try:
+                    os.killpg(p.pid, signal.SIGKILL)
+                except (OSError, ProcessLookupError):
+                    pass
+            p.kill()
+            p.wait()
+
+
+def _drain(stream, sink):
+    # Read in a thread, so a full pipe never blocks the process
+    try:
+        while True:
+            data = stream.read1(4096) if hasattr(stream, 'read1') else stream.read(4096)
+            if not data:
+                break
+            sink(data.decode('utf-8', 'replace'))
+    except (OSError, ValueError):
+        pass
+
+
+def _duration(seconds):
+    seconds = int(seconds)
+    return '{}:{:02d}:{:02d}'.format(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def throughput_text(total, unit, fraction, elapsed):
+    """
+    Rate and estimated time left of a run, total being the number of
+    features or pixels (unit) and fraction the part done.
+    """
+    if not fraction or elapsed <= 0:
+        return None
+    eta = _duration(elapsed * (1.0 - fraction) / fraction)
+    if not total:
+        return 'ETA {}'.format(eta)
+    rate = total * fraction / elapsed
+    if unit == 'pixels':
+        return '{:.2f} Mpixel/s, ETA {}'.format(rate / 1e6, eta)
+    return '{:.0f} {}/s, ETA {}'.format(rate, unit or 'features', eta)
+
+
+def run_command(command, canceled=None, poll=POLL_INTERVAL):
+    """
+    Runs a single command, terminating its process group if canceled()
+    becomes true. Returns the exit code and the error output.
+    """
+    process = _start(command, stdout=subprocess.DEVNULL)
+    errors = []
+    reader = threading.Thread(target=_drain, args=(process.stderr, errors.append), daemon=True)
+    reader.start()
+    try:
+        while process.poll() is None:
+            if canceled is not None and canceled():
+                terminate([process])
+                raise RuntimeError('Canceled.')
+            time.sleep(poll)
+    finally:
+        reader.join()
+        process.stderr.close()
+    return process.returncode, ''.join(errors).strip()
+
+
+def run_console_command(commandLine, progress=None, canceled=None, status=None, log=None,
+                        total=None, unit=None, poll=POLL_INTERVAL):
+    """
+    Runs a console command (see split_command()) reporting the -progress
+    output of the GDAL utilities to progress (percentage), and rate and
+    estimated time left to status, total being the features or pixels
+    (unit) processed. Error output lines go to log.
+
+    When canceled() becomes true every process group is terminated and
+    RuntimeError is raised, as when a command fails.
+    """
+    steps = split_command(commandLine)
+    # Only the steps reporting progress count in the overall percentage
+    weights = [1.0 if _programName(step[-1]) in PROGRESS_PROGRAMS else 0.0 for step in steps]
+    done = 0.0
+    weightTotal = sum(weights) or 1.0
+    start = time.monotonic()
+    lastStatus = start
+
+    for step, weight in zip(steps, weights):
+        processes = []
+        parser = ProgressParser()
+        errors = []
+        readers = []
+        try:
+            for i, command in enumerate(step):
+                last = i == len(step) - 1
+                if last and weight and _programName(command) in PROGRESS_OPTION_PROGRAMS:
+                    command = command[:1] + ['-progress'] + command[1:]
+                process = _start(command,
+                                 stdin=processes[-1].stdout if processes else None,
+                                 stdout=subprocess.PIPE)
+                if processes:
+                    # The reading end now belongs to the new process only
+                    processes[-1].stdout.close()
+                processes.append(process)
+                readers.append(threading.Thread(target=_drain, args=(process.stderr, errors.append), daemon=True))
+            readers.append(threading.Thread(target=_drain, args=(processes[-1].stdout, parser.feed), daemon=True))
+            for reader in readers:
+                reader.start()
+
+            while any(p.poll() is None for p in processes):
+                if canceled is not None and canceled():
+                    terminate(processes)
+                    raise RuntimeError('Canceled.')
+                time.sleep(poll)
+                if parser.percent is None or not weight:
+                    continue
+                fraction = (done + weight * parser.percent / 100.0) / weightTotal
+                if progress is not None:
+                    progress(100.0 * fraction)
+                now = time.monotonic()
+                if status is not None and now - lastStatus >= STATUS_INTERVAL:
+                    text = throughput_text(total, unit, fraction, now - start)
+                    if text:
+                        status(text)
+                    lastStatus = now
+        finally:
+            terminate(processes)
+            for reader in readers:
+                reader.join()
+            for p in processes:
+                for stream in (p.stdout, p.stderr):
+                    if stream is not None:
+                        stream.close()
+
+        message = ''.join(errors).strip()
+        if log is not None and message:
+            for line in message.splitlines():
+                log(line)
+        failed = [p for p in processes if p.returncode != 0]
+        if failed:
+            raise RuntimeError(message or '{} failed with exit code {}.'.format(step[0][0], failed[0].returncode))
+        done += weight
+
+    if progress is not None:
+        progress(100.0)
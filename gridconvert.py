@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    gridconvert.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import tempfile
+from functools import lru_cache
+
+# NTv2 grids are converted to the PROJ GeoTIFF grid format (GTG): one
+# tiled, compressed image per sub-grid, so PROJ only reads the blocks it
+# needs instead of loading whole sub-grids. Converted grids are written
+# next to the .gsb files and used as soon as they are up to date.
+
+GTG_EXTENSION = '.tif'
+BLOCK_SIZE = 256
+
+# GeoTIFF grids are read by PROJ >= 7
+GTG_PROJ_VERSION = 7
+
+
+@lru_cache(maxsize=1)
+def gtg_supported():
+    try:
+        from osgeo import osr
+    except ImportError:
+        return False
+    return osr.GetPROJVersionMajor() >= GTG_PROJ_VERSION
+
+
+def gtg_path(path):
+    return os.path.splitext(path)[0] + GTG_EXTENSION
+
+
+def is_current(path):
+    """
+    True if the NTv2 file path has a converted grid newer than itself.
+    """
+    converted = gtg_path(path)
+    try:
+        return os.path.getmtime(converted) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+
+def proj_grid(path):
+    """
+    Grid file to reference in PROJ strings: the converted GeoTIFF of a
+    .gsb file when it is up to date and PROJ can read it, otherwise path.
+    """
+    if path.lower().endswith('.gsb') and is_current(path) and gtg_supported():
+        return gtg_path(path)
+    return path
+
+
+def source_grid(path):
+    """
+    NTv2 file a grid path refers to: path itself, or the .gsb a GeoTIFF
+    grid was converted from. None if it is not a NTv2 grid.
+    """
+    stem, ext = os.path.splitext(path)
+    if ext.lower() == '.gsb':
+        return path
+    if ext.lower() == GTG_EXTENSION:
+        for candidate in (stem + '.gsb', stem + '.GSB'):
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def _geographic(grid):
+    """
+    Geographic CRS of the grid source datum, known from its ellipsoid only.
+    """
+    from osgeo import osr
+
+    srs = osr.SpatialReference()
+    major, minor = grid.major_from, grid.minor_from
+    inverseFlattening = major / (major - minor) if major != minor else 0.0
+    srs.SetGeogCS(grid.system_from or 'NTv2 source', grid.system_from or 'unknown',
+                  'unknown', major, inverseFlattening)
+    return srs.ExportToWkt()
+
+
+def ntv2_to_gtiff(source, output):
+    """
+    Converts the NTv2 file source to a GeoTIFF grid, keeping every
+    sub-grid and its parent. The file is written to a temporary name and
+    renamed, so output is never partial.
+    """
+    import numpy
+    from osgeo import gdal
+
+    from ntv2_transformations.gsb import GsbFile
+
+    options = ['TILED=YES',
+               'BLOCKXSIZE={}'.format(BLOCK_SIZE),
+               'BLOCKYSIZE={}'.format(BLOCK_SIZE),
+               'COMPRESS=DEFLATE',
+               'PREDICTOR=3',
+               'INTERLEAVE=BAND']
+
+    directory = os.path.dirname(os.path.abspath(output))
+    fd, tmpPath = tempfile.mkstemp(suffix=GTG_EXTENSION, dir=directory)
+    os.close(fd)
+    os.remove(tmpPath)
+
+    try:
+        with GsbFile(source) as grid:
+            wkt = _geographic(grid)
+            names = {g.name for g in grid.subgrids}
+            for i, g in enumerate(grid.subgrids):
+                ds = gdal.GetDriverByName('MEM').Create('', g.cols, g.rows, 2, gdal.GDT_Float32)
+                lonInc = g.lon_inc / 3600.0
+                latInc = g.lat_inc / 3600.0
+                # Nodes are pixel centres, the origin is the corner
+                ds.SetGeoTransform((g.lon_min - lonInc / 2.0, lonInc, 0.0, g.lat_max + latInc / 2.0, 0.0, -latInc))
+                ds.SetProjection(wkt)
+                ds.SetMetadataItem('AREA_OR_POINT', 'Point')
+                ds.SetMetadataItem('TYPE', 'HORIZONTAL_OFFSET')
+                ds.SetMetadataItem('grid_name', g.name)
+                if g.parent in names and g.parent != g.name:
+                    ds.SetMetadataItem('parent_grid_name', g.parent)
+
+                # North up and west to east, longitudes positive east
+                latitude = ds.GetRasterBand(1)
+                latitude.SetDescription('latitude_offset')
+                latitude.SetUnitType('arc-second')
+                latitude.WriteArray(numpy.ascontiguousarray(g.lat_shift[::-1, ::-1], dtype=numpy.float32))
+                longitude = ds.GetRasterBand(2)
+                longitude.SetDescription('longitude_offset')
+                longitude.SetUnitType('arc-second')
+                longitude.SetMetadataItem('positive_value', 'east')
+                longitude.WriteArray(numpy.ascontiguousarray(-g.lon_shift[::-1, ::-1], dtype=numpy.float32))
+
+                creationOptions = options + (['APPEND_SUBDATASET=YES'] if i else [])
+                out = gdal.Translate(tmpPath, ds, format='GTiff', creationOptions=creationOptions)
+                if out is None:
+                    raise RuntimeError(gdal.GetLastErrorMsg() or 'Unable to convert {}.'.format(source))
+                out = None
+                ds = None
+        os.replace(tmpPath, output)
+    finally:
+        if os.path.exists(tmpPath):
+            os.remove(tmpPath)
+    return output
+
+
+def convert_grids(paths, force=False):
+    """
+    Converts the given .gsb files which have no up to date GeoTIFF grid.
+    Returns the paths of the GeoTIFF grids.
+    """
+    converted = []
+    for path in paths:
+        if not path.lower().endswith('.gsb') or not os.path.isfile(path):
+            continue
+        if force or not is_current(path):
+            ntv2_to_gtiff(path, gtg_path(path))
+        converted.append(gtg_path(path))
+    return converted
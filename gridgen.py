@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    gridgen.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import argparse
+import math
+import struct
+import sys
+from collections import namedtuple
+
+import numpy
+
+from ntv2_transformations.gsb import OVERVIEW_RECORDS, SUBGRID_RECORDS, GsbFile, load_grid
+
+# Synthetic NTv2 grids, to test and benchmark without the real ones. The
+# shift of every node is taken from an analytic field, so interpolated
+# shifts can be checked against the exact value.
+
+# Sub-grid extent (west, south, east, north) and node spacing, degrees
+# with longitudes positive east
+SubGridSpec = namedtuple('SubGridSpec', ['name', 'parent', 'west', 'south', 'east', 'north', 'lon_inc', 'lat_inc'])
+
+FIELDS = ('constant', 'linear', 'smooth')
+
+# Accuracy written in every node, arc seconds
+ACCURACY = 0.01
+DATE = '20261017'
+
+
+def constant_field(dlon=1.5, dlat=2.5):
+    """
+    Same shift (arc seconds, longitude positive east) everywhere.
+    """
+    def field(lon, lat):
+        return numpy.full(numpy.shape(lon), float(dlon)), numpy.full(numpy.shape(lat), float(dlat))
+    return field
+
+
+def linear_field(dlon=1.5, dlat=2.5, gradient=(0.2, -0.1, 0.05, 0.3), origin=(0.0, 0.0)):
+    """
+    Shift varying linearly, gradient being the derivatives (arc seconds
+    per degree) of the longitude shift along longitude and latitude, then
+    of the latitude shift. Bilinear interpolation is exact on it.
+    """
+    a, b, c, d = gradient
+    lon0, lat0 = origin
+
+    def field(lon, lat):
+        x = numpy.asarray(lon) - lon0
+        y = numpy.asarray(lat) - lat0
+        return dlon + a * x + b * y, dlat + c * x + d * y
+    return field
+
+
+def smooth_field(amplitude=2.0, wavelength=1.0, waves=4, seed=0):
+    """
+    Random but smooth shift, a sum of waves sinusoids of the given
+    wavelength (degrees) with random directions and phases. amplitude
+    (arc seconds) bounds each component.
+    """
+    rng = numpy.random.default_rng(seed)
+    angles = rng.uniform(0.0, 2.0 * math.pi, (2, waves))
+    phases = rng.uniform(0.0, 2.0 * math.pi, (2, waves))
+    k = 2.0 * math.pi / wavelength
+
+    def component(i, x, y):
+        result = numpy.zeros(numpy.broadcast(x, y).shape)
+        for angle, phase in zip(angles[i], phases[i]):
+            result += numpy.sin(k * (x * math.cos(angle) + y * math.sin(angle)) + phase)
+        return amplitude / waves * result
+
+    def field(lon, lat):
+        x = numpy.asarray(lon, dtype=numpy.float64)
+        y = numpy.asarray(lat, dtype=numpy.float64)
+        return component(0, x, y), component(1, x, y)
+    return field
+
+
+def _snap(value, origin, inc):
+    return origin + round((value - origin) / inc) * inc
+
+
+def nested_subgrids(extent, resolution, depth=0, branching=2, refinement=2):
+    """
+    Returns the SubGridSpec of a grid covering extent (west, south, east,
+    north, degrees) with nodes every resolution degrees. Below the root,
+    every sub-grid has branching x branching children tiling its central
+    half, refinement times denser, down to depth levels. Parents come
+    before their children, as NTv2 requires.
+    """
+    west, south, east, north = extent
+    # The extent is enlarged to a whole number of cells
+    east = west + math.ceil((east - west) / resolution - 1e-9) * resolution
+    north = south + math.ceil((north - south) / resolution - 1e-9) * resolution
+
+    specs = [SubGridSpec('S0000000', 'NONE', west, south, east, north, resolution, resolution)]
+    level = list(specs)
+    for _ in range(depth):
+        children = []
+        for parent in level:
+            qx = (parent.east - parent.west) / 4.0
+            qy = (parent.north - parent.south) / 4.0
+            # Children edges lie on parent nodes
+            xs = [_snap(parent.west + qx + 2.0 * qx * i / branching, parent.west, parent.lon_inc) for i in range(branching + 1)]
+            ys = [_snap(parent.south + qy + 2.0 * qy * j / branching, parent.south, parent.lat_inc) for j in range(branching + 1)]
+            for j in range(branching):
+                for i in range(branching):
+                    if xs[i + 1] <= xs[i] or ys[j + 1] <= ys[j]:
+                        raise ValueError('Sub-grid "{}" is too coarse for {} x {} children.'.format(parent.name, branching, branching))
+                    children.append(SubGridSpec('S{:07d}'.format(len(specs) + len(children)), parent.name,
+                                                xs[i], ys[j], xs[i + 1], ys[j + 1],
+                                                parent.lon_inc / refinement, parent.lat_inc / refinement))
+        specs.extend(children)
+        level = children
+    return specs
+
+
+def _record(label, value, byteorder):
+    label = label.ljust(8).encode('ascii')
+    if isinstance(value, int):
+        return label + struct.pack(byteorder + 'i', value) + b'\0' * 4
+    if isinstance(value, float):
+        return label + struct.pack(byteorder + 'd', value)
+    return label + value[:8].ljust(8).encode('ascii')
+
+
+def _nodes(spec):
+    rows = int(round((spec.north - spec.south) / spec.lat_inc)) + 1
+    cols = int(round((spec.east - spec.west) / spec.lon_inc)) + 1
+    return rows, cols
+
+
+def write_gsb(path, subgrids, field, byteorder='<', systemFrom='SYNTH_F', systemTo='SYNTH_T', accuracy=ACCURACY):
+    """
+    Writes a NTv2 file with the given SubGridSpec list, the shift of every
+    node being field(lon, lat) in arc seconds (longitude positive east).
+    byteorder is '<' or '>'.
+    """
+    overview = [('NUM_OREC', OVERVIEW_RECORDS), ('NUM_SREC', SUBGRID_RECORDS), ('NUM_FILE', len(subgrids)),
+                ('GS_TYPE', 'SECONDS'), ('VERSION', 'NTv2.0'),
+                ('SYSTEM_F', systemFrom), ('SYSTEM_T', systemTo),
+                ('MAJOR_F', 6378388.0), ('MINOR_F', 6356911.946),
+                ('MAJOR_T', 6378137.0), ('MINOR_T', 6356752.314)]
+    recordType = numpy.dtype('{}f4'.format(byteorder))
+
+    with open(path, 'wb') as f:
+        f.write(b''.join(_record(label, value, byteorder) for label, value in overview))
+        for spec in subgrids:
+            rows, cols = _nodes(spec)
+            header = [('SUB_NAME', spec.name), ('PARENT', spec.parent),
+                      ('CREATED', DATE), ('UPDATED', DATE),
+                      # Seconds, longitudes positive west
+                      ('S_LAT', spec.south * 3600.0), ('N_LAT', spec.north * 3600.0),
+                      ('E_LONG', -spec.east * 3600.0), ('W_LONG', -spec.west * 3600.0),
+                      ('LAT_INC', spec.lat_inc * 3600.0), ('LONG_INC', spec.lon_inc * 3600.0),
+                      ('GS_COUNT', rows * cols)]
+            f.write(b''.join(_record(label, value, byteorder) for label, value in header))
+
+            # Row 0 is the southern edge, column 0 the eastern one
+            lat = spec.south + numpy.arange(rows)[:, None] * spec.lat_inc
+            lon = spec.east - numpy.arange(cols)[None, :] * spec.lon_inc
+            dlon, dlat = field(*numpy.broadcast_arrays(lon, lat))
+            data = numpy.empty((rows, cols, 4), dtype=recordType)
+            data[..., 0] = dlat
+            data[..., 1] = -dlon
+            data[..., 2:] = accuracy
+            f.write(data.tobytes())
+        f.write(_record('END', '', byteorder))
+    return path
+
+
+def write_gtx(path, extent, resolution, height=40.0):
+    """
+    Writes a GTX vertical grid covering extent with a constant height,
+    metres.
+    """
+    west, south, east, north = extent
+    rows = int(math.ceil((north - south) / resolution - 1e-9)) + 1
+    cols = int(math.ceil((east - west) / resolution - 1e-9)) + 1
+    with open(path, 'wb') as f:
+        f.write(struct.pack('>4d2i', south, west, resolution, resolution, rows, cols))
+        f.write(numpy.full(rows * cols, height, dtype='>f4').tobytes())
+    return path
+
+
+def make_field(name, **kwargs):
+    if name == 'constant':
+        return constant_field(**kwargs)
+    if name == 'linear':
+        return linear_field(**kwargs)
+    if name == 'smooth':
+        return smooth_field(**kwargs)
+    raise ValueError('Unknown shift field "{}".'.format(name))
+
+
+def field_error(grid, field, points=100000, seed=0):
+    """
+    Compares the shifts interpolated in grid (a GsbFile or a path) with
+    field at random points of its extent. Returns the maximum and RMS
+    error, arc seconds.
+    """
+    from ntv2_transformations.gridshift import grid_shifts
+
+    if not isinstance(grid, GsbFile):
+        grid = load_grid(grid)
+    rng = numpy.random.default_rng(seed)
+    west = min(g.lon_min for g in grid.roots)
+    east = max(g.lon_max for g in grid.roots)
+    south = min(g.lat_min for g in grid.roots)
+    north = max(g.lat_max for g in grid.roots)
+    lon = rng.uniform(west, east, points)
+    lat = rng.uniform(south, north, points)
+
+    dlon, dlat = grid_shifts(grid, lon, lat)
+    expectedLon, expectedLat = field(lon, lat)
+    error = numpy.hypot(dlon * 3600.0 - expectedLon, dlat * 3600.0 - expectedLat)
+    error = error[numpy.isfinite(error)]
+    return float(error.max()), float(numpy.sqrt(numpy.mean(error ** 2)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ntv2_transformations.gridgen',
+                                     description='Write a synthetic NTv2 grid with an analytic shift.')
+    parser.add_argument('output', help='output .gsb file')
+    parser.add_argument('--extent', type=float, nargs=4, metavar=('WEST', 'SOUTH', 'EAST', 'NORTH'),
+                        default=(-10.0, 36.0, -6.0, 42.0), help='extent of the root sub-grid, degrees')
+    parser.add_argument('--resolution', type=float, default=0.1, help='node spacing of the root sub-grid, degrees')
+    parser.add_argument('--depth', type=int, default=0, help='levels of nested sub-grids')
+    parser.add_argument('--branching', type=int, default=2, help='children per side of every sub-grid')
+    parser.add_argument('--refinement', type=int, default=2, help='density of the children over their parent')
+    parser.add_argument('--field', choices=FIELDS, default='smooth', help='shift field')
+    parser.add_argument('--amplitude', type=float, default=2.0, help='amplitude of the smooth field, arc seconds')
+    parser.add_argument('--wavelength', type=float, default=1.0, help='wavelength of the smooth field, degrees')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the smooth field')
+    parser.add_argument('--big-endian', action='store_true', help='write a big endian file')
+    parser.add_argument('--check', action='store_true', help='print the interpolation error against the field')
+    args = parser.parse_args(argv)
+
+    kwargs = {}
+    if args.field == 'smooth':
+        kwargs = dict(amplitude=args.amplitude, wavelength=args.wavelength, seed=args.seed)
+    field = make_field(args.field, **kwargs)
+    try:
+        subgrids = nested_subgrids(args.extent, args.resolution, args.depth, args.branching, args.refinement)
+    except ValueError as e:
+        parser.error(str(e))
+    write_gsb(args.output, subgrids, field, '>' if args.big_endian else '<')
+    print('{}: {} sub-grids, {} nodes'.format(args.output, len(subgrids), sum(r * c for r, c in map(_nodes, subgrids))))
+
+    if args.check:
+        maximum, rms = field_error(args.output, field)
+        print('Interpolation error: max {:.6f}", RMS {:.6f}"'.format(maximum, rms))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
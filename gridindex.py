@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    gridindex.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+
+# Same tolerance PROJ uses when a point falls exactly on a grid edge
+EDGE_EPSILON = 1e-10
+
+# Above this number of cells the lookup table is not built and points are
+# routed walking the sub-grid tree instead
+MAX_CELLS = 4 * 1024 * 1024
+
+
+def edge_tolerance(subgrid):
+    return (subgrid.lon_inc + subgrid.lat_inc) / 3600.0 * EDGE_EPSILON
+
+
+def inside(subgrid, lon, lat):
+    eps = edge_tolerance(subgrid)
+    return ((lon >= subgrid.lon_min - eps) & (lon <= subgrid.lon_max + eps) &
+            (lat >= subgrid.lat_min - eps) & (lat <= subgrid.lat_max + eps))
+
+
+def descend(grid, lon, lat):
+    """
+    Returns, for every point, the position in grid.subgrids of the finest
+    sub-grid containing it, or -1 when the point is outside the grid.
+    Sub-grids are tested walking the parent/child tree, siblings in file
+    order, as PROJ does.
+    """
+    positions = {id(g): i for i, g in enumerate(grid.subgrids)}
+    index = numpy.full(lon.shape, -1, dtype=numpy.intp)
+
+    def walk(subgrids, candidates):
+        for g in subgrids:
+            found = candidates & inside(g, lon, lat)
+            if not found.any():
+                continue
+            index[found] = positions[id(g)]
+            candidates = candidates & ~found
+            if g.children:
+                walk(g.children, found)
+
+    walk(grid.roots, numpy.ones(lon.shape, dtype=bool))
+    return index
+
+
+class SubGridIndex:
+    """
+    Lookup index over the sub-grid extents of a NTv2 file.
+
+    All the sub-grid edges split the plane in a table of cells, each one
+    covered by the same set of sub-grids, so the finest sub-grid of every
+    cell is resolved once when the index is built. A point is then routed
+    with two binary searches on the edges and a table lookup. Points lying
+    on a cell edge (within the PROJ tolerance) are resolved walking the
+    sub-grid tree, so results are the same as descend().
+    """
+
+    def __init__(self, grid, maxCells=MAX_CELLS):
+        self.grid = grid
+        self.table = None
+
+        subgrids = grid.subgrids
+        self.lonEdges = numpy.unique([v for g in subgrids for v in (g.lon_min, g.lon_max)])
+        self.latEdges = numpy.unique([v for g in subgrids for v in (g.lat_min, g.lat_max)])
+        self.tolerance = max([edge_tolerance(g) for g in subgrids], default=0.0)
+
+        if not subgrids or (len(self.lonEdges) + 1) * (len(self.latEdges) + 1) > maxCells:
+            return
+
+        # Cell i spans [edges[i - 1], edges[i]), cells 0 and len(edges)
+        # lie outside the grid extent
+        lonCenters = numpy.concatenate(([self.lonEdges[0] - 1.0],
+                                        (self.lonEdges[:-1] + self.lonEdges[1:]) / 2.0,
+                                        [self.lonEdges[-1] + 1.0]))
+        latCenters = numpy.concatenate(([self.latEdges[0] - 1.0],
+                                        (self.latEdges[:-1] + self.latEdges[1:]) / 2.0,
+                                        [self.latEdges[-1] + 1.0]))
+        x, y = numpy.meshgrid(lonCenters, latCenters)
+        self.table = descend(grid, x.ravel(), y.ravel()).reshape(x.shape)
+
+    def locate(self, lon, lat):
+        if self.table is None:
+            return descend(self.grid, lon, lat)
+
+        i = numpy.searchsorted(self.lonEdges, lon, side='right')
+        j = numpy.searchsorted(self.latEdges, lat, side='right')
+        index = self.table[j, i]
+
+        near = self._nearEdge(self.lonEdges, lon, i) | self._nearEdge(self.latEdges, lat, j)
+        if near.any():
+            index[near] = descend(self.grid, lon[near], lat[near])
+
+        return index
+
+    def _nearEdge(self, edges, values, cells):
+        last = len(edges) - 1
+        before = edges[numpy.clip(cells - 1, 0, last)]
+        after = edges[numpy.clip(cells, 0, last)]
+        return (numpy.abs(values - before) <= self.tolerance) | (numpy.abs(values - after) <= self.tolerance)
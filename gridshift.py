@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    gridshift.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+
+from ntv2_transformations.gsb import GsbFile, load_grid
+from ntv2_transformations.gridindex import inside
+
+# Inverse solver defaults, PROJ stops at 1e-12 radians or 10 iterations
+INVERSE_TOLERANCE = 1e-12 * 180.0 / numpy.pi
+INVERSE_MAX_ITERATIONS = 10
+
+# Length of one second of latitude in metres, enough to express shifts and
+# cell sizes in ground units
+ARCSEC_METRES = 30.87
+
+MAX_SAMPLING_STEP = 1024
+
+
+def _asGrid(grid):
+    if isinstance(grid, GsbFile):
+        return grid
+    return load_grid(grid)
+
+
+def _asArrays(lon, lat):
+    lon = numpy.asarray(lon, dtype=numpy.float64)
+    lat = numpy.asarray(lat, dtype=numpy.float64)
+    if lon.shape != lat.shape:
+        raise ValueError('Longitude and latitude arrays must have the same shape.')
+    return lon, lat
+
+
+def locate(grid, lon, lat):
+    """
+    Returns, for every point, the position in grid.subgrids of the finest
+    sub-grid containing it, or -1 when the point is outside the grid.
+    """
+    return grid.index.locate(lon, lat)
+
+
+def interpolate(subgrid, lon, lat):
+    """
+    Bilinear interpolation of the sub-grid shifts at the given points.
+    Returns longitude (positive east) and latitude shifts in degrees.
+    """
+    # Work in the file orientation: seconds, longitudes positive west,
+    # column 0 on the eastern edge and row 0 on the southern edge.
+    x = (-lon * 3600.0 - subgrid.east) / subgrid.lon_inc
+    y = (lat * 3600.0 - subgrid.south) / subgrid.lat_inc
+
+    ix = numpy.floor(x)
+    iy = numpy.floor(y)
+    fx = x - ix
+    fy = y - iy
+
+    # Points on the far edges are interpolated from the last cell
+    for i, f, size in ((ix, fx, subgrid.cols), (iy, fy, subgrid.rows)):
+        edge = i >= size - 1
+        i[edge] = size - 2
+        f[edge] = 1.0
+        low = i < 0
+        i[low] = 0
+        f[low] = 0.0
+        numpy.clip(f, 0.0, 1.0, out=f)
+
+    ix = ix.astype(numpy.intp)
+    iy = iy.astype(numpy.intp)
+
+    # Fancy indexing on the memory-mapped records only reads the pages
+    # holding the cells we need.
+    data = subgrid.data
+    f00 = data[iy, ix, :2].astype(numpy.float64)
+    f10 = data[iy, ix + 1, :2].astype(numpy.float64)
+    f01 = data[iy + 1, ix, :2].astype(numpy.float64)
+    f11 = data[iy + 1, ix + 1, :2].astype(numpy.float64)
+
+    fx = fx[:, None]
+    fy = fy[:, None]
+    shift = (f00 * (1.0 - fx) * (1.0 - fy) +
+             f10 * fx * (1.0 - fy) +
+             f01 * (1.0 - fx) * fy +
+             f11 * fx * fy)
+
+    return -shift[:, 1] / 3600.0, shift[:, 0] / 3600.0
+
+
+def grid_shifts(grid, lon, lat):
+    """
+    Returns longitude and latitude shifts in degrees for 1D arrays of
+    points. Points outside the grid get NaN shifts.
+    """
+    dlon = numpy.full(lon.shape, numpy.nan)
+    dlat = numpy.full(lon.shape, numpy.nan)
+
+    index = locate(grid, lon, lat)
+    for i in numpy.unique(index):
+        if i < 0:
+            continue
+        mask = index == i
+        dlon[mask], dlat[mask] = interpolate(grid.subgrids[i], lon[mask], lat[mask])
+
+    return dlon, dlat
+
+
+def shift_points(lon, lat, grid):
+    """
+    Applies the NTv2 shift of grid (a GsbFile or a path to a .gsb file) to
+    geographic coordinates in degrees, the same way PROJ does with
+    +nadgrids in the forward direction. Points outside the grid are
+    returned as NaN.
+    """
+    grid = _asGrid(grid)
+    lon, lat = _asArrays(lon, lat)
+    shape = lon.shape
+    lon = lon.ravel()
+    lat = lat.ravel()
+
+    dlon, dlat = grid_shifts(grid, lon, lat)
+
+    return (lon + dlon).reshape(shape), (lat + dlat).reshape(shape)
+
+
+def inverse_shift_points(lon, lat, grid, tolerance=INVERSE_TOLERANCE, max_iterations=INVERSE_MAX_ITERATIONS, strict=False):
+    """
+    Inverse of shift_points(): finds the coordinates that the forward
+    shift moves onto the given ones, with a fixed-point iteration run on
+    whole arrays. Only the points which have not converged yet within
+    tolerance (degrees) are evaluated again at each iteration.
+
+    Points outside the grid are returned as NaN. Points which have not
+    converged after max_iterations keep their last estimate, as PROJ does,
+    unless strict is True, in which case they are returned as NaN too.
+    """
+    if max_iterations < 1:
+        raise ValueError('At least one iteration is required.')
+
+    grid = _asGrid(grid)
+    lon, lat = _asArrays(lon, lat)
+    shape = lon.shape
+    lon = lon.ravel()
+    lat = lat.ravel()
+
+    outLon = lon.copy()
+    outLat = lat.copy()
+    index = locate(grid, lon, lat)
+    outLon[index < 0] = numpy.nan
+    outLat[index < 0] = numpy.nan
+    active = numpy.flatnonzero(index >= 0)
+
+    for i in range(max_iterations):
+        x = outLon[active]
+        y = outLat[active]
+        current = index[active]
+
+        # Like PROJ, stick to the sub-grid found for the input point and
+        # only look for another one when the estimate moves out of it.
+        for g in numpy.unique(current):
+            mask = current == g
+            moved = mask & ~inside(grid.subgrids[g], x, y)
+            if moved.any():
+                current[moved] = locate(grid, x[moved], y[moved])
+        index[active] = current
+
+        dlon = numpy.full(x.shape, numpy.nan)
+        dlat = numpy.full(x.shape, numpy.nan)
+        for g in numpy.unique(current):
+            if g < 0:
+                continue
+            mask = current == g
+            dlon[mask], dlat[mask] = interpolate(grid.subgrids[g], x[mask], y[mask])
+
+        difLon = x + dlon - lon[active]
+        difLat = y + dlat - lat[active]
+        outLon[active] = x - difLon
+        outLat[active] = y - difLat
+
+        converged = difLon * difLon + difLat * difLat <= tolerance * tolerance
+        outside = current < 0
+        outLon[active[outside]] = numpy.nan
+        outLat[active[outside]] = numpy.nan
+
+        active = active[~(converged | outside)]
+        if active.size == 0:
+            break
+
+    if strict and active.size:
+        outLon[active] = numpy.nan
+        outLat[active] = numpy.nan
+
+    return outLon.reshape(shape), outLat.reshape(shape)
+
+
+def _windowRange(a, rows, cols):
+    # Largest max - min of a over the windows of rows x cols values
+    if a.size == 0:
+        return 0.0
+    rows = min(rows, a.shape[0])
+    cols = min(cols, a.shape[1])
+    window = numpy.lib.stride_tricks.sliding_window_view
+    high = window(window(a, rows, axis=0).max(axis=-1), cols, axis=1).max(axis=-1)
+    low = window(window(a, rows, axis=0).min(axis=-1), cols, axis=1).min(axis=-1)
+    return float(numpy.nanmax(high - low))
+
+
+def _window(g, extent, rows, cols):
+    # Rows and columns of g covering extent (west, south, east, north,
+    # degrees) and the windows around it, None if they do not overlap
+    west, south, east, north = extent
+    r0 = int(numpy.floor((south * 3600.0 - g.south) / g.lat_inc)) - rows
+    r1 = int(numpy.ceil((north * 3600.0 - g.south) / g.lat_inc)) + rows
+    # Columns go from east to west
+    c0 = int(numpy.floor((g.lon_max - east) * 3600.0 / g.lon_inc)) - cols
+    c1 = int(numpy.ceil((g.lon_max - west) * 3600.0 / g.lon_inc)) + cols
+    if r1 < 0 or c1 < 0 or r0 >= g.rows or c0 >= g.cols:
+        return None
+    return slice(max(r0, 0), min(r1, g.rows - 1) + 1), slice(max(c0, 0), min(c1, g.cols - 1) + 1)
+
+
+def interpolation_error(grid, span, extent=None):
+    """
+    Upper bound, in metres, of the error on the grid shift when it is
+    interpolated bilinearly between samples span metres apart, in any
+    orientation. With an extent (west, south, east, north, degrees) only
+    the nodes around it are considered.
+
+    Within a cell the shift is bilinear, so its derivatives along x and y
+    only take values between the differences of neighbouring nodes. Along
+    a segment of length span the shift departs from its chord by at most
+    span / 4 times the variation of its slope, and the bilinear
+    interpolation of a square adds the error along both sides.
+    """
+    grid = _asGrid(grid)
+    bound = 0.0
+    for g in grid.subgrids:
+        lat = (g.south + numpy.arange(g.rows) * g.lat_inc) / 3600.0
+        cosLat = numpy.cos(numpy.radians(lat))[:, None]
+        dx = g.lon_inc * ARCSEC_METRES * cosLat
+        dy = g.lat_inc * ARCSEC_METRES
+        cols = int(numpy.ceil(span / dx.min())) + 1
+        rows = int(numpy.ceil(span / dy)) + 1
+
+        latShift, lonShift = g.lat_shift, g.lon_shift
+        if extent is not None:
+            window = _window(g, extent, rows + 1, cols + 1)
+            if window is None:
+                continue
+            latShift, lonShift = latShift[window], lonShift[window]
+            cosLat, dx = cosLat[window[0]], dx[window[0]]
+
+        error = []
+        for shift in (latShift * ARCSEC_METRES, lonShift * ARCSEC_METRES * cosLat):
+            slopeX = numpy.diff(shift, axis=1) / dx
+            slopeY = numpy.diff(shift, axis=0) / dy
+            variation = _windowRange(slopeX, rows + 1, cols) + _windowRange(slopeY, rows, cols + 1)
+            error.append(variation * span / 2.0)
+        bound = max(bound, float(numpy.hypot(*error)))
+    return bound
+
+
+def max_sampling_step(grid, tolerance, pixelSize, max_step=MAX_SAMPLING_STEP, extent=None):
+    """
+    Returns the largest power of two step, in pixels of pixelSize metres,
+    for which interpolating the grid shift between samples taken every
+    step pixels stays within tolerance metres, within extent if given
+    (see interpolation_error()).
+    """
+    grid = _asGrid(grid)
+    step = 1
+    while step * 2 <= max_step and interpolation_error(grid, step * 2 * pixelSize, extent) <= tolerance:
+        step *= 2
+    return step
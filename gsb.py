@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    gsb.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import struct
+import threading
+
+import numpy
+
+# NTv2 files are a sequence of 16 bytes records: an 8 characters label
+# followed by an 8 bytes value (int32 + padding, float64 or text).
+RECORD_SIZE = 16
+OVERVIEW_RECORDS = 11
+SUBGRID_RECORDS = 11
+
+# Factor to convert GS_TYPE units to arc seconds
+GS_UNITS = {'SECONDS': 1.0,
+            'MINUTES': 60.0,
+            'DEGREES': 3600.0,
+           }
+
+_cache = {}
+_cacheLock = threading.Lock()
+
+
+def _byteorder(overview, path):
+    if len(overview) < OVERVIEW_RECORDS * RECORD_SIZE or overview[:8] != b'NUM_OREC':
+        raise ValueError('"{}" is not a NTv2 grid file.'.format(path))
+
+    # NUM_OREC is always 11, so it tells us the byte order
+    if struct.unpack('<i', overview[8:12])[0] == OVERVIEW_RECORDS:
+        return '<'
+    if struct.unpack('>i', overview[8:12])[0] == OVERVIEW_RECORDS:
+        return '>'
+    raise ValueError('Unable to detect byte order of "{}".'.format(path))
+
+
+def _read_records(buf, offset, count, byteorder):
+    records = {}
+    for i in range(count):
+        start = offset + i * RECORD_SIZE
+        label = bytes(buf[start:start + 8]).decode('ascii', 'replace').strip()
+        value = bytes(buf[start + 8:start + RECORD_SIZE])
+        if label in ('NUM_OREC', 'NUM_SREC', 'NUM_FILE', 'GS_COUNT'):
+            records[label] = struct.unpack('{}i'.format(byteorder), value[:4])[0]
+        elif label in ('MAJOR_F', 'MINOR_F', 'MAJOR_T', 'MINOR_T', 'S_LAT', 'N_LAT', 'E_LONG', 'W_LONG', 'LAT_INC', 'LONG_INC'):
+            records[label] = struct.unpack('{}d'.format(byteorder), value)[0]
+        else:
+            records[label] = value.decode('ascii', 'replace').strip()
+    return records
+
+
+class SubGrid:
+    """
+    NTv2 sub-grid. Header values are kept in the file convention (arc
+    seconds, longitudes positive west), extents are also exposed in degrees
+    with longitudes positive east.
+
+    Shift records are exposed as read-only views into the memory-mapped
+    file with shape (rows, columns): row 0 is the southernmost row and
+    column 0 the easternmost column, as they are stored on disk.
+    """
+
+    def __init__(self, header, data, units):
+        self.name = header['SUB_NAME']
+        self.parent = header['PARENT']
+        self.created = header['CREATED']
+        self.updated = header['UPDATED']
+
+        self.south = header['S_LAT'] * units
+        self.north = header['N_LAT'] * units
+        self.east = header['E_LONG'] * units
+        self.west = header['W_LONG'] * units
+        self.lat_inc = header['LAT_INC'] * units
+        self.lon_inc = header['LONG_INC'] * units
+
+        self.rows = int(round((self.north - self.south) / self.lat_inc)) + 1
+        self.cols = int(round((self.west - self.east) / self.lon_inc)) + 1
+        if self.rows * self.cols != header['GS_COUNT']:
+            raise ValueError('Sub-grid "{}" declares {} nodes, but its extent requires {}.'.format(self.name, header['GS_COUNT'], self.rows * self.cols))
+
+        self.data = data.reshape(self.rows, self.cols, 4)
+        self.children = []
+
+    @property
+    def lat_shift(self):
+        return self.data[:, :, 0]
+
+    @property
+    def lon_shift(self):
+        return self.data[:, :, 1]
+
+    @property
+    def lat_accuracy(self):
+        return self.data[:, :, 2]
+
+    @property
+    def lon_accuracy(self):
+        return self.data[:, :, 3]
+
+    @property
+    def lat_min(self):
+        return self.south / 3600.0
+
+    @property
+    def lat_max(self):
+        return self.north / 3600.0
+
+    @property
+    def lon_min(self):
+        return -self.west / 3600.0
+
+    @property
+    def lon_max(self):
+        return -self.east / 3600.0
+
+    def contains(self, lon, lat):
+        return (lon >= self.lon_min) & (lon <= self.lon_max) & (lat >= self.lat_min) & (lat <= self.lat_max)
+
+    def __repr__(self):
+        return '<SubGrid {} [{}x{}] parent={}>'.format(self.name, self.rows, self.cols, self.parent)
+
+
+class GsbFile:
+    """
+    NTv2 grid file. The whole file is mapped once and every sub-grid is a
+    zero-copy view on that mapping, so only the pages actually touched by
+    interpolation are read from disk.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+        with open(self.path, 'rb') as f:
+            overview = f.read(OVERVIEW_RECORDS * RECORD_SIZE)
+
+        self.byteorder = _byteorder(overview, self.path)
+        header = self._readRecords(overview, 0, OVERVIEW_RECORDS)
+        self.num_file = header['NUM_FILE']
+        self.gs_type = header['GS_TYPE']
+        self.version = header['VERSION']
+        self.system_from = header['SYSTEM_F']
+        self.system_to = header['SYSTEM_T']
+        self.major_from = header['MAJOR_F']
+        self.minor_from = header['MINOR_F']
+        self.major_to = header['MAJOR_T']
+        self.minor_to = header['MINOR_T']
+
+        if self.gs_type.upper() not in GS_UNITS:
+            raise ValueError('Unsupported GS_TYPE "{}" in "{}".'.format(self.gs_type, self.path))
+        units = GS_UNITS[self.gs_type.upper()]
+
+        self._index = None
+        self._map = numpy.memmap(self.path, dtype=numpy.uint8, mode='r')
+        recordType = numpy.dtype('{}f4'.format(self.byteorder))
+
+        self.subgrids = []
+        offset = OVERVIEW_RECORDS * RECORD_SIZE
+        for i in range(self.num_file):
+            sub = self._readRecords(self._map, offset, SUBGRID_RECORDS)
+            offset += SUBGRID_RECORDS * RECORD_SIZE
+            size = sub['GS_COUNT'] * RECORD_SIZE
+            if offset + size > len(self._map):
+                raise ValueError('Sub-grid "{}" is truncated in "{}".'.format(sub['SUB_NAME'], self.path))
+            data = self._map[offset:offset + size].view(recordType)
+            self.subgrids.append(SubGrid(sub, data, units))
+            offset += size
+
+        self._byName = {g.name: g for g in self.subgrids}
+        for g in self.subgrids:
+            parent = self._byName.get(g.parent)
+            if parent is not None and parent is not g:
+                parent.children.append(g)
+
+    def _readRecords(self, buf, offset, count):
+        return _read_records(buf, offset, count, self.byteorder)
+
+    @property
+    def roots(self):
+        return [g for g in self.subgrids if g.parent.upper() == 'NONE' or g.parent not in self._byName]
+
+    @property
+    def index(self):
+        # Built on first use, then shared by every lookup on this file
+        if self._index is None:
+            from ntv2_transformations.gridindex import SubGridIndex
+            self._index = SubGridIndex(self)
+        return self._index
+
+    def subgrid(self, name):
+        return self._byName[name]
+
+    def close(self):
+        # The mapping is released once the last sub-grid view is gone
+        self.subgrids = []
+        self._byName = {}
+        self._index = None
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return '<GsbFile {} ({} sub-grids)>'.format(self.path, len(self.subgrids))
+
+
+def load_grid(path):
+    """
+    Returns a GsbFile for the given path, mapping it only once per process.
+    The cached mapping is refreshed when the file on disk changes.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    with _cacheLock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        grid = GsbFile(path)
+        _cache[path] = (key, grid)
+        return grid
+
+
+def check_file(path):
+    """
+    Checks the structure of a NTv2 file reading only its headers: every
+    sub-grid must declare as many nodes as its extent requires and the
+    file must be long enough to hold them. Raises ValueError otherwise,
+    e.g. for a truncated download.
+    """
+    with open(path, 'rb') as f:
+        length = os.fstat(f.fileno()).st_size
+        overview = f.read(OVERVIEW_RECORDS * RECORD_SIZE)
+        byteorder = _byteorder(overview, path)
+        header = _read_records(overview, 0, OVERVIEW_RECORDS, byteorder)
+        units = GS_UNITS.get(str(header.get('GS_TYPE', '')).upper())
+        if units is None or not isinstance(header.get('NUM_FILE'), int) or header['NUM_FILE'] < 1:
+            raise ValueError('Invalid NTv2 header in "{}".'.format(path))
+
+        offset = OVERVIEW_RECORDS * RECORD_SIZE
+        for i in range(header['NUM_FILE']):
+            f.seek(offset)
+            raw = f.read(SUBGRID_RECORDS * RECORD_SIZE)
+            if len(raw) < SUBGRID_RECORDS * RECORD_SIZE or raw[:8] != b'SUB_NAME':
+                raise ValueError('Sub-grid {} header is missing or truncated in "{}".'.format(i + 1, path))
+            sub = _read_records(raw, 0, SUBGRID_RECORDS, byteorder)
+            try:
+                rows = int(round((sub['N_LAT'] - sub['S_LAT']) / sub['LAT_INC'])) + 1
+                cols = int(round((sub['W_LONG'] - sub['E_LONG']) / sub['LONG_INC'])) + 1
+            except (KeyError, TypeError, ValueError, ZeroDivisionError, OverflowError):
+                raise ValueError('Invalid header of sub-grid {} in "{}".'.format(i + 1, path))
+            if rows < 1 or cols < 1 or rows * cols != sub.get('GS_COUNT'):
+                raise ValueError('Sub-grid "{}" declares {} nodes, but its extent requires {}.'.format(sub.get('SUB_NAME'), sub.get('GS_COUNT'), rows * cols))
+            offset += SUBGRID_RECORDS * RECORD_SIZE + rows * cols * RECORD_SIZE
+            if offset > length:
+                raise ValueError('Sub-grid "{}" is truncated in "{}".'.format(sub['SUB_NAME'], path))
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    manifest.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import struct
+import sys
+import threading
+from collections import namedtuple
+
+from ntv2_transformations.download import WORKERS, fetch_all, verify
+
+pluginPath = os.path.dirname(__file__)
+
+# The grid directory and the download server can be overridden, e.g. to
+# share one grid cache between several installs or to use a local mirror
+GRIDS_PATH_VARIABLE = 'NTV2_GRIDS_PATH'
+GRIDS_URL_VARIABLE = 'NTV2_GRIDS_URL'
+GRIDS_URL = 'http://www.naturalgis.pt/downloads/ntv2grids'
+
+MISSING_GRIDS = 'NTv2 grid files not found: {}. Download them with "python -m ntv2_transformations --fetch-grids" or enable the grid download in the provider settings.'
+MISSING_GRIDS_DOWNLOADING = 'NTv2 grid files not found: {}. They are being downloaded in background, try again in a while.'
+
+# GTX header: origin latitude and longitude, latitude and longitude
+# increments, rows and columns, followed by rows x columns float32 heights
+GTX_HEADER = struct.Struct('>4d2i')
+
+GridFile = namedtuple('GridFile', ['name', 'group', 'directory', 'size', 'sha256'])
+
+# (file name, group, server directory, size, SHA-256). A group is the set
+# of files used by one algorithm. Size and hash are checked when known;
+# the structure of every file is always checked (see check_grid()), so a
+# truncated or damaged file is never taken as present. The rows can be
+# printed with the sizes and hashes of the files in the grid directory
+# by "python -m ntv2_transformations.manifest".
+GRID_FILES = [
+    ('AT_GIS_GRID.gsb', 'at', 'at', None, None),
+    ('A66_National_13_09_01.gsb', 'au_agd', 'au', None, None),
+    ('National_84_02_07_01.gsb', 'au_agd', 'au', None, None),
+    ('GDA94_GDA2020_conformal.gsb', 'au_gda', 'au', None, None),
+    ('GDA94_GDA2020_conformal_and_distortion.gsb', 'au_gda', 'au', None, None),
+    ('100800401.gsb', 'cat', 'cat', None, None),
+    ('CHENYX06a.gsb', 'ch', 'ch', None, None),
+    ('chenyx06etrs.gsb', 'ch', 'ch', None, None),
+    ('BETA2007.gsb', 'de', 'de', None, None),
+    ('PENR2009.gsb', 'es', 'es', None, None),
+    ('HRNTv2.gsb', 'hr', 'hr', None, None),
+    ('RER_AD400_MM_ETRS89_V1A.gsb', 'it', 'it_rer', None, None),
+    ('RER_ED50_ETRS89_GPS7_K2.GSB', 'it', 'it_rer', None, None),
+    ('rdtrans2008.gsb', 'nl', 'nl', None, None),
+    ('naptrans2008.gtx', 'nl', 'nl', None, None),
+    ('pt73_e89.gsb', 'pt', 'pt', None, None),
+    ('ptED_e89.gsb', 'pt', 'pt', None, None),
+    ('ptLB_e89.gsb', 'pt', 'pt', None, None),
+    ('ptLX_e89.gsb', 'pt', 'pt', None, None),
+    ('D73_ETRS89_geo.gsb', 'pt', 'pt', None, None),
+    ('DLX_ETRS89_geo.gsb', 'pt', 'pt', None, None),
+    ('OSTN02_NTv2.gsb', 'uk', 'uk', None, None),
+]
+
+MANIFEST = {row[0]: GridFile(*row) for row in GRID_FILES}
+
+GRID_GROUPS = {}
+for g in MANIFEST.values():
+    GRID_GROUPS.setdefault(g.group, []).append(g.name)
+
+_preflight = None
+_preflightLock = threading.Lock()
+
+
+def grids_path():
+    return os.environ.get(GRIDS_PATH_VARIABLE) or os.path.join(pluginPath, 'grids')
+
+
+def grid_path(name):
+    return os.path.join(grids_path(), name)
+
+
+def grid_url(name):
+    g = MANIFEST[name]
+    base = os.environ.get(GRIDS_URL_VARIABLE) or GRIDS_URL
+    return '{}/{}/{}'.format(base.rstrip('/'), g.directory, g.name)
+
+
+def check_grid(path):
+    """
+    Checks the structure of a grid file from its header: the node counts
+    must match the file length. Raises ValueError for invalid files.
+    """
+    if path.lower().endswith('.gtx'):
+        with open(path, 'rb') as f:
+            length = os.fstat(f.fileno()).st_size
+            header = f.read(GTX_HEADER.size)
+        if len(header) < GTX_HEADER.size:
+            raise ValueError('"{}" is not a GTX grid file.'.format(path))
+        rows, cols = GTX_HEADER.unpack(header)[4:]
+        if rows < 1 or cols < 1 or length != GTX_HEADER.size + rows * cols * 4:
+            raise ValueError('"{}" does not hold the {}x{} nodes it declares.'.format(path, rows, cols))
+        return
+
+    from ntv2_transformations.gsb import check_file
+    check_file(path)
+
+
+def _names(groups=None):
+    if groups is None:
+        return list(MANIFEST)
+    return [name for group in groups for name in GRID_GROUPS[group]]
+
+
+def preflight(groups=None, workers=WORKERS):
+    """
+    Downloads the grid files of the given groups (all by default) that
+    are missing in the grid directory. Raises GridDownloadError if any
+    of them could not be fetched.
+    """
+    files = []
+    for name in _names(groups):
+        g = MANIFEST[name]
+        files.append((grid_url(name), grid_path(name), g.size, g.sha256))
+    return fetch_all(files, workers, check=check_grid)
+
+
+def convert(groups=None):
+    """
+    Converts the NTv2 grids of the given groups (all by default) to
+    GeoTIFF grids, when PROJ can read them. Returns the converted files.
+    """
+    from ntv2_transformations.gridconvert import convert_grids, gtg_supported
+
+    if not gtg_supported():
+        return []
+    return convert_grids([grid_path(name) for name in _names(groups)])
+
+
+def preflight_async(groups=None, convertGrids=False):
+    """
+    Runs preflight() in a background thread, e.g. when the provider is
+    loaded, then converts the grids to GeoTIFF if convertGrids is set.
+    Algorithms never wait for it, see missing_grids().
+    """
+    global _preflight
+
+    def run():
+        try:
+            preflight(groups)
+        except Exception:
+            # Reported by missing_grids() when an algorithm needs the files
+            pass
+        if convertGrids:
+            try:
+                convert(groups)
+            except Exception:
+                # The .gsb files are used instead
+                pass
+
+    with _preflightLock:
+        if _preflight is None or not _preflight.is_alive():
+            _preflight = threading.Thread(target=run, name='ntv2-grids-preflight', daemon=True)
+            _preflight.start()
+    return _preflight
+
+
+def preflight_running():
+    thread = _preflight
+    return thread is not None and thread.is_alive()
+
+
+def missing_grids(names):
+    """
+    Returns the given grid files that are not available, complete, in the
+    grid directory. Only reads the file headers: never downloads and
+    never waits for a running preflight, so it is cheap enough to be
+    called before every run.
+    """
+    missing = []
+    for name in names:
+        g = MANIFEST.get(name)
+        if g is None:
+            found = os.path.isfile(grid_path(name))
+        else:
+            found = verify(grid_path(name), g.size, check=check_grid)
+        if not found:
+            missing.append(name)
+    return missing
+
+
+def grid_rows(groups=None):
+    """
+    GRID_FILES rows, with the size and SHA-256 of the files found in the
+    grid directory, for the given groups (all by default). Files missing
+    or failing check_grid() keep the values of the manifest.
+    """
+    from ntv2_transformations.download import file_digest
+
+    rows = []
+    for name in _names(groups):
+        g = MANIFEST[name]
+        path = grid_path(name)
+        if verify(path, check=check_grid):
+            g = g._replace(size=os.path.getsize(path), sha256=file_digest(path))
+        rows.append(tuple(g))
+    return rows
+
+
+def main(argv=None):
+    """
+    Prints the GRID_FILES rows of the grids in the grid directory, to
+    fill in the manifest from a set of downloaded and checked grids.
+    """
+    for row in grid_rows(argv or None):
+        print('    {!r},'.format(row))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
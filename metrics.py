@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    metrics.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+METRICS_PATH_VARIABLE = 'NTV2_METRICS_PATH'
+
+METRICS_FILE_SETTING = 'NTV2_METRICS_FILE'
+
+# Stages of a run, in execution order. stats is the time spent counting
+# features, pixels and bytes for the report itself.
+STAGES = ('parameters', 'grids', 'export', 'transform', 'output', 'stats')
+
+# Files written next to the main one by some formats
+SIDECARS = {'.shp': ('.shx', '.dbf', '.prj', '.cpg', '.qix', '.sbn', '.sbx'),
+            '.tab': ('.dat', '.id', '.map', '.ind'),
+            '.tif': ('.tif.ovr', '.tif.aux.xml'),
+           }
+
+_fileLock = threading.Lock()
+
+
+class RunMetrics:
+    """
+    Wall time of the stages of one algorithm run, and its counters
+    (features, pixels, bytes). Stages can be nested: the time spent in an
+    inner stage is not counted in the outer one, so stage times add up to
+    the total.
+    """
+
+    def __init__(self, algorithm, **info):
+        self.algorithm = algorithm
+        self.info = info
+        self.started = datetime.now(timezone.utc)
+        self.stages = {}
+        self.counters = {}
+        self.status = 'running'
+        self._start = time.perf_counter()
+        self._end = None
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            inner = self._stack.pop()
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - inner
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def count(self, name, value):
+        if value is not None:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self, status='ok'):
+        self.status = status
+        self._end = time.perf_counter()
+
+    def as_dict(self):
+        end = self._end if self._end is not None else time.perf_counter()
+        data = dict(algorithm=self.algorithm,
+                    started=self.started.isoformat(),
+                    status=self.status,
+                    total=round(end - self._start, 6),
+                    stages={name: round(self.stages[name], 6) for name in STAGES if name in self.stages},
+                    counters=dict(self.counters))
+        data['stages'].update((name, round(value, 6)) for name, value in self.stages.items() if name not in STAGES)
+        data.update(self.info)
+        return data
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), sort_keys=False)
+
+
+@contextmanager
+def stage(metrics, name):
+    """
+    metrics.stage(name), doing nothing when metrics is None.
+    """
+    if metrics is None:
+        yield None
+    else:
+        with metrics.stage(name):
+            yield metrics
+
+
+def metrics_path(setting=None):
+    """
+    File the runs are appended to, from the provider setting or the
+    environment. None when not configured.
+    """
+    return setting or os.environ.get(METRICS_PATH_VARIABLE) or None
+
+
+def write_metrics(metrics, path):
+    """
+    Appends the run to path as a JSON line.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    line = metrics.to_json() + '\n'
+    with _fileLock:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+def dataset_size(path):
+    """
+    Bytes on disk of a dataset: the file with its sidecar files (e.g.
+    .dbf and .shx of a shapefile), or all the files of a directory. None
+    for anything which is not a local file (connection strings, /vsi
+    paths, services).
+    """
+    if not path:
+        return None
+    path = path.split('|')[0]
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, dirs, names in os.walk(path) for name in names)
+    if not os.path.isfile(path):
+        return None
+    stem, ext = os.path.splitext(path)
+    files = [path] + [stem + s for s in SIDECARS.get(ext.lower(), ())]
+    return sum(os.path.getsize(f) for f in files if os.path.isfile(f))
+
+
+def feature_count(source, layerName=None):
+    """
+    Number of features of a vector dataset layer, None if unknown.
+    """
+    from osgeo import ogr
+
+    ds = ogr.Open(source)
+    if ds is None:
+        return None
+    layer = ds.GetLayerByName(layerName) if layerName else ds.GetLayer(0)
+    count = layer.GetFeatureCount() if layer is not None else None
+    ds = None
+    return count if count is None or count >= 0 else None
+
+
+def pixel_count(source):
+    """
+    Number of pixels of a raster, all bands, None if unknown.
+    """
+    from osgeo import gdal
+
+    ds = gdal.Open(source)
+    if ds is None:
+        return None
+    count = ds.RasterXSize * ds.RasterYSize * ds.RasterCount
+    ds = None
+    return count
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    rasterwarp.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ntv2_transformations.gdalrunner import run_command
+from ntv2_transformations.metrics import stage
+
+COMPRESSIONS = ('NONE', 'LZW', 'DEFLATE', 'ZSTD')
+BLOCK_SIZE = 512
+
+# Suffix of the folder holding the tiles of a split warp
+TILES_SUFFIX = '.tiles'
+
+# Ground size of a degree, to express geographic pixels in metres
+METRES_PER_DEGREE = 111320.0
+
+
+def creation_options(outputFormat, tiled=False, compress=None):
+    """
+    Creation options for the output raster. Only GeoTIFF is tuned, other
+    drivers get their defaults.
+    """
+    if outputFormat != 'GTiff':
+        return []
+    options = []
+    if tiled:
+        options.extend(['TILED=YES',
+                        'BLOCKXSIZE={}'.format(BLOCK_SIZE),
+                        'BLOCKYSIZE={}'.format(BLOCK_SIZE)])
+    if compress and compress != 'NONE':
+        options.extend(['COMPRESS={}'.format(compress), 'BIGTIFF=IF_SAFER'])
+    return options
+
+
+def pixel_size(source, srs):
+    """
+    Largest pixel side of source, in metres, srs being its CRS.
+    """
+    from osgeo import gdal, osr
+
+    ds = gdal.Open(source)
+    if ds is None:
+        raise RuntimeError('Unable to open {}.'.format(source))
+    geotransform = ds.GetGeoTransform()
+    ds = None
+    size = max(abs(geotransform[1]), abs(geotransform[5]))
+
+    reference = osr.SpatialReference()
+    reference.SetFromUserInput(srs)
+    if reference.IsGeographic():
+        size *= METRES_PER_DEGREE
+    return size
+
+
+def error_threshold(tolerance, pixelSize):
+    """
+    gdalwarp -et value, in pixels, for an acceptable error of tolerance
+    metres. gdalwarp checks its approximate transformer against the exact
+    one with it, the grid bound of the displacement cache (see
+    displacement.sampling_step()) is not involved.
+    """
+    return tolerance / pixelSize
+
+
+def warp_options(threads=0, memory=0, tiled=False, compress=None, outputFormat='GTiff', errorThreshold=None):
+    """
+    gdalwarp performance arguments. threads 0 means all the CPUs, memory
+    (MB) 0 means the GDAL default, errorThreshold (pixels) None keeps the
+    default of the approximate transformer.
+    """
+    options = ['-multi', '-wo', 'NUM_THREADS={}'.format(threads or 'ALL_CPUS')]
+    if memory:
+        options.extend(['-wm', str(memory)])
+    if errorThreshold is not None:
+        options.extend(['-et', repr(errorThreshold)])
+    for option in creation_options(outputFormat, tiled, compress):
+        options.extend(['-co', option])
+    return options
+
+
+def warp(arguments, source, output, outputFormat, options=(), canceled=None):
+    """
+    Warps source in process with gdal.Warp(), arguments being the CRS
+    arguments and options the warp_options() ones. canceled is polled by
+    the GDAL progress callback, stopping the warp with RuntimeError.
+    """
+    from osgeo import gdal
+
+    stopped = []
+
+    def callback(complete, message, data):
+        if canceled is not None and canceled():
+            stopped.append(True)
+            return 0
+        return 1
+
+    gdal.ErrorReset()
+    ds = gdal.Warp(output, source, options=list(arguments) + list(options) + ['-of', outputFormat],
+                   callback=callback)
+    if stopped:
+        ds = None
+        raise RuntimeError('Canceled.')
+    if ds is None:
+        raise RuntimeError(gdal.GetLastErrorMsg() or 'Unable to warp {}.'.format(source))
+    ds = None
+    return output
+
+
+def output_grid(arguments, source):
+    """
+    Returns the geotransform and size gdalwarp computes for the output of
+    the given CRS arguments, without warping any pixel.
+    """
+    from osgeo import gdal
+
+    path = '/vsimem/ntv2_{}.vrt'.format(uuid.uuid4().hex)
+    ds = gdal.Warp(path, source, options=list(arguments) + ['-of', 'VRT'])
+    if ds is None:
+        raise RuntimeError('Unable to compute the output grid of {}.'.format(source))
+    grid = ds.GetGeoTransform(), ds.RasterXSize, ds.RasterYSize
+    ds = None
+    gdal.Unlink(path)
+    return grid
+
+
+def tile_windows(xsize, ysize, tiles):
+    """
+    Splits a xsize * ysize raster in tiles * tiles pixel windows
+    (col0, row0, col1, row1).
+    """
+    cols = [xsize * i // tiles for i in range(tiles + 1)]
+    rows = [ysize * i // tiles for i in range(tiles + 1)]
+    return [(cols[i], rows[j], cols[i + 1], rows[j + 1])
+            for j in range(tiles) for i in range(tiles)
+            if cols[i + 1] > cols[i] and rows[j + 1] > rows[j]]
+
+
+def warp_tiled(arguments, source, output, outputFormat, tiles, threads=0, memory=0,
+               tiled=False, compress=None, progress=None, canceled=None,
+               errorThreshold=None, metrics=None):
+    """
+    Warps source in tiles * tiles independent gdalwarp runs, in parallel,
+    then mosaics them in a VRT. arguments are the CRS arguments (-s_srs,
+    -t_srs, -ct...).
+
+    Tiles share the pixel grid of the whole output, so the mosaic is the
+    same raster a single gdalwarp would write. With a VRT output the tiles
+    are kept next to it, otherwise the mosaic is copied to output and the
+    tiles removed. The mosaic is timed as the output stage of metrics.
+    """
+    from osgeo import gdal
+
+    geotransform, xsize, ysize = output_grid(arguments, source)
+    x0, dx, _, y0, _, dy = geotransform
+    windows = tile_windows(xsize, ysize, tiles)
+
+    cpus = threads or os.cpu_count() or 1
+    workers = max(1, min(len(windows), cpus))
+    tileThreads = max(1, cpus // workers)
+
+    tilesPath = output + TILES_SUFFIX
+    os.makedirs(tilesPath, exist_ok=True)
+
+    commands = []
+    for c0, r0, c1, r1 in windows:
+        path = os.path.join(tilesPath, 'tile_{}_{}.tif'.format(r0, c0))
+        command = ['gdalwarp', '-overwrite'] + list(arguments)
+        command.extend(warp_options(tileThreads, memory, True, compress, 'GTiff', errorThreshold))
+        command.extend(['-te', repr(x0 + c0 * dx), repr(y0 + r1 * dy), repr(x0 + c1 * dx), repr(y0 + r0 * dy),
+                        '-ts', str(c1 - c0), str(r1 - r0),
+                        '-of', 'GTiff', source, path])
+        commands.append((path, command))
+
+    def run(command):
+        # Running commands are terminated as soon as the run is canceled
+        return run_command(command, canceled)
+
+    keepTiles = False
+    try:
+        paths = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run, command): path for path, command in commands}
+            for future in as_completed(futures):
+                if canceled is not None and canceled():
+                    for f in futures:
+                        f.cancel()
+                    raise RuntimeError('Canceled.')
+                code, errors = future.result()
+                if code != 0:
+                    for f in futures:
+                        f.cancel()
+                    raise RuntimeError(errors or 'gdalwarp failed.')
+                paths.append(futures[future])
+                if progress is not None:
+                    progress(100.0 * len(paths) / len(commands))
+
+        # Keep the tile order stable, the VRT lists them in this order
+        paths = [path for path, command in commands]
+        with stage(metrics, 'output'):
+            mosaic = '/vsimem/ntv2_{}.vrt'.format(uuid.uuid4().hex)
+            try:
+                if gdal.BuildVRT(mosaic, paths) is None:
+                    raise RuntimeError(gdal.GetLastErrorMsg() or 'Unable to build the tile mosaic.')
+                ds = gdal.Translate(output, mosaic,
+                                    format=outputFormat,
+                                    creationOptions=creation_options(outputFormat, tiled, compress))
+                if ds is None:
+                    raise RuntimeError(gdal.GetLastErrorMsg() or 'Unable to write {}.'.format(output))
+                ds = None
+            finally:
+                gdal.Unlink(mosaic)
+        # A VRT output references the tiles
+        keepTiles = outputFormat == 'VRT'
+    finally:
+        if not keepTiles:
+            shutil.rmtree(tilesPath, ignore_errors=True)
+    return output
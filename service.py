@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    service.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import argparse
+import asyncio
+import json
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy
+
+from ntv2_transformations.batch import find
+from ntv2_transformations.commands import transformation_crs
+from ntv2_transformations.transformations import proj_definition, transformations
+from ntv2_transformations.transformercache import cache_stats, cached_transformer
+
+# Local HTTP service transforming coordinates and WKB geometries on the
+# fly. The points of concurrent requests for the same transformation are
+# coalesced and transformed as a single array.
+#
+#   GET  /transformations   supported transformations
+#   GET  /stats             request, batch and transformer cache counters
+#   POST /transform         {"country": "uk", "crs": "27700", "grid": ..., "target": ...,
+#                            "inverse": false, "coordinates": [[x, y], [x, y, z], ...]}
+#                           or "wkb": ["<hex>", ...] instead of coordinates
+#
+# Coordinates are easting/longitude first, in the order of the PROJ
+# definitions. Points outside the grids come back as null.
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Seconds a request waits for others to join its batch
+BATCH_DELAY = 0.002
+
+# Points a batch is transformed at, without waiting any longer
+BATCH_POINTS = 100000
+
+# Largest accepted request body, bytes
+MAX_BODY = 64 * 1024 * 1024
+
+# WKB geometry types, ISO and EWKB flags
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+WKB_COLLECTIONS = (4, 5, 6, 7)
+EWKB_Z = 0x80000000
+EWKB_M = 0x40000000
+EWKB_SRID = 0x20000000
+
+
+def wkb_segments(data, offset=0, segments=None):
+    """
+    Returns the coordinate sequences of a WKB (ISO or EWKB) geometry as
+    (offset, points, dimensions, byteorder) tuples, and the offset where
+    the geometry ends.
+    """
+    if segments is None:
+        segments = []
+    byteorder = '<' if data[offset] == 1 else '>'
+    code, = struct.unpack_from(byteorder + 'I', data, offset + 1)
+    offset += 5
+    if code & EWKB_SRID:
+        offset += 4
+    hasZ = bool(code & EWKB_Z)
+    hasM = bool(code & EWKB_M)
+    dimension, kind = divmod(code & 0x0FFFFFFF, 1000)
+    hasZ = hasZ or dimension in (1, 3)
+    hasM = hasM or dimension in (2, 3)
+    dims = 2 + hasZ + hasM
+
+    if kind == WKB_POINT:
+        segments.append((offset, 1, dims, byteorder))
+        return segments, offset + 8 * dims
+    if kind == WKB_LINESTRING:
+        count, = struct.unpack_from(byteorder + 'I', data, offset)
+        segments.append((offset + 4, count, dims, byteorder))
+        return segments, offset + 4 + 8 * dims * count
+    if kind == WKB_POLYGON:
+        rings, = struct.unpack_from(byteorder + 'I', data, offset)
+        offset += 4
+        for _ in range(rings):
+            count, = struct.unpack_from(byteorder + 'I', data, offset)
+            segments.append((offset + 4, count, dims, byteorder))
+            offset += 4 + 8 * dims * count
+        return segments, offset
+    if kind in WKB_COLLECTIONS:
+        parts, = struct.unpack_from(byteorder + 'I', data, offset)
+        offset += 4
+        for _ in range(parts):
+            segments, offset = wkb_segments(data, offset, segments)
+        return segments, offset
+    raise ValueError('Unsupported WKB geometry type {}.'.format(code))
+
+
+def _views(buffer, segments):
+    # Writable (points, dimensions) arrays over the coordinates of buffer
+    return [numpy.frombuffer(buffer, dtype=byteorder + 'f8', count=count * dims, offset=offset).reshape(count, dims)
+            for offset, count, dims, byteorder in segments]
+
+
+def _hasZ(data):
+    byteorder = '<' if data[0] == 1 else '>'
+    code, = struct.unpack_from(byteorder + 'I', data, 1)
+    return bool(code & EWKB_Z) or (code & 0x0FFFFFFF) // 1000 in (1, 3)
+
+
+class Batcher:
+    """
+    Coalesces the points of concurrent requests for one transformation,
+    transforming them together once delay seconds passed since the first
+    one, or as soon as maxPoints are waiting.
+    """
+
+    def __init__(self, transform, executor, delay=BATCH_DELAY, maxPoints=BATCH_POINTS):
+        self.transform = transform
+        self.executor = executor
+        self.delay = delay
+        self.maxPoints = maxPoints
+        self.batches = 0
+        self._pending = []
+        self._points = 0
+        self._timer = None
+
+    async def submit(self, x, y, z):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((x, y, z, future))
+        self._points += len(x)
+        if self._points >= self.maxPoints:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._points = self._pending, [], 0
+        if not pending:
+            return
+        self.batches += 1
+        x, y, z = (numpy.concatenate([p[i] for p in pending]) for i in range(3))
+        job = asyncio.get_running_loop().run_in_executor(self.executor, self.transform, x, y, z)
+        job.add_done_callback(lambda done: self._split(done, pending))
+
+    @staticmethod
+    def _split(done, pending):
+        error = done.exception()
+        if error is None:
+            results = [numpy.asarray(a) for a in done.result()]
+        start = 0
+        for x, y, z, future in pending:
+            end = start + len(x)
+            # Requests whose client went away are canceled
+            if not future.done():
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(tuple(a[start:end] for a in results))
+            start = end
+
+
+class TransformationService:
+    """
+    Transformations of the registry served over HTTP/1.1, with keep-alive.
+    """
+
+    def __init__(self, delay=BATCH_DELAY, maxPoints=BATCH_POINTS, threads=None):
+        self.delay = delay
+        self.maxPoints = maxPoints
+        self.executor = ThreadPoolExecutor(threads)
+        self.requests = 0
+        self.points = 0
+        self._batchers = {}
+        self._connections = {}
+
+    def batcher(self, country, crs, grid=None, target=None, inverse=False):
+        key = (country, crs, grid, target, bool(inverse))
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            t = find(country, crs, grid, target)
+            sourceSrs, targetSrs, sourceProj, targetProj = transformation_crs(t, inverse)
+            sourceDefinition = proj_definition(sourceSrs, sourceProj)
+            targetDefinition = proj_definition(targetSrs, targetProj)
+            if sourceDefinition is None or targetDefinition is None:
+                raise ValueError('No PROJ definition for {}.'.format(sourceSrs if sourceDefinition is None else targetSrs))
+            transform = cached_transformer(sourceDefinition, targetDefinition)
+            batcher = Batcher(transform, self.executor, self.delay, self.maxPoints)
+            self._batchers[key] = batcher
+        return batcher
+
+    async def transform(self, request):
+        if not isinstance(request, dict) or 'country' not in request or 'crs' not in request:
+            raise ValueError('country and crs are required.')
+        batcher = self.batcher(str(request['country']), str(request['crs']),
+                               request.get('grid'), request.get('target'), request.get('inverse', False))
+        if 'wkb' in request:
+            return {'wkb': await self._transformWkb(batcher, request['wkb'])}
+        if 'coordinates' in request:
+            return {'coordinates': await self._transformCoordinates(batcher, request['coordinates'])}
+        raise ValueError('coordinates or wkb are required.')
+
+    async def _transformCoordinates(self, batcher, coordinates):
+        rows = [list(map(float, c)) for c in coordinates]
+        if any(len(c) not in (2, 3) for c in rows):
+            raise ValueError('Coordinates must be [x, y] or [x, y, z].')
+        x = numpy.array([c[0] for c in rows], dtype=numpy.float64)
+        y = numpy.array([c[1] for c in rows], dtype=numpy.float64)
+        z = numpy.array([c[2] if len(c) == 3 else 0.0 for c in rows], dtype=numpy.float64)
+        self.points += len(rows)
+        tx, ty, tz = await batcher.submit(x, y, z)
+
+        result = []
+        for i, c in enumerate(rows):
+            point = (tx[i], ty[i], tz[i])[:len(c)]
+            result.append([float(v) for v in point] if numpy.isfinite(point).all() else None)
+        return result
+
+    async def _transformWkb(self, batcher, geometries):
+        buffers, views = [], []
+        for value in geometries:
+            buffer = bytearray.fromhex(value)
+            segments, end = wkb_segments(buffer)
+            if end != len(buffer):
+                raise ValueError('Invalid WKB geometry.')
+            buffers.append(buffer)
+            views.append((_views(buffer, segments), _hasZ(buffer)))
+
+        coordinates = [(v, hasZ) for geometry, hasZ in views for v in geometry]
+        if not coordinates:
+            return [b.hex() for b in buffers]
+        x = numpy.concatenate([v[:, 0] for v, hasZ in coordinates])
+        y = numpy.concatenate([v[:, 1] for v, hasZ in coordinates])
+        z = numpy.concatenate([v[:, 2] if hasZ else numpy.zeros(len(v)) for v, hasZ in coordinates])
+        self.points += len(x)
+        tx, ty, tz = await batcher.submit(x, y, z)
+
+        start = 0
+        for v, hasZ in coordinates:
+            end = start + len(v)
+            v[:, 0] = tx[start:end]
+            v[:, 1] = ty[start:end]
+            if hasZ:
+                v[:, 2] = tz[start:end]
+            start = end
+        return [b.hex() if all(numpy.isfinite(v).all() for v in geometry) else None
+                for b, (geometry, hasZ) in zip(buffers, views)]
+
+    def stats(self):
+        return {'requests': self.requests,
+                'points': self.points,
+                'batches': sum(b.batches for b in self._batchers.values()),
+                'cache': cache_stats()._asdict()}
+
+    async def dispatch(self, method, path, body):
+        """
+        Returns the HTTP status and the JSON payload of a request.
+        """
+        self.requests += 1
+        if path == '/transformations' and method == 'GET':
+            return HTTPStatus.OK, [dict(country=t.country, crs=t.crs, grid=t.grid, target=t.target)
+                                   for t in transformations()]
+        if path == '/stats' and method == 'GET':
+            return HTTPStatus.OK, self.stats()
+        if path == '/transform':
+            if method != 'POST':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use POST.'}
+            try:
+                return HTTPStatus.OK, await self.transform(json.loads(body))
+            except (ValueError, TypeError, KeyError, IndexError, struct.error) as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+            except Exception as e:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+        return HTTPStatus.NOT_FOUND, {'error': 'Unknown path {}.'.format(path)}
+
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    method, path, version = line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'Bad request line.'}, False)
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keepAlive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'Request too large.'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.dispatch(method, path.split('?')[0], body)
+                await self._respond(writer, status, payload, keepAlive)
+                if not keepAlive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keepAlive):
+        body = json.dumps(payload).encode('utf-8')
+        head = ('HTTP/1.1 {} {}\r\n'
+                'Content-Type: application/json\r\n'
+                'Content-Length: {}\r\n'
+                'Connection: {}\r\n\r\n').format(status.value, status.phrase, len(body),
+                                                 'keep-alive' if keepAlive else 'close')
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def disconnect(self):
+        """
+        Closes the open connections, idle keep-alive ones included.
+        """
+        # Closing the transports ends the pending reads, handlers then return
+        connections = list(self._connections.items())
+        for task, writer in connections:
+            writer.close()
+        await asyncio.gather(*(task for task, writer in connections), return_exceptions=True)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class ServiceThread(threading.Thread):
+    """
+    Service running in a background thread, e.g. for tests. port=0 picks
+    a free port, available as self.port once started.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=0, **kwargs):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.service = TransformationService(**kwargs)
+        self._ready = threading.Event()
+        self._loop = None
+        self._stopEvent = None
+        self._error = None
+
+    def run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+            self.service.close()
+            self._ready.set()
+
+    async def _serve(self):
+        self._stopEvent = asyncio.Event()
+        try:
+            server = await self.service.start(self.host, self.port)
+        except OSError as e:
+            self._error = e
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await self._stopEvent.wait()
+            server.close()
+            await self.service.disconnect()
+
+    def start(self):
+        super().start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._stopEvent is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopEvent.set)
+        self.join()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **kwargs):
+    service = TransformationService(**kwargs)
+    server = await service.start(host, port)
+    print('Serving on http://{}:{}/'.format(*server.sockets[0].getsockname()[:2]))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        server.close()
+        await service.disconnect()
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ntv2_transformations.service',
+                                     description='Serve the transformations over HTTP on a local port.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='address to listen on, default {}'.format(DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port to listen on, default {}'.format(DEFAULT_PORT))
+    parser.add_argument('--batch-delay', type=float, default=BATCH_DELAY * 1000.0,
+                        help='milliseconds a request waits for others to join its batch')
+    parser.add_argument('--batch-points', type=int, default=BATCH_POINTS,
+                        help='points a batch is transformed at without waiting')
+    parser.add_argument('--threads', type=int, default=None, help='transformation threads, default from the CPUs')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, delay=args.batch_delay / 1000.0,
+                          maxPoints=args.batch_points, threads=args.threads))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
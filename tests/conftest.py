@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    conftest.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+
+# The modules import each other as ntv2_transformations.*, register the
+# plugin under that name whatever the name of the checkout directory is.
+# The tests only use the modules that do not need QGIS.
+
+pluginPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'ntv2_transformations' not in sys.modules:
+    spec = importlib.util.spec_from_file_location('ntv2_transformations', os.path.join(pluginPath, '__init__.py'),
+                                                  submodule_search_locations=[pluginPath])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['ntv2_transformations'] = module
+    spec.loader.exec_module(module)
+
+# The registry resolves the grid paths when it is imported, so synthetic
+# grids replace the real ones before any test module is collected
+from ntv2_transformations.manifest import GRIDS_PATH_VARIABLE  # noqa: E402
+
+gridsPath = tempfile.mkdtemp(prefix='ntv2_tests_')
+os.environ[GRIDS_PATH_VARIABLE] = gridsPath
+
+from ntv2_transformations.benchmark import write_grids  # noqa: E402
+
+write_grids(gridsPath)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(gridsPath, ignore_errors=True)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_batch.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+
+import pytest
+
+from ntv2_transformations.batch import expand_inputs, find, main
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    # Two shapefiles with their sidecars, one in a sub-folder, and a raster
+    for name in ('a', os.path.join('sub', 'b')):
+        for ext in ('.shp', '.dbf', '.shx', '.prj'):
+            touch(str(tmp_path / 'in' / (name + ext)))
+    touch(str(tmp_path / 'in' / 'c.tif'))
+    return str(tmp_path / 'in')
+
+
+def relative(files):
+    return sorted(r.replace(os.sep, '/') for f, r in files)
+
+
+def test_directory(inputs):
+    assert relative(expand_inputs([inputs], 'vector')) == ['a.shp']
+    assert relative(expand_inputs([inputs], 'vector', recursive=True)) == ['a.shp', 'sub/b.shp']
+    assert relative(expand_inputs([inputs], 'raster')) == ['c.tif']
+
+
+def test_glob_skips_sidecars(inputs):
+    assert relative(expand_inputs([os.path.join(inputs, '*')], 'vector')) == ['a.shp']
+    assert relative(expand_inputs([os.path.join(inputs, '**', '*')], 'vector', recursive=True)) == ['a.shp', 'sub/b.shp']
+    # Relative to the folder before the first wildcard
+    assert relative(expand_inputs([os.path.join(inputs, 's*', '*')], 'vector')) == ['sub/b.shp']
+
+
+def test_file_is_kept(inputs):
+    path = os.path.join(inputs, 'a.dbf')
+    assert expand_inputs([path], 'vector') == [(path, 'a.dbf')]
+
+
+def test_find():
+    t = find('uk', '27700')
+    assert (t.crs, t.grid, t.target) == ('EPSG:27700', 'OSTN02_NTv2', 'EPSG:4258')
+    assert find('pt', 'EPSG:20791', 'pt_e89').target == 'EPSG:3763'
+    with pytest.raises(ValueError, match='Several transformations'):
+        find('pt', 'EPSG:20791')
+    with pytest.raises(ValueError, match='No transformation'):
+        find('pt', 'EPSG:4326')
+
+
+def test_existing_outputs_are_reported(inputs, tmp_path, capsys):
+    output = str(tmp_path / 'out')
+    touch(os.path.join(output, 'a.shp'))
+    assert main(['-c', 'uk', '-s', '27700', '-o', output, '-r', '--dry-run', inputs]) == 0
+    out, err = capsys.readouterr()
+    assert out.count('ogr2ogr') == 1 and 'b.shp' in out
+    assert 'a.shp' in err
+    assert '1 of 2 inputs skipped' in err
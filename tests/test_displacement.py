@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_displacement.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import threading
+
+import numpy
+import pytest
+
+pytest.importorskip('pyproj')
+
+from ntv2_transformations.displacement import DisplacementCache, projection_error, sampling_step  # noqa: E402
+from ntv2_transformations.gridgen import nested_subgrids, smooth_field, write_gsb  # noqa: E402
+from ntv2_transformations.rasterwarp import METRES_PER_DEGREE  # noqa: E402
+from ntv2_transformations.transformercache import cached_transformer  # noqa: E402
+
+# DE Gauss-Krueger zone 3 to geographic ETRS89, 1 m pixels, 200 km a side
+GK3 = '+proj=tmerc +lat_0=0 +lon_0=9 +k=1 +x_0=3500000 +y_0=0 +ellps=bessel +units=m'
+LONLAT = '+proj=longlat +ellps=GRS80'
+GEOTRANSFORM = (3400000.0, 1.0, 0.0, 5600000.0, 0.0, -1.0)
+SIZE = 200000
+
+
+def interpolated_error(source, target, geotransform, size, step, samples=2000, seed=3):
+    # Error of the bilinear interpolation between the corners of the cells
+    # of step pixels, at random points, against the exact transformation
+    transform = cached_transformer(source, target)
+    rng = numpy.random.default_rng(seed)
+    u = rng.uniform(0, size - step, samples)
+    v = rng.uniform(0, size - step, samples)
+    u0, v0 = numpy.floor(u / step) * step, numpy.floor(v / step) * step
+    fu, fv = (u - u0) / step, (v - v0) / step
+    x0, dx, rx, y0, ry, dy = geotransform
+
+    def exact(pu, pv):
+        tx, ty = transform(x0 + pu * dx + pv * rx, y0 + pu * ry + pv * dy)
+        return numpy.asarray(tx), numpy.asarray(ty)
+
+    corners = [exact(u0 + a * step, v0 + b * step) for b in (0, 1) for a in (0, 1)]
+    weights = [(1 - fu) * (1 - fv), fu * (1 - fv), (1 - fu) * fv, fu * fv]
+    ix = sum(w * c[0] for w, c in zip(weights, corners))
+    iy = sum(w * c[1] for w, c in zip(weights, corners))
+    tx, ty = exact(u, v)
+    return numpy.hypot((ix - tx) * METRES_PER_DEGREE * numpy.cos(numpy.radians(ty)),
+                       (iy - ty) * METRES_PER_DEGREE).max()
+
+
+def test_projection_error():
+    # The projection alone departs from its interpolation by metres over
+    # steps of 10 km, growing with the square of the step
+    errors = [projection_error(GK3, LONLAT, GEOTRANSFORM, SIZE, SIZE, step) for step in (1024, 10240, 20480)]
+    assert 0.01 < errors[0] < 0.05
+    assert 2.0 < errors[1] < 3.0
+    assert 3.5 < errors[2] / errors[1] < 4.5
+
+
+@pytest.mark.parametrize('tolerance', [0.01, 0.1, 1.0])
+def test_step_without_grids(tolerance):
+    step = sampling_step(GK3, LONLAT, [], GEOTRANSFORM, SIZE, SIZE, tolerance, 1.0, max_step=65536)
+    assert step < 65536
+    assert interpolated_error(GK3, LONLAT, GEOTRANSFORM, SIZE, step) <= tolerance
+    assert projection_error(GK3, LONLAT, GEOTRANSFORM, SIZE, SIZE, step * 2) > tolerance
+
+
+def test_step_with_grid(tmp_path):
+    # The grid bound and the projection error add up
+    path = str(tmp_path / 'smooth.gsb')
+    write_gsb(path, nested_subgrids((7.0, 48.0, 11.0, 51.5), 0.05, depth=1), smooth_field(wavelength=0.5))
+    source = GK3 + ' +nadgrids=' + path
+    tolerance = 0.5
+    withoutGrid = sampling_step(GK3, LONLAT, [], GEOTRANSFORM, SIZE, SIZE, tolerance, 1.0, max_step=65536)
+    step = sampling_step(source, LONLAT, [path], GEOTRANSFORM, SIZE, SIZE, tolerance, 1.0, max_step=65536)
+    assert step < withoutGrid
+    assert interpolated_error(source, LONLAT, GEOTRANSFORM, SIZE, step) <= tolerance
+
+
+def writer(data):
+    def build(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+    return build
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = DisplacementCache(str(tmp_path))
+    work = cache.workspace()
+    assert cache.get('a', work) is None
+    link = cache.put('a', writer(b'field'), work)
+    assert read(link) == b'field'
+    assert read(cache.get('a', cache.workspace())) == b'field'
+    assert (cache.hits, cache.misses) == (1, 1)
+    # The workspaces are not entries
+    assert [e[0] for e in cache.entries()] == [cache.entry('a')]
+
+
+def test_entry_in_use_survives_eviction(tmp_path):
+    cache = DisplacementCache(str(tmp_path))
+    cache.put('a', writer(b'a' * 1000), cache.workspace())
+    link = cache.get('a', cache.workspace())
+    # Another process, with no disk budget, evicts everything else
+    other = DisplacementCache(str(tmp_path), budget=0)
+    other.put('b', writer(b'b' * 1000), other.workspace())
+    assert [e[0] for e in cache.entries()] == [cache.entry('b')]
+    assert read(link) == b'a' * 1000
+    assert cache.get('a', cache.workspace()) is None
+
+
+def test_cache_counters_under_threads(tmp_path):
+    cache = DisplacementCache(str(tmp_path))
+    cache.put('a', writer(b'field'), cache.workspace())
+
+    def run():
+        for i in range(50):
+            cache.get('a' if i % 2 else 'missing', cache.workspace())
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert (cache.hits, cache.misses) == (200, 200)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_download.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ntv2_transformations.download import PART_SUFFIX, GridDownloadError, fetch, fetch_all
+
+DATA = bytes(range(256)) * 4096
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Serves DATA, honouring Range requests. The server's failures list
+    tells what to do with the next requests: 'drop' closes the connection
+    without answering, 'garbage' answers with an invalid status line and
+    'truncate' sends half of the promised body.
+    """
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get('Range'))
+        failure = server.failures.pop(0) if server.failures else None
+        if failure == 'drop':
+            self.close_connection = True
+            return
+        if failure == 'garbage':
+            self.wfile.write(b'NOT HTTP\r\n\r\n')
+            self.close_connection = True
+            return
+
+        start = 0
+        if self.headers.get('Range'):
+            start = int(self.headers['Range'].split('=')[1].rstrip('-'))
+        if start >= len(DATA):
+            self.send_response(416)
+            self.end_headers()
+            return
+        body = DATA[start:]
+        self.send_response(206 if start else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if failure == 'truncate':
+            body = body[:len(body) // 2]
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.requests = []
+    httpd.failures = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server):
+    return 'http://127.0.0.1:{}/grid.gsb'.format(server.server_address[1])
+
+
+def test_fetch(server, tmp_path):
+    path = str(tmp_path / 'grid.gsb')
+    assert fetch(url(server), path, len(DATA), SHA256, timeout=5) == path
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+    assert not os.path.exists(path + PART_SUFFIX)
+
+    # A valid file is not downloaded again
+    fetch(url(server), path, len(DATA), SHA256, timeout=5)
+    assert len(server.requests) == 1
+
+
+def test_retry_dropped_connection(server, tmp_path):
+    server.failures = ['drop', 'drop']
+    path = str(tmp_path / 'grid.gsb')
+    fetch(url(server), path, len(DATA), SHA256, timeout=5, retries=3)
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+    assert len(server.requests) == 3
+
+
+def test_retry_invalid_response(server, tmp_path):
+    server.failures = ['garbage']
+    path = str(tmp_path / 'grid.gsb')
+    fetch(url(server), path, len(DATA), SHA256, timeout=5, retries=2)
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+
+
+def test_resume_truncated_response(server, tmp_path):
+    server.failures = ['truncate']
+    path = str(tmp_path / 'grid.gsb')
+    fetch(url(server), path, len(DATA), SHA256, timeout=5, retries=2)
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+    # The second request resumes after the bytes received by the first
+    assert server.requests[0] is None
+    assert server.requests[1] == 'bytes={}-'.format(len(DATA) // 2)
+
+
+def test_resume_partial_file(server, tmp_path):
+    path = str(tmp_path / 'grid.gsb')
+    with open(path + PART_SUFFIX, 'wb') as f:
+        f.write(DATA[:1000])
+    fetch(url(server), path, len(DATA), SHA256, timeout=5)
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+    assert server.requests == ['bytes=1000-']
+
+
+def test_retries_exhausted(server, tmp_path):
+    server.failures = ['drop'] * 2
+    path = str(tmp_path / 'grid.gsb')
+    with pytest.raises(GridDownloadError):
+        fetch(url(server), path, len(DATA), SHA256, timeout=5, retries=2)
+    assert not os.path.exists(path)
+
+
+def test_fetch_all_reports_every_failure(server, tmp_path):
+    # The first download fails for good, the other one still completes
+    server.failures = ['garbage'] * 2
+    failed = str(tmp_path / 'failed.gsb')
+    path = str(tmp_path / 'grid.gsb')
+    files = [(url(server), failed, len(DATA), SHA256), (url(server), path, len(DATA), SHA256)]
+    with pytest.raises(GridDownloadError):
+        fetch_all(files, workers=1, timeout=5, retries=2)
+    assert not os.path.exists(failed)
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+
+
+def test_checksum_mismatch(server, tmp_path):
+    path = str(tmp_path / 'grid.gsb')
+    with pytest.raises(GridDownloadError):
+        fetch(url(server), path, len(DATA), '0' * 64, timeout=5)
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + PART_SUFFIX)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_gdalrunner.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import pytest
+
+from ntv2_transformations.gdalrunner import ProgressParser, split_command
+
+OUTPUT = '0...10...20...30...40...50...60...70...80...90...100 - done.\n'
+
+
+def feed(chunks):
+    parser = ProgressParser()
+    return [parser.feed(chunk) for chunk in chunks]
+
+
+def test_progress():
+    percents = feed(OUTPUT)
+    assert percents[0] is None
+    # Every dot is 2.5 % after the last tens value
+    assert percents[OUTPUT.index('0...') + 3] == 7.5
+    assert percents[OUTPUT.index('10.') + 2] == 12.5
+    assert percents[OUTPUT.index('50...') + 4] == 57.5
+    assert percents[-1] == 100.0
+    # Never going back
+    known = [p for p in percents if p is not None]
+    assert known == sorted(known)
+
+
+@pytest.mark.parametrize('size', [1, 2, 5, 7])
+def test_chunks(size):
+    # Numbers split between two reads are put back together
+    chunks = [OUTPUT[i:i + size] for i in range(0, len(OUTPUT), size)]
+    assert feed(chunks)[-1] == 100.0
+    assert feed(chunks[:OUTPUT.index('...70') // size + 1])[-1] in (60.0, 62.5, 65.0, 67.5)
+
+
+def test_noise_lines():
+    parser = ProgressParser()
+    assert parser.feed('Creating output file that is 100P x 200L.\n') is None
+    assert parser.feed('Processing input file a.tif.\n') is None
+    assert parser.feed('0...10..') == 15.0
+    assert parser.feed('Warning 1: something 99\n') == 15.0
+    assert parser.feed('.20.') == 22.5
+
+
+def test_split_command():
+    command = ['ogr2ogr', '-f', 'GeoJSON', '/vsistdout/', 'a.shp', '|', 'ogr2ogr', 'b.gpkg', '/vsistdin/',
+               '&&', 'gdal_translate', 'c.tif', 'd.tif']
+    assert split_command(command) == [[['ogr2ogr', '-f', 'GeoJSON', '/vsistdout/', 'a.shp'],
+                                       ['ogr2ogr', 'b.gpkg', '/vsistdin/']],
+                                      [['gdal_translate', 'c.tif', 'd.tif']]]
+    assert split_command(['gdalwarp', 'a', 'b']) == [[['gdalwarp', 'a', 'b']]]
+    # Empty steps and commands are dropped
+    assert split_command(['&&', 'gdalwarp', 'a', '|', '&&']) == [[['gdalwarp', 'a']]]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_gridgen.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+import pytest
+
+from ntv2_transformations.gridgen import constant_field, field_error, linear_field, nested_subgrids, smooth_field, write_gsb
+from ntv2_transformations.gsb import GsbFile, check_file
+
+EXTENT = (-9.5, 38.5, -8.5, 39.5)
+
+# Arc seconds, the shifts are stored as float32
+FLOAT32_ERROR = 1e-5
+
+
+@pytest.mark.parametrize('field', [constant_field(), linear_field(origin=(-9.0, 39.0))], ids=['constant', 'linear'])
+def test_exact_fields(tmp_path, field):
+    # Bilinear interpolation reproduces constant and linear fields
+    path = str(tmp_path / 'grid.gsb')
+    write_gsb(path, nested_subgrids(EXTENT, 0.1, depth=1), field)
+    maximum, rms = field_error(path, field, points=20000)
+    assert maximum < FLOAT32_ERROR
+
+
+def test_smooth_field_converges(tmp_path):
+    # The error of bilinear interpolation decreases with the square of
+    # the node spacing
+    field = smooth_field(wavelength=0.5)
+    errors = []
+    for resolution in (0.1, 0.05, 0.025):
+        path = str(tmp_path / 'grid_{}.gsb'.format(resolution))
+        write_gsb(path, nested_subgrids(EXTENT, resolution), field)
+        errors.append(field_error(path, field, points=20000)[0])
+    assert errors[0] > errors[1] > errors[2]
+    assert 3.0 < errors[0] / errors[1] < 5.0
+    assert 3.0 < errors[1] / errors[2] < 5.0
+
+
+@pytest.mark.parametrize('byteorder', ['<', '>'])
+def test_nodes(tmp_path, byteorder):
+    # Every node holds the field value, row 0 south and column 0 east
+    field = linear_field(origin=(-9.0, 39.0))
+    path = str(tmp_path / 'grid.gsb')
+    write_gsb(path, nested_subgrids(EXTENT, 0.1, depth=1), field, byteorder=byteorder)
+    with GsbFile(path) as grid:
+        assert grid.byteorder == byteorder
+        for g in grid.subgrids:
+            lat = g.lat_min + numpy.arange(g.rows) * g.lat_inc / 3600.0
+            lon = g.lon_max - numpy.arange(g.cols) * g.lon_inc / 3600.0
+            x, y = numpy.meshgrid(lon, lat)
+            dlon, dlat = field(x, y)
+            # NTv2 longitude shifts are positive west
+            numpy.testing.assert_allclose(g.lon_shift, -dlon, atol=FLOAT32_ERROR)
+            numpy.testing.assert_allclose(g.lat_shift, dlat, atol=FLOAT32_ERROR)
+
+
+def test_check_file(tmp_path):
+    path = str(tmp_path / 'grid.gsb')
+    write_gsb(path, nested_subgrids(EXTENT, 0.1, depth=1), constant_field())
+    check_file(path)
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) - 100])
+    with pytest.raises(ValueError):
+        check_file(path)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_gridindex.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+import pytest
+
+from ntv2_transformations.gridgen import constant_field, nested_subgrids, write_gsb
+from ntv2_transformations.gridindex import SubGridIndex, descend
+from ntv2_transformations.gsb import GsbFile
+
+EXTENT = (-9.5, 38.5, -8.5, 39.5)
+
+
+@pytest.fixture(scope='module', params=[(1, 3), (2, 2), (3, 2)], ids=lambda p: 'depth{}-branching{}'.format(*p))
+def grid(request, tmp_path_factory):
+    depth, branching = request.param
+    path = str(tmp_path_factory.mktemp('grids') / 'nested.gsb')
+    write_gsb(path, nested_subgrids(EXTENT, 0.05, depth=depth, branching=branching), constant_field())
+    g = GsbFile(path)
+    yield g
+    g.close()
+
+
+def edge_points(grid):
+    # Points on, just inside and just outside every sub-grid edge
+    lon, lat = [], []
+    for g in grid.subgrids:
+        eps = (g.lon_inc + g.lat_inc) / 3600.0 * 1e-3
+        for x in (g.lon_min, g.lon_max):
+            for d in (-eps, 0.0, eps):
+                lon.extend([x + d] * 3)
+                lat.extend([g.lat_min, (g.lat_min + g.lat_max) / 2.0, g.lat_max])
+        for y in (g.lat_min, g.lat_max):
+            for d in (-eps, 0.0, eps):
+                lat.extend([y + d] * 3)
+                lon.extend([g.lon_min, (g.lon_min + g.lon_max) / 2.0, g.lon_max])
+    return numpy.array(lon), numpy.array(lat)
+
+
+def test_random_points(grid):
+    rng = numpy.random.default_rng(2)
+    west, south, east, north = EXTENT
+    lon = rng.uniform(west - 0.1, east + 0.1, 50000)
+    lat = rng.uniform(south - 0.1, north + 0.1, 50000)
+    index = SubGridIndex(grid)
+    assert index.table is not None
+    numpy.testing.assert_array_equal(index.locate(lon, lat), descend(grid, lon, lat))
+
+
+def test_edge_points(grid):
+    lon, lat = edge_points(grid)
+    numpy.testing.assert_array_equal(SubGridIndex(grid).locate(lon, lat), descend(grid, lon, lat))
+
+
+def test_finest_subgrid(grid):
+    # The centre of every leaf is located in that leaf
+    leaves = [i for i, g in enumerate(grid.subgrids) if not g.children]
+    lon = numpy.array([(grid.subgrids[i].lon_min + grid.subgrids[i].lon_max) / 2.0 for i in leaves])
+    lat = numpy.array([(grid.subgrids[i].lat_min + grid.subgrids[i].lat_max) / 2.0 for i in leaves])
+    numpy.testing.assert_array_equal(SubGridIndex(grid).locate(lon, lat), leaves)
+
+
+def test_without_table(grid):
+    # Over the cell budget the index falls back on the tree walk
+    lon, lat = edge_points(grid)
+    index = SubGridIndex(grid, maxCells=1)
+    assert index.table is None
+    numpy.testing.assert_array_equal(index.locate(lon, lat), descend(grid, lon, lat))
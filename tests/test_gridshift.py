@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_gridshift.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+import pytest
+
+from ntv2_transformations.gridgen import nested_subgrids, smooth_field, write_gsb
+from ntv2_transformations.gridshift import shift_points
+from ntv2_transformations.gsb import GsbFile
+
+EXTENT = (-9.5, 38.5, -8.5, 39.5)
+
+# Degrees, about 0.1 mm
+TOLERANCE = 1e-9
+
+
+@pytest.fixture(scope='module', params=['<', '>'])
+def grid(request, tmp_path_factory):
+    # Nested sub-grids, so that the sub-grid selection is exercised too
+    path = str(tmp_path_factory.mktemp('grids') / 'smooth.gsb')
+    write_gsb(path, nested_subgrids(EXTENT, 0.1, depth=2), smooth_field(wavelength=0.5), byteorder=request.param)
+    return path
+
+
+def points(count=20000, seed=1):
+    rng = numpy.random.default_rng(seed)
+    west, south, east, north = EXTENT
+    return rng.uniform(west, east, count), rng.uniform(south, north, count)
+
+
+def test_outside_is_nan(grid):
+    lon, lat = shift_points([0.0, -9.0], [0.0, 39.0], grid)
+    assert numpy.isnan(lon[0]) and numpy.isnan(lat[0])
+    assert numpy.isfinite(lon[1]) and numpy.isfinite(lat[1])
+
+
+def test_proj_agreement(grid):
+    pyproj = pytest.importorskip('pyproj')
+
+    lon, lat = points()
+    expected = pyproj.Transformer.from_pipeline('+proj=hgridshift +grids={}'.format(grid)).transform(lon, lat)
+    result = shift_points(lon, lat, grid)
+    numpy.testing.assert_allclose(result[0], expected[0], rtol=0, atol=TOLERANCE)
+    numpy.testing.assert_allclose(result[1], expected[1], rtol=0, atol=TOLERANCE)
+
+
+def test_gsb_file(grid):
+    with GsbFile(grid) as g:
+        assert len(g.subgrids) == 1 + 4 + 16
+        assert len(g.roots) == 1
+        assert all(len(s.children) == 4 for s in g.subgrids[:5])
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_inverse.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+import pytest
+
+from ntv2_transformations.gridgen import linear_field, nested_subgrids, smooth_field, write_gsb
+from ntv2_transformations.gridshift import inverse_shift_points, shift_points
+
+EXTENT = (-9.5, 38.5, -8.5, 39.5)
+
+# Degrees, about 0.1 mm
+TOLERANCE = 1e-9
+
+# Near a sub-grid edge the inverse may settle in the sub-grid on the
+# other side than PROJ does, where the interpolated shifts differ by the
+# interpolation error of the coarser grid
+EDGE_TOLERANCE = 1e-8
+
+
+@pytest.fixture(scope='module', params=['<', '>'])
+def grid(request, tmp_path_factory):
+    # Nested sub-grids, so that the sub-grid selection is exercised too
+    path = str(tmp_path_factory.mktemp('grids') / 'smooth.gsb')
+    write_gsb(path, nested_subgrids(EXTENT, 0.1, depth=2), smooth_field(wavelength=0.5), byteorder=request.param)
+    return path
+
+
+@pytest.fixture(scope='module')
+def linear(tmp_path_factory):
+    # Bilinear interpolation is exact on a linear field, the shifts are
+    # then continuous across the sub-grid edges and the inverse is exact
+    path = str(tmp_path_factory.mktemp('grids') / 'linear.gsb')
+    write_gsb(path, nested_subgrids(EXTENT, 0.1, depth=2), linear_field(origin=(-9.0, 39.0)))
+    return path
+
+
+def points(count=20000, seed=1):
+    rng = numpy.random.default_rng(seed)
+    west, south, east, north = EXTENT
+    return rng.uniform(west, east, count), rng.uniform(south, north, count)
+
+
+def test_inverse_round_trip(linear):
+    lon, lat = points()
+    shiftedLon, shiftedLat = shift_points(lon, lat, linear)
+    backLon, backLat = inverse_shift_points(shiftedLon, shiftedLat, linear)
+    # Points shifted out of the grid have no inverse
+    found = numpy.isfinite(backLon)
+    assert found.mean() > 0.99
+    numpy.testing.assert_allclose(backLon[found], lon[found], rtol=0, atol=TOLERANCE)
+    numpy.testing.assert_allclose(backLat[found], lat[found], rtol=0, atol=TOLERANCE)
+
+
+def test_inverse_proj_agreement(grid):
+    pyproj = pytest.importorskip('pyproj')
+
+    lon, lat = points()
+    expected = pyproj.Transformer.from_pipeline('+proj=pipeline +step +inv +proj=hgridshift +grids={}'.format(grid)).transform(lon, lat)
+    result = inverse_shift_points(lon, lat, grid)
+    inside = numpy.isfinite(result[0]) & numpy.isfinite(expected[0])
+    assert inside.mean() > 0.99
+    expectedLon = numpy.asarray(expected[0])[inside]
+    expectedLat = numpy.asarray(expected[1])[inside]
+    numpy.testing.assert_allclose(result[0][inside], expectedLon, rtol=0, atol=EDGE_TOLERANCE)
+    numpy.testing.assert_allclose(result[1][inside], expectedLat, rtol=0, atol=EDGE_TOLERANCE)
+    assert numpy.mean(numpy.abs(result[0][inside] - expectedLon) <= TOLERANCE) > 0.99
+
+
+def test_inverse_strict(grid):
+    lon, lat = points(100)
+    shiftedLon, shiftedLat = shift_points(lon, lat, grid)
+    # One iteration cannot converge on a varying field
+    looseLon, looseLat = inverse_shift_points(shiftedLon, shiftedLat, grid, tolerance=1e-15, max_iterations=1)
+    strictLon, strictLat = inverse_shift_points(shiftedLon, shiftedLat, grid, tolerance=1e-15, max_iterations=1, strict=True)
+    assert numpy.isfinite(looseLon).all()
+    assert numpy.isnan(strictLon).all()
+    with pytest.raises(ValueError):
+        inverse_shift_points(lon, lat, grid, max_iterations=0)
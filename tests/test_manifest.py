@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_manifest.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+
+from ntv2_transformations import manifest
+from ntv2_transformations.benchmark import write_grids
+from ntv2_transformations.manifest import GRIDS_PATH_VARIABLE, check_grid, grid_rows, missing_grids
+
+
+@pytest.fixture
+def grids(tmp_path, monkeypatch):
+    path = write_grids(str(tmp_path / 'grids'))
+    monkeypatch.setenv(GRIDS_PATH_VARIABLE, path)
+    return path
+
+
+def truncate(path, size):
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:size])
+
+
+def test_present(grids):
+    assert missing_grids(['ptLX_e89.gsb', 'naptrans2008.gtx']) == []
+
+
+@pytest.mark.parametrize('name', ['ptLX_e89.gsb', 'naptrans2008.gtx'])
+def test_truncated(grids, name):
+    path = os.path.join(grids, name)
+    truncate(path, os.path.getsize(path) - 40)
+    with pytest.raises(ValueError):
+        check_grid(path)
+    assert missing_grids([name]) == [name]
+
+
+def test_not_a_grid(grids):
+    path = os.path.join(grids, 'ptLX_e89.gsb')
+    with open(path, 'wb') as f:
+        f.write(b'<html>Not found</html>')
+    assert missing_grids(['ptLX_e89.gsb', 'pt73_e89.gsb']) == ['ptLX_e89.gsb']
+
+
+def test_does_not_wait_for_preflight(grids, monkeypatch):
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait, daemon=True)
+    thread.start()
+    monkeypatch.setattr(manifest, '_preflight', thread)
+    try:
+        os.remove(os.path.join(grids, 'ptLX_e89.gsb'))
+        start = time.monotonic()
+        assert missing_grids(['ptLX_e89.gsb']) == ['ptLX_e89.gsb']
+        assert time.monotonic() - start < 1.0
+        assert manifest.preflight_running()
+    finally:
+        release.set()
+        thread.join()
+    assert not manifest.preflight_running()
+
+
+def test_grid_rows(grids):
+    rows = {row[0]: row for row in grid_rows(['pt'])}
+    assert set(rows) == set(manifest.GRID_GROUPS['pt'])
+    path = os.path.join(grids, 'ptLX_e89.gsb')
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    assert rows['ptLX_e89.gsb'][3:] == (os.path.getsize(path), digest)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_metrics.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import json
+
+import pytest
+
+from ntv2_transformations import metrics
+from ntv2_transformations.metrics import RunMetrics, stage, write_metrics
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(metrics.time, 'perf_counter', c)
+    return c
+
+
+def test_nested_stages(clock):
+    m = RunMetrics('test')
+    with m.stage('transform'):
+        clock.advance(1.0)
+        with m.stage('export'):
+            clock.advance(2.0)
+            with m.stage('grids'):
+                clock.advance(4.0)
+        with m.stage('output'):
+            clock.advance(8.0)
+        clock.advance(16.0)
+    m.finish()
+    assert m.stages == {'transform': 17.0, 'export': 2.0, 'grids': 4.0, 'output': 8.0}
+    # Inner stages are not counted in the outer ones, they add up
+    assert m.as_dict()['total'] == sum(m.stages.values())
+
+
+def test_repeated_stage(clock):
+    m = RunMetrics('test')
+    for _ in range(3):
+        with m.stage('transform'):
+            with m.stage('stats'):
+                clock.advance(1.0)
+            clock.advance(2.0)
+    assert m.stages == {'transform': 6.0, 'stats': 3.0}
+
+
+def test_stage_on_error(clock):
+    m = RunMetrics('test')
+    with pytest.raises(RuntimeError):
+        with m.stage('transform'):
+            with m.stage('grids'):
+                clock.advance(1.0)
+                raise RuntimeError('failed')
+    assert m.stages == {'transform': 0.0, 'grids': 1.0}
+    # The stack is back to empty, a new stage is a top level one
+    with m.stage('stats'):
+        clock.advance(1.0)
+    assert m.stages['transform'] == 0.0
+
+
+def test_report(clock, tmp_path):
+    m = RunMetrics('test', country='uk')
+    with stage(m, 'custom'):
+        clock.advance(1.0)
+    with stage(m, 'parameters'):
+        clock.advance(1.0)
+    with stage(None, 'transform') as nothing:
+        assert nothing is None
+    m.count('features', 10)
+    m.count('features', None)
+    m.count('features', 5)
+    m.finish('canceled')
+
+    data = m.as_dict()
+    # Known stages first, in execution order
+    assert list(data['stages']) == ['parameters', 'custom']
+    assert data['counters'] == {'features': 15}
+    assert (data['status'], data['country']) == ('canceled', 'uk')
+
+    path = str(tmp_path / 'runs' / 'metrics.jsonl')
+    write_metrics(m, path)
+    write_metrics(m, path)
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert lines == [data, data]
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_rasterwarp.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+import pytest
+
+from ntv2_transformations.rasterwarp import tile_windows
+
+
+@pytest.mark.parametrize('xsize, ysize, tiles', [(100, 100, 1), (100, 80, 3), (1001, 999, 4),
+                                                 (7, 3, 5), (1, 1, 2)])
+def test_tiles_cover_the_raster(xsize, ysize, tiles):
+    windows = tile_windows(xsize, ysize, tiles)
+    coverage = numpy.zeros((ysize, xsize), dtype=int)
+    for c0, r0, c1, r1 in windows:
+        assert 0 <= c0 < c1 <= xsize and 0 <= r0 < r1 <= ysize
+        coverage[r0:r1, c0:c1] += 1
+    # Every pixel in exactly one tile
+    assert (coverage == 1).all()
+    assert len(windows) == min(tiles, xsize) * min(tiles, ysize)
+
+
+def test_tile_sizes_and_order():
+    windows = tile_windows(10, 7, 3)
+    widths = {c1 - c0 for c0, r0, c1, r1 in windows}
+    heights = {r1 - r0 for c0, r0, c1, r1 in windows}
+    assert max(widths) - min(widths) <= 1
+    assert max(heights) - min(heights) <= 1
+    # Row by row, west to east
+    assert windows == sorted(windows, key=lambda w: (w[1], w[0]))
+    assert windows[0][:2] == (0, 0) and windows[-1][2:] == (10, 7)
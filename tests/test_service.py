@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_service.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import http.client
+import json
+import struct
+import threading
+
+import numpy
+import pytest
+
+pytest.importorskip('pyproj')
+
+from ntv2_transformations.batch import find  # noqa: E402
+from ntv2_transformations.commands import transformation_crs  # noqa: E402
+from ntv2_transformations.service import ServiceThread  # noqa: E402
+from ntv2_transformations.transformations import proj_definition  # noqa: E402
+from ntv2_transformations.transformercache import cached_transformer  # noqa: E402
+
+# OSTN02 is replaced by a synthetic grid over Great Britain (conftest.py)
+REQUEST = {'country': 'uk', 'crs': 'EPSG:27700'}
+POINTS = [[530000.0, 180000.0], [400000.0, 300000.0, 50.0], [326000.0, 674000.0]]
+
+
+@pytest.fixture(scope='module')
+def service():
+    # A long batch delay, so that concurrent requests share a batch
+    thread = ServiceThread(delay=0.05).start()
+    yield thread
+    thread.stop()
+
+
+def request(service, method, path, payload=None, connection=None):
+    own = connection is None
+    if own:
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+    body = json.dumps(payload) if payload is not None else None
+    headers = {'Content-Type': 'application/json'} if body else {}
+    connection.request(method, path, body, headers)
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    if own:
+        connection.close()
+    return result
+
+
+def expected(points):
+    t = find('uk', 'EPSG:27700')
+    sourceSrs, targetSrs, sourceProj, targetProj = transformation_crs(t, False)
+    transform = cached_transformer(proj_definition(sourceSrs, sourceProj), proj_definition(targetSrs, targetProj))
+    x = numpy.array([p[0] for p in points])
+    y = numpy.array([p[1] for p in points])
+    z = numpy.array([p[2] if len(p) == 3 else 0.0 for p in points])
+    return numpy.column_stack(transform(x, y, z))
+
+
+def test_transformations(service):
+    status, payload = request(service, 'GET', '/transformations')
+    assert status == 200
+    assert {'country': 'uk', 'crs': 'EPSG:27700', 'grid': 'OSTN02_NTv2', 'target': 'EPSG:4258'} in payload
+
+
+def test_coordinates(service):
+    status, payload = request(service, 'POST', '/transform', dict(REQUEST, coordinates=POINTS))
+    assert status == 200
+    result = payload['coordinates']
+    reference = expected(POINTS)
+    for point, transformed, ref in zip(POINTS, result, reference):
+        assert len(transformed) == len(point)
+        numpy.testing.assert_allclose(transformed, ref[:len(point)], rtol=0, atol=1e-9)
+
+
+def test_outside_is_null(service):
+    status, payload = request(service, 'POST', '/transform', dict(REQUEST, coordinates=[[-5000000.0, -5000000.0]]))
+    assert status == 200
+    assert payload['coordinates'] == [None]
+
+
+def test_wkb(service):
+    point = struct.pack('<BIdd', 1, 1, *POINTS[0])
+    line = struct.pack('<BII4d', 1, 2, 2, *(POINTS[0] + POINTS[2]))
+    status, payload = request(service, 'POST', '/transform', dict(REQUEST, wkb=[point.hex(), line.hex()]))
+    assert status == 200
+    reference = expected([POINTS[0], POINTS[2]])
+    x, y = struct.unpack_from('<dd', bytes.fromhex(payload['wkb'][0]), 5)
+    numpy.testing.assert_allclose([x, y], reference[0][:2], rtol=0, atol=1e-9)
+    coordinates = struct.unpack_from('<4d', bytes.fromhex(payload['wkb'][1]), 9)
+    numpy.testing.assert_allclose(coordinates, reference[:, :2].ravel(), rtol=0, atol=1e-9)
+
+
+def test_errors(service):
+    assert request(service, 'POST', '/transform', {'country': 'uk'})[0] == 400
+    assert request(service, 'POST', '/transform', dict(REQUEST, crs='EPSG:4326', coordinates=POINTS))[0] == 400
+    assert request(service, 'GET', '/transform')[0] == 405
+    assert request(service, 'GET', '/unknown')[0] == 404
+
+
+def test_keep_alive(service):
+    connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+    try:
+        for _ in range(3):
+            assert request(service, 'POST', '/transform', dict(REQUEST, coordinates=POINTS), connection)[0] == 200
+    finally:
+        connection.close()
+
+
+def test_concurrent_requests_are_batched(service):
+    before = request(service, 'GET', '/stats')[1]
+    results = []
+
+    def run(i):
+        results.append(request(service, 'POST', '/transform', dict(REQUEST, coordinates=[POINTS[i % len(POINTS)]])))
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    after = request(service, 'GET', '/stats')[1]
+    assert [status for status, payload in results] == [200] * 8
+    assert after['points'] - before['points'] == 8
+    assert after['batches'] - before['batches'] < 8
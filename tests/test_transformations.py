@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_transformations.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import numpy
+import pytest
+
+from ntv2_transformations.commands import transformation_crs
+from ntv2_transformations.gsb import load_grid
+from ntv2_transformations.manifest import grid_path
+from ntv2_transformations.transformations import (CRS_DEFINITIONS, NORTH_FIRST, proj_definition, proj_pipeline,
+                                                  transformations, without_grids)
+
+# Metres, and degrees for geographic targets
+TOLERANCE = 1e-6
+GEOGRAPHIC_TOLERANCE = 1e-10
+
+# Transformations shifting with a NTv2 grid, the synthetic grids of
+# conftest.py stand in for the real ones
+CASES = [(t, inverse) for t in transformations()
+         if t.gridFiles and t.gridFiles[0].lower().endswith('.gsb')
+         for inverse in (False, True)]
+
+
+def case_id(case):
+    t, inverse = case
+    return '{}-{}-{}-{}{}'.format(t.country, t.crs, t.grid, t.target, '-inverse' if inverse else '')
+
+
+def legacy(definition):
+    # PROJ only applies +nadgrids towards a CRS with a datum shift to
+    # WGS84, the targets without one coincide with it
+    if 'nadgrids' in definition or 'towgs84' in definition:
+        return definition
+    return definition + ' +towgs84=0,0,0'
+
+
+def test_proj_definition():
+    proj = '+proj=longlat +ellps=intl +nadgrids=grid.gsb'
+    assert proj_definition('EPSG:4258', proj) == proj
+    assert proj_definition('+proj=longlat +ellps=GRS80') == '+proj=longlat +ellps=GRS80'
+    assert proj_definition('EPSG:4258') == CRS_DEFINITIONS['EPSG:4258']
+    assert proj_definition('EPSG:1') is None
+
+
+def test_without_grids():
+    definition = '+proj=utm +zone=29 +ellps=intl +nadgrids=a.gsb +geoidgrids=b.gtx +towgs84=1,2,3 +units=m'
+    assert without_grids(definition) == '+proj=utm +zone=29 +ellps=intl +units=m'
+
+
+def test_axis_order():
+    pipeline = proj_pipeline('EPSG:4312', 'EPSG:3763', '+proj=longlat +ellps=bessel +nadgrids=grid.gsb')
+    steps = pipeline.split('+step ')
+    assert steps[1].strip() == '+proj=axisswap +order=2,1'
+    assert 'axisswap' not in steps[-1]
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case_id(c) for c in CASES])
+def test_pipeline_agrees_with_proj(case):
+    pyproj = pytest.importorskip('pyproj')
+
+    t, inverse = case
+    sourceSrs, targetSrs, sourceProj, targetProj = transformation_crs(t, inverse)
+    sourceDefinition = proj_definition(sourceSrs, sourceProj)
+    targetDefinition = proj_definition(targetSrs, targetProj)
+
+    # Points over the inner part of the grid, in the source CRS
+    root = load_grid(grid_path(t.gridFiles[0])).roots[0]
+    lon, lat = numpy.meshgrid(numpy.linspace(root.lon_min, root.lon_max, 7)[1:-1],
+                              numpy.linspace(root.lat_min, root.lat_max, 7)[1:-1])
+    x, y = pyproj.Transformer.from_crs(pyproj.CRS('+proj=longlat +ellps=GRS80'),
+                                       pyproj.CRS(without_grids(sourceDefinition)),
+                                       always_xy=True).transform(lon.ravel(), lat.ravel())
+
+    expected = pyproj.Transformer.from_crs(pyproj.CRS(legacy(sourceDefinition)), pyproj.CRS(legacy(targetDefinition)),
+                                           always_xy=True).transform(x, y)
+    pipeline = pyproj.Transformer.from_pipeline(proj_pipeline(sourceSrs, targetSrs, sourceProj, targetProj))
+    if sourceSrs in NORTH_FIRST:
+        result = pipeline.transform(y, x)
+    else:
+        result = pipeline.transform(x, y)
+    if targetSrs in NORTH_FIRST:
+        result = result[1], result[0]
+
+    geographic = pyproj.CRS(targetDefinition).is_geographic
+    numpy.testing.assert_allclose(result, expected, rtol=0, atol=GEOGRAPHIC_TOLERANCE if geographic else TOLERANCE)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_transformercache.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import threading
+
+import numpy
+import pytest
+
+pytest.importorskip('pyproj')
+
+from ntv2_transformations.transformercache import CacheStats, TransformerCache  # noqa: E402
+
+LONLAT = '+proj=longlat +ellps=GRS80'
+TARGETS = ['+proj=utm +zone={} +ellps=GRS80'.format(zone) for zone in (29, 30, 31)]
+
+
+def test_counters():
+    cache = TransformerCache(capacity=2)
+    first = cache.get(LONLAT, TARGETS[0])
+    assert cache.get(LONLAT, TARGETS[0]) is first
+    assert cache.stats() == CacheStats(hits=1, misses=1, evictions=0, size=1, capacity=2)
+
+    cache.get(LONLAT, TARGETS[1])
+    cache.get(LONLAT, TARGETS[2])
+    assert cache.stats() == CacheStats(hits=1, misses=3, evictions=1, size=2, capacity=2)
+
+    # The least recently used entry went first
+    cache.get(LONLAT, TARGETS[2])
+    cache.get(LONLAT, TARGETS[0])
+    assert cache.stats() == CacheStats(hits=2, misses=4, evictions=2, size=2, capacity=2)
+
+
+def test_recently_used_is_kept():
+    cache = TransformerCache(capacity=2)
+    first = cache.get(LONLAT, TARGETS[0])
+    cache.get(LONLAT, TARGETS[1])
+    cache.get(LONLAT, TARGETS[0])
+    cache.get(LONLAT, TARGETS[2])
+    assert cache.get(LONLAT, TARGETS[0]) is first
+    assert cache.stats().evictions == 1
+
+
+def test_normalized_key():
+    cache = TransformerCache()
+    first = cache.get(LONLAT, TARGETS[0])
+    assert cache.get('  ' + LONLAT.replace(' ', '   '), TARGETS[0] + ' ') is first
+    assert cache.stats().misses == 1
+
+
+def test_clear():
+    cache = TransformerCache()
+    cache.get(LONLAT, TARGETS[0])
+    cache.clear()
+    assert cache.stats().size == 0
+    cache.get(LONLAT, TARGETS[0])
+    assert cache.stats().misses == 2
+
+
+def test_threads_share_the_transformer():
+    cache = TransformerCache()
+    transform = cache.get(LONLAT, TARGETS[0])
+    lon = numpy.linspace(-9.0, -8.0, 1000)
+    lat = numpy.linspace(38.0, 39.0, 1000)
+    expected = transform(lon, lat)
+    results = []
+
+    def run():
+        f = cache.get(LONLAT, TARGETS[0])
+        results.append((f is transform, f(lon, lat)))
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cache.stats() == CacheStats(hits=8, misses=1, evictions=0, size=1, capacity=cache.capacity)
+    for same, (x, y) in results:
+        assert same
+        numpy.testing.assert_array_equal(x, expected[0])
+        numpy.testing.assert_array_equal(y, expected[1])
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    test_workerpool.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import time
+
+import numpy
+import pytest
+
+pytest.importorskip('pyproj')
+
+from ntv2_transformations.batch import find  # noqa: E402
+from ntv2_transformations.transformercache import cache_stats  # noqa: E402
+from ntv2_transformations.workerpool import WorkerPool, transformation_key, transformer  # noqa: E402
+
+# Seconds a job waits for its cancel before giving up
+TIMEOUT = 10.0
+
+
+@pytest.fixture(scope='module')
+def pool(tmp_path_factory):
+    # The spawned workers import the plugin as ntv2_transformations, whatever
+    # the name of the checkout directory
+    path = tmp_path_factory.mktemp('plugins')
+    os.symlink(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), str(path / 'ntv2_transformations'))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.syspath_prepend(str(path))
+        p = WorkerPool(2, warm=[transformation_key(find('uk', 'EPSG:27700'))])
+        yield p
+        p.terminate()
+
+
+def wait_for_cancel(canceled=None):
+    start = time.monotonic()
+    while time.monotonic() - start < TIMEOUT:
+        if canceled():
+            raise RuntimeError('Canceled.')
+        time.sleep(0.01)
+    return 'timeout'
+
+
+def sleep(seconds, canceled=None):
+    time.sleep(seconds)
+    return seconds
+
+
+def worker_stats(key, canceled=None):
+    before = cache_stats()
+    transformer(key)
+    return before, cache_stats()
+
+
+def test_transform_points(pool):
+    key = transformation_key(find('uk', 'EPSG:27700'))
+    x = numpy.array([530000.0, 400000.0])
+    y = numpy.array([180000.0, 300000.0])
+    result = pool.transform_points(key, x, y)
+    expected = transformer(key)(x, y)
+    numpy.testing.assert_allclose(result, expected, rtol=0, atol=1e-9)
+
+
+def test_warm_cache(pool):
+    # The warmed transformation is built when the worker starts, jobs find
+    # it in the worker cache
+    before, after = pool.run(worker_stats, transformation_key(find('uk', 'EPSG:27700')))
+    assert before.misses >= 1
+    assert after.hits == before.hits + 1
+    assert after.misses == before.misses
+
+
+def test_cancel_own_job(pool):
+    otherId, other = pool.submit(sleep, 0.5)
+    start = time.monotonic()
+    with pytest.raises(RuntimeError):
+        pool.run(wait_for_cancel, canceled=lambda: time.monotonic() - start > 0.2, poll=0.01)
+    assert time.monotonic() - start < TIMEOUT
+    # The other job and the pool are left running
+    assert other.get(TIMEOUT) == 0.5
+    assert not pool.closed
+    assert pool.run(sleep, 0.0) == 0.0
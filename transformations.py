@@ -25,195 +25,290 @@ __copyright__ = '(C) 2019, Alexander Bruy'
 
 __revision__ = '$Format:%H$'
 
-import os
+from collections import namedtuple
 
-pluginPath = os.path.dirname(__file__)
-NO_TRANSFORMATION = 'No transformation found for given parameters combination.'
+from ntv2_transformations.gridconvert import proj_grid
+from ntv2_transformations.manifest import grid_path
 
+NO_TRANSFORMATION = 'No transformation found for given parameters combination.'
 
-def at_transformation(epsg, grid):
-    gridFile = os.path.join(pluginPath, 'grids', '{}.gsb'.format(grid))
-    if grid == 'AT_GIS_GRID':
-        if epsg == 4312:
-            return True, '+proj=longlat +ellps=bessel +nadgrids={} +wktext +no_defs'.format(gridFile)
-        elif epsg == 31254:
-            return True, '+proj=tmerc +lat_0=0 +lon_0=10.33333333333333 +k=1 +x_0=0 +y_0=-5000000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 31255:
-            return True, '+proj=tmerc +lat_0=0 +lon_0=13.33333333333333 +k=1 +x_0=0 +y_0=-5000000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 31256:
-            return True, '+proj=tmerc +lat_0=0 +lon_0=16.33333333333333 +k=1 +x_0=0 +y_0=-5000000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 31257:
-            return True ,'+proj=tmerc +lat_0=0 +lon_0=10.33333333333333 +k=1 +x_0=150000 +y_0=-5000000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 31258:
-            return True, '+proj=tmerc +lat_0=0 +lon_0=13.33333333333333 +k=1 +x_0=450000 +y_0=-5000000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 31259:
-            return True, '+proj=tmerc +lat_0=0 +lon_0=16.33333333333333 +k=1 +x_0=750000 +y_0=-5000000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def cat_transformation(epsg, grid):
-    gridFile = os.path.join(pluginPath, 'grids', '{}.gsb'.format(grid))
-    if grid == '100800401':
-        if epsg == 23031:
-            return True, '+proj=utm +zone=31 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def de_transformation(epsg, grid):
-    gridFile = os.path.join(pluginPath, 'grids', '{}.gsb'.format(grid))
-    if grid == 'BETA2007':
-        if epsg == 31467:
-            return True, '+proj=tmerc +lat_0=0 +lon_0=9 +k=1 +x_0=3500000 +y_0=0 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def es_transformation(epsg, grid):
-    gridFile = os.path.join(pluginPath, 'grids', '{}.gsb'.format(grid))
-    if grid == 'PENR2009':
-        if epsg == 23029:
-            return True, '+proj=utm +zone=29 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 23030:
-            return True, '+proj=utm +zone=30 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 23031:
-            return True, '+proj=utm +zone=31 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def uk_transformation(epsg, grid):
-    gridFile = os.path.join(pluginPath, 'grids', '{}.gsb'.format(grid))
-    if grid == 'OSTN02_NTv2':
-        if epsg == 27700:
-            return True, '+proj=tmerc +lat_0=49 +lon_0=-2 +k=0.9996012717 +x_0=400000 +y_0=-100000 +ellps=airy +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def hr_transformation(epsg, grid):
-    gridFile = os.path.join(pluginPath, 'grids', '{}.gsb'.format(grid))
-    if grid == 'HRNTv2':
-        if epsg == 5:
-            return True, '+proj=tmerc +pm=greenwich +lat_0=0 +lon_0=15 +k=0.9999 +x_0=5500000 +y_0=0 +ellps=bessel +nadgrids={} +wktext +units=m'.format(gridFile)
-        if epsg == 6:
-            return True, '+proj=tmerc +pm=greenwich +lat_0=0 +lon_0=18 +k=0.9999 +x_0=6500000 +y_0=0 +ellps=bessel +nadgrids={} +wktext +units=m'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def it_transformation(epsg, grid):
-    if grid == 'RER_ETRS89':
-        if epsg == 3003:
-            gridFile = os.path.join(pluginPath, 'grids', 'RER_AD400_MM_ETRS89_V1A.gsb')
-            return True, '+proj=tmerc +lat_0=0 +lon_0=9 +k=0.9996 +x_0=1500000 +y_0=0 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 23032:
-            gridFile = os.path.join(pluginPath, 'grids', 'RER_ED50_ETRS89_GPS7_K2.GSB')
-            return True, '+proj=utm +zone=32 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def nl_transformation(epsg, grid):
-    if grid == 'naptrans2008':
-        if epsg == 28992:
-            gridFile = os.path.join(pluginPath, 'grids', 'rdtrans2008.gsb')
-            geoidFile = os.path.join(pluginPath, 'grids', 'naptrans2008.gtx')
-            return True, '+proj=sterea +lat_0=52.15616055555555 +lon_0=5.38763888888889 +k=0.9999079 +x_0=155000 +y_0=463000 +ellps=bessel +nadgrids={} +geoidgrids={} +wktext +units=m +no_defs'.format(gridFile, geoidFile)
-    elif grid == 'rdtrans2008':
-        gridFile = os.path.join(pluginPath, 'grids', 'rdtrans2008.gsb')
-        if epsg == 28992:
-            return True, '+proj=sterea +lat_0=52.15616055555555 +lon_0=5.38763888888889 +k=0.9999079 +x_0=155000 +y_0=463000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-
-    return False, NO_TRANSFORMATION
-
-
-def pt_transformation(epsg, grid):
-    if grid == 'pt_e89':
-        if epsg == 20791:
-            gridFile = os.path.join(pluginPath, 'grids', 'ptLX_e89.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=1 +k=1 +x_0=0 +y_0=0 +ellps=intl +nadgrids={} +wktext +pm=lisbon +units=m +no_defs'.format(gridFile)
-        elif epsg == 20790:
-            gridFile = os.path.join(pluginPath, 'grids', 'ptLX_e89.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=1 +k=1 +x_0=200000 +y_0=300000 +ellps=intl +nadgrids={} +wktext +pm=lisbon +units=m +no_defs'.format(gridFile)
-        elif epsg == 27493:
-            gridFile = os.path.join(pluginPath, 'grids', 'pt73_e89.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=-8.131906111111112 +k=1 +x_0=180.598 +y_0=-86.99 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 102160:
-            gridFile = os.path.join(pluginPath, 'grids', 'pt73_e89.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=-8.131906111111112 +k=1 +x_0=200180.598 +y_0=299913.01 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 23029:
-            gridFile = os.path.join(pluginPath, 'grids', 'ptED_e89.gsb')
-            return True, '+proj=utm +zone=29 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-    elif grid == 'PT_ETRS89_geo':
-        if epsg == 20791:
-            gridFile = os.path.join(pluginPath, 'grids', 'DLX_ETRS89_geo.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=1 +k=1 +x_0=0 +y_0=0 +ellps=intl +nadgrids={} +wktext +pm=lisbon +units=m +no_defs'.format(gridFile)
-        elif epsg == 20790:
-            gridFile = os.path.join(pluginPath, 'grids', 'DLX_ETRS89_geo.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=1 +k=1 +x_0=200000 +y_0=300000 +ellps=intl +nadgrids={} +wktext +pm=lisbon +units=m +no_defs'.format(gridFile)
-        elif epsg == 27493:
-            gridFile = os.path.join(pluginPath, 'grids', 'D73_ETRS89_geo.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=-8.131906111111112 +k=1 +x_0=180.598 +y_0=-86.99 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 102160:
-            gridFile = os.path.join(pluginPath, 'grids', 'D73_ETRS89_geo.gsb')
-            return True, '+proj=tmerc +lat_0=39.66666666666666 +lon_0=-8.131906111111112 +k=1 +x_0=200180.598 +y_0=299913.01 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'.format(gridFile)
-        elif epsg == 23029:
-            return False, 'Transformation to "ED50 UTM 29N [EPSG:23029]" only possible with grid from José Alberto Gonçalves'
-
-    return False, NO_TRANSFORMATION
-
-
-def au_transformation_agd(src, zone):
-    if src == 202:
-        gridFile = os.path.join(pluginPath, 'grids', 'A66_National_13_09_01.gsb')
-        return True, '+proj=utm +zone={} +south +ellps=aust_SA +towgs84=-117.808,-51.536,137.784,0.303,0.446,0.234,-0.29 +units=m +no_defs +nadgrids={} +wktext'.format(zone, gridFile)
-    elif src == 4202:
-        gridFile = os.path.join(pluginPath, 'grids', 'A66_National_13_09_01.gsb')
-        return True, '+proj=longlat +ellps=aust_SA +towgs84=-117.808,-51.536,137.784,0.303,0.446,0.234,-0.29 +no_defs +nadgrids={} +wktext'.format(gridFile)
-    elif src == 203:
-        gridFile = os.path.join(pluginPath, 'grids', 'National_84_02_07_01.gsb')
-        return True, '+proj=utm +zone={} +south +ellps=aust_SA +towgs84=-134,-48,149,0,0,0,0 +units=m +no_defs +nadgrids={} +wktext'.format(zone, gridFile)
-    elif src == 4203:
-        gridFile = os.path.join(pluginPath, 'grids', 'National_84_02_07_01.gsb')
-        return True, '+proj=longlat +ellps=aust_SA +towgs84=-134,-48,149,0,0,0,0 +no_defs +nadgrids={} +wktext'.format(gridFile)
-    elif src == 283:
-        return True, '+proj=utm +zone={} +south +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +units=m +no_defs +wktext'.format(zone)
-    elif src == 4283:
-        return True, '+proj=longlat +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +no_defs +wktext'
-
-    return False, NO_TRANSFORMATION
-
-
-def au_transformation_gda(src, dst, zone):
-    src_proj = ''
-    src_epsg = ''
-    dst_proj = ''
-    dst_epsg = ''
-
-    if src == '283':
-        gridFile = os.path.join(pluginPath, 'grids', 'GDA94_GDA2020_conformal.gsb')
-        src_proj = '+proj=utm +zone={} +south +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +units=m +no_defs +nadgrids={} +wktext'.format(zone, gridFile)
-        src_epsg = 'EPSG:283{}'.format(zone)
-    elif src == '4283':
-        gridFile = os.path.join(pluginPath, 'grids', 'GDA94_GDA2020_conformal.gsb')
-        src_proj = '+proj=longlat +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +no_defs +nadgrids={} +wktext'.format(gridFile)
-        src_epsg = 'EPSG:4283'
-    elif src == '283cd':
-        gridFile = os.path.join(pluginPath, 'grids', 'GDA94_GDA2020_conformal_and_distortion.gsb')
-        src_proj = '+proj=utm +zone={} +south +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +units=m +no_defs +nadgrids={} +wktext'.format(zone, gridFile)
-        src_epsg = 'EPSG:283{}'.format(zone)
-    elif src == '4283cd':
-        gridFile = os.path.join(pluginPath, 'grids', 'GDA94_GDA2020_conformal_and_distortion.gsb')
-        src_proj = '+proj=longlat +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +no_defs +nadgrids={} +wktext'.format(gridFile)
-        src_epsg = 'EPSG:4283'
-
-    if dst == 78:
-        dst_proj = '+proj=utm +zone={} +south +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +units=m +no_defs +wktext'.format(zone)
-        dst_epsg = 'EPSG:78{}'.format(zone)
-    elif dst == 7844:
-        dst_proj = '+proj=longlat +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +no_defs +wktext'
-        dst_epsg = 'EPSG:7844'
-
-    return (src_proj, src_epsg), (dst_proj, dst_epsg)
+# Authority CRSs whose axis order is latitude/northing first
+NORTH_FIRST = {'EPSG:4258', 'EPSG:4312', 'EPSG:4202', 'EPSG:4203',
+               'EPSG:4283', 'EPSG:7844', 'EPSG:31467', 'EPSG:31254',
+               'EPSG:31255', 'EPSG:31256', 'EPSG:31257', 'EPSG:31258',
+               'EPSG:31259'}
+
+# Parameters which are replaced by explicit steps or meaningless in a
+# pipeline
+PIPELINE_SKIP = ('nadgrids', 'geoidgrids', 'towgs84', 'wktext', 'no_defs', 'type')
+
+
+def _to_geodetic(definition):
+    """
+    Steps going from coordinates in the given CRS to geodetic coordinates
+    (radians) in the datum targeted by its grids.
+    """
+    params = []
+    hgrids = []
+    vgrids = []
+    for token in definition.split():
+        key, _, value = token.lstrip('+').partition('=')
+        if key == 'nadgrids' and value != '@null':
+            hgrids.append(value)
+        elif key == 'geoidgrids':
+            vgrids.append(value)
+        elif key not in PIPELINE_SKIP:
+            params.append(token)
+
+    if params[0] in ('+proj=longlat', '+proj=latlong', '+proj=lonlat', '+proj=latlon'):
+        steps = ['+proj=unitconvert +xy_in=deg +xy_out=rad']
+    else:
+        steps = ['+inv {}'.format(' '.join(params))]
+
+    steps.extend('+proj=vgridshift +grids={} +multiplier=1'.format(g) for g in vgrids)
+    steps.extend('+proj=hgridshift +grids={}'.format(g) for g in hgrids)
+    return steps
+
+
+def without_grids(definition):
+    """
+    Returns the PROJ definition without its grid and datum shift
+    parameters, i.e. the CRS the shifted coordinates are expressed in.
+    """
+    return ' '.join(t for t in definition.split() if t.lstrip('+').partition('=')[0] not in ('nadgrids', 'geoidgrids', 'towgs84'))
+
+
+def proj_definition(srs, proj=None):
+    """
+    Returns the PROJ definition of a CRS given as passed to GDAL and,
+    optionally, with the definition carrying its grids. None if unknown.
+    """
+    if proj:
+        return proj
+    if srs.startswith('+'):
+        return srs
+    return CRS_DEFINITIONS.get(srs)
+
+
+def _invert(step):
+    if step.startswith('+inv '):
+        return step[5:]
+    return '+inv {}'.format(step)
+
+
+def proj_pipeline(source, target, sourceProj=None, targetProj=None):
+    """
+    Returns a PROJ pipeline going from source to target, the CRSs passed
+    to GDAL with -s_srs and -t_srs, to be used with -ct. This allows to
+    apply a grid based transformation while writing the output directly
+    with an authority CRS.
+
+    CRSs defined with a PROJ string are used as they are, authority codes
+    are looked up in CRS_DEFINITIONS unless sourceProj/targetProj are
+    given, e.g. to attach the grid to an authority CRS.
+    """
+    sourceProj = sourceProj or (source if source.startswith('+') else CRS_DEFINITIONS[source])
+    targetProj = targetProj or (target if target.startswith('+') else CRS_DEFINITIONS[target])
+
+    steps = []
+    if source in NORTH_FIRST:
+        steps.append('+proj=axisswap +order=2,1')
+    steps.extend(_to_geodetic(sourceProj))
+    steps.extend(_invert(s) for s in reversed(_to_geodetic(targetProj)))
+    if target in NORTH_FIRST:
+        steps.append('+proj=axisswap +order=2,1')
+
+    return '+proj=pipeline {}'.format(' '.join('+step {}'.format(s) for s in steps))
+
+
+# Definitions shared by several entries, {} are replaced by the grid files
+AT_GK = '+proj=tmerc +lat_0=0 +lon_0={} +k=1 +x_0={} +y_0=-5000000 +ellps=bessel +nadgrids={{}} +wktext +units=m +no_defs'
+ES_UTM = '+proj=utm +zone={} +ellps=intl +nadgrids={{}} +wktext +units=m +no_defs'
+HR_TM = '+proj=tmerc +pm=greenwich +lat_0=0 +lon_0={} +k=0.9999 +x_0={} +y_0=0 +ellps=bessel +nadgrids={{}} +wktext +units=m'
+PT_LISBOA = '+proj=tmerc +lat_0=39.66666666666666 +lon_0=1 +k=1 +x_0={} +y_0={} +ellps=intl +nadgrids={{}} +wktext +pm=lisbon +units=m +no_defs'
+PT_DATUM73 = '+proj=tmerc +lat_0=39.66666666666666 +lon_0=-8.131906111111112 +k=1 +x_0={} +y_0={} +ellps=intl +nadgrids={{}} +wktext +units=m +no_defs'
+PT_ED50 = '+proj=utm +zone=29 +ellps=intl +nadgrids={} +wktext +units=m +no_defs'
+NL_RD = '+proj=sterea +lat_0=52.15616055555555 +lon_0=5.38763888888889 +k=0.9999079 +x_0=155000 +y_0=463000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'
+NL_RDNAP = '+proj=sterea +lat_0=52.15616055555555 +lon_0=5.38763888888889 +k=0.9999079 +x_0=155000 +y_0=463000 +ellps=bessel +nadgrids={} +geoidgrids={} +wktext +units=m +no_defs'
+CH_LV03 = '+proj=somerc +lat_0=46.95240555555556 +lon_0=7.439583333333333 +k_0=1 +x_0=600000 +y_0=200000 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs'
+CH_LV95 = '+proj=somerc +lat_0=46.95240555555556 +lon_0=7.439583333333333 +k_0=1 +x_0=2600000 +y_0=1200000 +ellps=bessel +nadgrids=@null +wktext +units=m'
+
+AU_ZONES = ('49', '50', '51', '52', '53', '54', '55', '56')
+AU_AGD66 = '+ellps=aust_SA +towgs84=-117.808,-51.536,137.784,0.303,0.446,0.234,-0.29'
+AU_AGD84 = '+ellps=aust_SA +towgs84=-134,-48,149,0,0,0,0'
+AU_GRS80 = '+ellps=GRS80 +towgs84=0,0,0,0,0,0,0'
+AU_UTM = '+proj=utm +zone={} +south {} +units=m +no_defs'
+AU_LONGLAT = '+proj=longlat {} +no_defs'
+
+# Supported transformations as (country, old CRS, grid, new CRS, PROJ
+# definition of the old CRS, grid files). The old CRS is an authority code
+# or, for custom CRSs, a name. {} in the definitions are replaced by the
+# full path of the grid files, in order, or of their GeoTIFF conversion.
+TRANSFORMATIONS = [
+    ('at', 'EPSG:4312', 'AT_GIS_GRID', 'EPSG:4258', '+proj=longlat +ellps=bessel +nadgrids={} +wktext +no_defs', ('AT_GIS_GRID.gsb',)),
+    ('at', 'EPSG:31254', 'AT_GIS_GRID', 'EPSG:4258', AT_GK.format('10.33333333333333', '0'), ('AT_GIS_GRID.gsb',)),
+    ('at', 'EPSG:31255', 'AT_GIS_GRID', 'EPSG:4258', AT_GK.format('13.33333333333333', '0'), ('AT_GIS_GRID.gsb',)),
+    ('at', 'EPSG:31256', 'AT_GIS_GRID', 'EPSG:4258', AT_GK.format('16.33333333333333', '0'), ('AT_GIS_GRID.gsb',)),
+    ('at', 'EPSG:31257', 'AT_GIS_GRID', 'EPSG:4258', AT_GK.format('10.33333333333333', '150000'), ('AT_GIS_GRID.gsb',)),
+    ('at', 'EPSG:31258', 'AT_GIS_GRID', 'EPSG:4258', AT_GK.format('13.33333333333333', '450000'), ('AT_GIS_GRID.gsb',)),
+    ('at', 'EPSG:31259', 'AT_GIS_GRID', 'EPSG:4258', AT_GK.format('16.33333333333333', '750000'), ('AT_GIS_GRID.gsb',)),
+
+    ('cat', 'EPSG:23031', '100800401', 'EPSG:25831', '+proj=utm +zone=31 +ellps=intl +nadgrids={} +wktext +units=m +no_defs', ('100800401.gsb',)),
+
+    ('ch', 'EPSG:21781', 'CHENyx06', 'EPSG:4258', CH_LV03, ('chenyx06etrs.gsb',)),
+    ('ch', 'EPSG:21781', 'CHENyx06', 'EPSG:2056', CH_LV03, ('CHENYX06a.gsb',)),
+
+    ('de', 'EPSG:31467', 'BETA2007', 'EPSG:4258', '+proj=tmerc +lat_0=0 +lon_0=9 +k=1 +x_0=3500000 +y_0=0 +ellps=bessel +nadgrids={} +wktext +units=m +no_defs', ('BETA2007.gsb',)),
+
+    ('es', 'EPSG:23029', 'PENR2009', 'EPSG:4258', ES_UTM.format(29), ('PENR2009.gsb',)),
+    ('es', 'EPSG:23030', 'PENR2009', 'EPSG:4258', ES_UTM.format(30), ('PENR2009.gsb',)),
+    ('es', 'EPSG:23031', 'PENR2009', 'EPSG:4258', ES_UTM.format(31), ('PENR2009.gsb',)),
+
+    ('hr', 'HDKS5', 'HRNTv2', 'EPSG:3765', HR_TM.format(15, 5500000), ('HRNTv2.gsb',)),
+    ('hr', 'HDKS6', 'HRNTv2', 'EPSG:3765', HR_TM.format(18, 6500000), ('HRNTv2.gsb',)),
+
+    ('it', 'EPSG:3003', 'RER_ETRS89', 'EPSG:4258', '+proj=tmerc +lat_0=0 +lon_0=9 +k=0.9996 +x_0=1500000 +y_0=0 +ellps=intl +nadgrids={} +wktext +units=m +no_defs', ('RER_AD400_MM_ETRS89_V1A.gsb',)),
+    ('it', 'EPSG:23032', 'RER_ETRS89', 'EPSG:4258', '+proj=utm +zone=32 +ellps=intl +nadgrids={} +wktext +units=m +no_defs', ('RER_ED50_ETRS89_GPS7_K2.GSB',)),
+
+    ('nl', 'EPSG:28992', 'naptrans2008', 'EPSG:4258', NL_RDNAP, ('rdtrans2008.gsb', 'naptrans2008.gtx')),
+    ('nl', 'EPSG:28992', 'rdtrans2008', 'EPSG:4258', NL_RD, ('rdtrans2008.gsb',)),
+
+    ('pt', 'EPSG:20791', 'pt_e89', 'EPSG:3763', PT_LISBOA.format(0, 0), ('ptLX_e89.gsb',)),
+    ('pt', 'EPSG:20790', 'pt_e89', 'EPSG:3763', PT_LISBOA.format(200000, 300000), ('ptLX_e89.gsb',)),
+    ('pt', 'EPSG:27493', 'pt_e89', 'EPSG:3763', PT_DATUM73.format(180.598, -86.99), ('pt73_e89.gsb',)),
+    ('pt', 'ESRI:102160', 'pt_e89', 'EPSG:3763', PT_DATUM73.format(200180.598, 299913.01), ('pt73_e89.gsb',)),
+    ('pt', 'EPSG:23029', 'pt_e89', 'EPSG:3763', PT_ED50, ('ptED_e89.gsb',)),
+    ('pt', 'EPSG:20791', 'PT_ETRS89_geo', 'EPSG:3763', PT_LISBOA.format(0, 0), ('DLX_ETRS89_geo.gsb',)),
+    ('pt', 'EPSG:20790', 'PT_ETRS89_geo', 'EPSG:3763', PT_LISBOA.format(200000, 300000), ('DLX_ETRS89_geo.gsb',)),
+    ('pt', 'EPSG:27493', 'PT_ETRS89_geo', 'EPSG:3763', PT_DATUM73.format(180.598, -86.99), ('D73_ETRS89_geo.gsb',)),
+    ('pt', 'ESRI:102160', 'PT_ETRS89_geo', 'EPSG:3763', PT_DATUM73.format(200180.598, 299913.01), ('D73_ETRS89_geo.gsb',)),
+
+    ('uk', 'EPSG:27700', 'OSTN02_NTv2', 'EPSG:4258', '+proj=tmerc +lat_0=49 +lon_0=-2 +k=0.9996012717 +x_0=400000 +y_0=-100000 +ellps=airy +nadgrids={} +wktext +units=m +no_defs', ('OSTN02_NTv2.gsb',)),
+]
+
+# Combinations which are known but not possible, with the reason
+UNSUPPORTED = {
+    ('pt', 'EPSG:23029', 'PT_ETRS89_geo', 'EPSG:3763'): 'Transformation to "ED50 UTM 29N [EPSG:23029]" only possible with grid from José Alberto Gonçalves',
+}
+
+# PROJ definitions of the CRSs referenced by authority code which are
+# used as the shift-free side of a transformation
+CRS_DEFINITIONS = {
+    'EPSG:4258': '+proj=longlat +ellps=GRS80 +no_defs',
+    'EPSG:3763': '+proj=tmerc +lat_0=39.66825833333333 +lon_0=-8.133108333333334 +k=1 +x_0=0 +y_0=0 +ellps=GRS80 +units=m +no_defs',
+    'EPSG:3765': '+proj=tmerc +lat_0=0 +lon_0=16.5 +k=0.9999 +x_0=500000 +y_0=0 +ellps=GRS80 +units=m +no_defs',
+    'EPSG:25831': '+proj=utm +zone=31 +ellps=GRS80 +units=m +no_defs',
+    'EPSG:2056': CH_LV95,
+    'EPSG:4283': AU_LONGLAT.format(AU_GRS80) + ' +wktext',
+    'EPSG:7844': AU_LONGLAT.format(AU_GRS80) + ' +wktext',
+}
+CRS_DEFINITIONS.update({'EPSG:283{}'.format(z): AU_UTM.format(z, AU_GRS80) + ' +wktext' for z in AU_ZONES})
+CRS_DEFINITIONS.update({'EPSG:78{}'.format(z): AU_UTM.format(z, AU_GRS80) + ' +wktext' for z in AU_ZONES})
+
+
+def _au_transformations():
+    """
+    Australian transformations, one for each UTM zone.
+    """
+    agd = [('EPSG:4202', AU_LONGLAT.format(AU_AGD66) + ' +nadgrids={} +wktext', ('A66_National_13_09_01.gsb',)),
+           ('EPSG:4203', AU_LONGLAT.format(AU_AGD84) + ' +nadgrids={} +wktext', ('National_84_02_07_01.gsb',)),
+           ('EPSG:4283', AU_LONGLAT.format(AU_GRS80) + ' +wktext', ()),
+          ]
+    gda = [('EPSG:4283', 'GDA94_GDA2020_conformal'),
+           ('EPSG:4283', 'GDA94_GDA2020_conformal_and_distortion'),
+          ]
+    gdaTargets = ['EPSG:7844']
+    agdTargets = ['EPSG:4283']
+
+    for zone in AU_ZONES:
+        agd.append(('EPSG:202{}'.format(zone), AU_UTM.format(zone, AU_AGD66) + ' +nadgrids={} +wktext', ('A66_National_13_09_01.gsb',)))
+        agd.append(('EPSG:203{}'.format(zone), AU_UTM.format(zone, AU_AGD84) + ' +nadgrids={} +wktext', ('National_84_02_07_01.gsb',)))
+        agd.append(('EPSG:283{}'.format(zone), AU_UTM.format(zone, AU_GRS80) + ' +wktext', ()))
+        gda.append(('EPSG:283{}'.format(zone), 'GDA94_GDA2020_conformal'))
+        gda.append(('EPSG:283{}'.format(zone), 'GDA94_GDA2020_conformal_and_distortion'))
+        agdTargets.append('EPSG:283{}'.format(zone))
+        gdaTargets.append('EPSG:78{}'.format(zone))
+
+    def sameZone(crs, target):
+        # Projected CRSs can be combined only within the same zone
+        return crs[-2:] == target[-2:] or crs in ('EPSG:4202', 'EPSG:4203', 'EPSG:4283') or target in ('EPSG:4283', 'EPSG:7844')
+
+    for crs, proj, files in agd:
+        for target in agdTargets:
+            if sameZone(crs, target):
+                yield ('au', crs, 'AGD', target, proj, files)
+
+    for crs, grid in gda:
+        proj = CRS_DEFINITIONS[crs].replace(' +wktext', ' +nadgrids={} +wktext')
+        for target in gdaTargets:
+            if sameZone(crs, target):
+                yield ('au', crs, grid, target, proj, ('{}.gsb'.format(grid),))
+
+
+TRANSFORMATIONS.extend(_au_transformations())
+
+
+Transformation = namedtuple('Transformation', ['country', 'crs', 'grid', 'target',
+                                               'srs', 'proj', 'targetProj', 'gridFiles',
+                                               'forward', 'inverse'])
+
+
+def _build(entries):
+    """
+    Validates the table and builds the lookup index, with PROJ definitions
+    and pipelines ready to use.
+    """
+    index = {}
+    for country, crs, grid, target, template, gridFiles in entries:
+        key = (country, crs, grid, target)
+        if key in index:
+            raise ValueError('Duplicated transformation {}.'.format(key))
+        if template.count('{}') != len(gridFiles):
+            raise ValueError('Transformation {} references {} grids, {} given.'.format(key, template.count('{}'), len(gridFiles)))
+
+        targetProj = CRS_DEFINITIONS.get(target)
+        if targetProj is None:
+            raise ValueError('No definition for "{}" used by transformation {}.'.format(target, key))
+
+        proj = template.format(*[grid_path(f) for f in gridFiles])
+        # Custom CRSs are written with their own definition
+        srs = crs if ':' in crs else without_grids(proj)
+
+        index[key] = Transformation(country, crs, grid, target, srs, proj, targetProj, tuple(gridFiles),
+                                    proj_pipeline(srs, target, proj, targetProj),
+                                    proj_pipeline(target, srs, targetProj, proj))
+    return index
+
+
+_index = _build(TRANSFORMATIONS)
+
+
+def _resolve(t):
+    """
+    t using the up to date GeoTIFF conversions of its .gsb grids. Checked
+    at every lookup, as grids are converted in background once the index
+    is built.
+    """
+    for f in t.gridFiles:
+        path = grid_path(f)
+        converted = proj_grid(path)
+        if converted != path:
+            t = t._replace(**{field: getattr(t, field).replace(path, converted)
+                              for field in ('proj', 'forward', 'inverse')})
+    return t
+
+
+def find_transformation(country, crs, grid, target):
+    """
+    Returns the Transformation for the given combination, or None.
+    """
+    t = _index.get((country, crs, grid, target))
+    return _resolve(t) if t is not None else None
+
+
+def transformations(country=None):
+    """
+    Returns all the supported transformations, optionally for one country
+    only.
+    """
+    return [_resolve(t) for t in _index.values() if country is None or t.country == country]
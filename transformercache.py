@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    transformercache.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from ntv2_transformations.transformations import proj_pipeline
+
+# Building a transformation parses the PROJ strings, queries the PROJ
+# database and opens the grids, so the in-process paths keep the last
+# ones built, by source and target PROJ definition.
+
+CACHE_SIZE = 32
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'size', 'capacity'])
+
+
+def normalize_definition(definition):
+    """
+    PROJ definition with its whitespace collapsed, so that strings only
+    differing by spacing share a cache entry.
+    """
+    return ' '.join(definition.split())
+
+
+def point_transformer(pipeline):
+    """
+    Returns a function transforming numpy coordinate arrays with the given
+    PROJ pipeline, with pyproj when installed, otherwise with OSR. It can
+    be called from several threads.
+    """
+    import numpy
+
+    try:
+        from pyproj import Transformer
+    except ImportError:
+        Transformer = None
+
+    if Transformer is not None:
+        # pyproj >= 3.1 Transformers are thread safe, one is built and
+        # shared by all the threads
+        transformer = Transformer.from_pipeline(pipeline)
+
+        def transform(x, y, z=None):
+            if z is None:
+                return transformer.transform(x, y)
+            return transformer.transform(x, y, z)
+        return transform
+
+    from osgeo import osr
+
+    options = osr.CoordinateTransformationOptions()
+    options.SetOperation(pipeline)
+    ct = osr.CreateCoordinateTransformation(None, None, options)
+    lock = threading.Lock()
+
+    def transform(x, y, z=None):
+        heights = numpy.zeros(len(x)) if z is None else z
+        with lock:
+            points = numpy.array(ct.TransformPoints(numpy.column_stack((x, y, heights)).tolist())).reshape(-1, 3)
+        if z is None:
+            return points[:, 0], points[:, 1]
+        return points[:, 0], points[:, 1], points[:, 2]
+    return transform
+
+
+class TransformerCache:
+    """
+    Bounded LRU cache of point transformation functions, keyed by the
+    normalized source and target PROJ definitions. Thread safe.
+    """
+
+    def __init__(self, capacity=CACHE_SIZE):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sourceDefinition, targetDefinition):
+        key = (normalize_definition(sourceDefinition), normalize_definition(targetDefinition))
+        with self._lock:
+            transform = self._entries.get(key)
+            if transform is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return transform
+            self.misses += 1
+
+        # Built without the lock, not to hold up the other threads
+        transform = point_transformer(proj_pipeline(*key))
+        with self._lock:
+            # Another thread may have built it meanwhile
+            transform = self._entries.setdefault(key, transform)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return transform
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = TransformerCache()
+
+
+def cached_transformer(sourceDefinition, targetDefinition):
+    """
+    Point transformation function from sourceDefinition to
+    targetDefinition, PROJ definitions, built once and shared.
+    """
+    return _cache.get(sourceDefinition, targetDefinition)
+
+
+def cache_stats():
+    return _cache.stats()
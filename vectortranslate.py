@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    vectortranslate.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.sax.saxutils import escape, quoteattr
+
+from ntv2_transformations.commands import gdal_version, ogr2ogr_options
+from ntv2_transformations.gdalrunner import run_command
+from ntv2_transformations.metrics import stage
+
+# Features written per transaction (ogr2ogr -gt)
+BATCH_SIZE = 20000
+
+# Chunks are written as FlatGeobuf when available (GDAL >= 3.1), as they
+# are faster to write than GeoPackage and never locked
+FLATGEOBUF_GDAL_VERSION = 3010000
+
+
+def translate(source, layerName, output, sourceSrs, targetSrs, outputFormat, sourceProj=None,
+              targetProj=None, batchSize=BATCH_SIZE, progress=None, canceled=None):
+    """
+    Transforms a layer in process with gdal.VectorTranslate(), the same
+    way the single pass ogr2ogr command does, committing batchSize
+    features at a time. progress gets the percentage done, canceled is
+    polled between batches. Requires GDAL >= 3.0.
+    """
+    from osgeo import gdal
+
+    options = ogr2ogr_options(sourceSrs, targetSrs, outputFormat, sourceProj, targetProj)
+    options.extend(['-gt', str(batchSize)])
+    if layerName:
+        options.append(layerName)
+
+    stopped = []
+
+    def callback(complete, message, data):
+        if progress is not None:
+            progress(100.0 * complete)
+        if canceled is not None and canceled():
+            stopped.append(True)
+            return 0
+        return 1
+
+    gdal.ErrorReset()
+    ds = gdal.VectorTranslate(output, source, options=options, callback=callback)
+    if stopped:
+        ds = None
+        raise RuntimeError('Canceled.')
+    if ds is None:
+        raise RuntimeError(gdal.GetLastErrorMsg() or 'Unable to transform {}.'.format(source))
+    # Closing the dataset flushes the last batch
+    ds = None
+    return output
+
+
+def fid_ranges(source, layerName, chunks):
+    """
+    Splits the features of a layer in chunks FID ranges. Returns the FID
+    field to filter on and a list of [low, high) ranges.
+    """
+    from osgeo import ogr
+
+    ds = ogr.Open(source)
+    if ds is None:
+        raise RuntimeError('Unable to open {}.'.format(source))
+    layer = ds.GetLayerByName(layerName) if layerName else ds.GetLayer(0)
+    column = layer.GetFIDColumn()
+    if column:
+        result = ds.ExecuteSQL('SELECT MIN("{0}"), MAX("{0}") FROM "{1}"'.format(column, layer.GetName()))
+        feature = result.GetNextFeature()
+        low, high = feature.GetField(0), feature.GetField(1)
+        ds.ReleaseResultSet(result)
+        field = column
+    else:
+        # Drivers without a FID column number the features from 0
+        low, high = 0, layer.GetFeatureCount() - 1
+        field = 'FID'
+    ds = None
+
+    if low is None or high is None or high < low:
+        return field, []
+    size = high - low + 1
+    bounds = [low + size * i // chunks for i in range(chunks + 1)]
+    return field, [(bounds[i], bounds[i + 1]) for i in range(chunks) if bounds[i + 1] > bounds[i]]
+
+
+def union_vrt(paths, layerName):
+    """
+    OGR VRT reading the layers of paths as a single layer.
+    """
+    sources = ''.join('<OGRVRTLayer name={}><SrcDataSource>{}</SrcDataSource></OGRVRTLayer>'.format(
+                      quoteattr(os.path.splitext(os.path.basename(p))[0]), escape(p)) for p in paths)
+    return '<OGRVRTDataSource><OGRVRTUnionLayer name={}>{}</OGRVRTUnionLayer></OGRVRTDataSource>'.format(
+        quoteattr(layerName), sources)
+
+
+def translate_chunked(source, layerName, output, sourceSrs, targetSrs, outputFormat, chunks,
+                      sourceProj=None, targetProj=None, batchSize=BATCH_SIZE, workers=None,
+                      progress=None, canceled=None, metrics=None):
+    """
+    Transforms a layer split in chunks FID ranges, each one by its own
+    ogr2ogr process, in parallel, then merges the chunks into output.
+
+    Only the merge writes output, in a single pass from a VRT union of the
+    chunks, so SQLite based formats are never written concurrently. It is
+    timed as the output stage of metrics, when given.
+    """
+    from osgeo import gdal, ogr
+
+    field, ranges = fid_ranges(source, layerName, chunks)
+    if not ranges:
+        return translate(source, layerName, output, sourceSrs, targetSrs, outputFormat,
+                         sourceProj, targetProj, batchSize, progress, canceled)
+
+    if not layerName:
+        ds = ogr.Open(source)
+        layerName = ds.GetLayer(0).GetName()
+        ds = None
+
+    chunkFormat = 'FlatGeobuf' if gdal_version() >= FLATGEOBUF_GDAL_VERSION else 'GPKG'
+    chunkExtension = '.fgb' if chunkFormat == 'FlatGeobuf' else '.gpkg'
+    workPath = tempfile.mkdtemp(prefix='ntv2_', dir=os.path.dirname(os.path.abspath(output)))
+
+    commands = []
+    for low, high in ranges:
+        path = os.path.join(workPath, 'chunk_{}{}'.format(low, chunkExtension))
+        command = ['ogr2ogr'] + ogr2ogr_options(sourceSrs, targetSrs, chunkFormat, sourceProj, targetProj)
+        command.extend(['-gt', str(batchSize),
+                        '-where', '"{0}" >= {1} AND "{0}" < {2}'.format(field, low, high),
+                        path, source, layerName])
+        if chunkFormat == 'FlatGeobuf':
+            command[-3:-3] = ['-lco', 'SPATIAL_INDEX=NO']
+        commands.append((path, command))
+
+    # Set on cancel or on the first failure: the running commands are then
+    # terminated and the queued ones stop at once
+    stop = threading.Event()
+
+    def stopped():
+        return stop.is_set() or (canceled is not None and canceled())
+
+    def run(command):
+        return run_command(command, stopped)
+
+    try:
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers or min(len(commands), os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(run, command) for path, command in commands]
+            for future in as_completed(futures):
+                try:
+                    if canceled is not None and canceled():
+                        raise RuntimeError('Canceled.')
+                    code, errors = future.result()
+                    if code != 0:
+                        raise RuntimeError(errors or 'ogr2ogr failed.')
+                except RuntimeError:
+                    stop.set()
+                    for f in futures:
+                        f.cancel()
+                    raise
+                done += 1
+                if progress is not None:
+                    progress(90.0 * done / len(commands))
+
+        vrtPath = os.path.join(workPath, 'chunks.vrt')
+        with open(vrtPath, 'w') as f:
+            f.write(union_vrt([path for path, command in commands], layerName))
+
+        def callback(complete, message, data):
+            if progress is not None:
+                progress(90.0 + 10.0 * complete)
+            return 0 if canceled is not None and canceled() else 1
+
+        with stage(metrics, 'output'):
+            gdal.ErrorReset()
+            ds = gdal.VectorTranslate(output, vrtPath,
+                                      options=['-f', outputFormat, '-lco', 'ENCODING=UTF-8', '-gt', str(batchSize)],
+                                      callback=callback)
+            if ds is None:
+                raise RuntimeError(gdal.GetLastErrorMsg() or 'Unable to merge the chunks of {}.'.format(source))
+            ds = None
+    finally:
+        shutil.rmtree(workPath, ignore_errors=True)
+
+    return output
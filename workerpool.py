@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+***************************************************************************
+    workerpool.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 by Giovanni Manghi
+    Email                : giovanni dot manghi at naturalgis dot pt
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+__author__ = 'Giovanni Manghi'
+__date__ = 'October 2026'
+__copyright__ = '(C) 2026, Giovanni Manghi'
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = '$Format:%H$'
+
+import itertools
+import os
+import threading
+
+# Long-lived worker processes owned by the provider. GDAL, PROJ and the
+# grids are loaded once per worker and stay loaded between jobs, so small
+# jobs do not pay the start of a new ogr2ogr/gdalwarp process every time.
+
+WORKER_POOL_SETTING = 'NTV2_WORKER_POOL'
+
+# Jobs run by a worker before it is replaced, bounding leaks in GDAL
+MAX_JOBS_PER_WORKER = 1000
+
+# Cancel flags shared with the workers, a job uses the slot of its id
+CANCEL_SLOTS = 4096
+
+_pool = None
+_poolLock = threading.Lock()
+
+# Set in every worker by _initialize()
+_cancels = None
+
+
+def transformation_key(t, inverse=False):
+    """
+    Key of a Transformation and direction, as accepted by the workers.
+    """
+    return (t.country, t.crs, t.grid, t.target, bool(inverse))
+
+
+def transformer(key):
+    """
+    Point transformation function (see point_transformer()) of a
+    transformation key, taken from the transformer cache of the worker.
+    Jobs calling cached_transformer() with the same PROJ definitions get
+    the same cached transformation.
+    """
+    from ntv2_transformations.commands import transformation_crs
+    from ntv2_transformations.transformations import find_transformation, proj_definition
+    from ntv2_transformations.transformercache import cached_transformer
+
+    country, crs, grid, target, inverse = key
+    t = find_transformation(country, crs, grid, target)
+    if t is None:
+        raise RuntimeError('Unknown transformation {}.'.format(key[:4]))
+    sourceSrs, targetSrs, sourceProj, targetProj = transformation_crs(t, inverse)
+    return cached_transformer(proj_definition(sourceSrs, sourceProj), proj_definition(targetSrs, targetProj))
+
+
+def _initialize(cancels, warm):
+    # Runs once in every new worker
+    global _cancels
+    _cancels = cancels
+    try:
+        from osgeo import gdal
+    except ImportError:
+        # Point jobs only need pyproj
+        pass
+    else:
+        gdal.UseExceptions()
+    for key in warm:
+        transformer(key)
+
+
+def _run_job(jobId, function, args, kwargs):
+    # Runs in a worker, function polls the cancel flag of its job
+    def canceled():
+        return _cancels[jobId % CANCEL_SLOTS] == jobId
+
+    return function(*args, canceled=canceled, **kwargs)
+
+
+def transform_points(key, x, y, z=None, canceled=None):
+    """
+    Transforms coordinate arrays with the transformation of key. Job run
+    by the workers.
+    """
+    import numpy
+
+    transform = transformer(key)
+    x = numpy.asarray(x, dtype=numpy.float64)
+    y = numpy.asarray(y, dtype=numpy.float64)
+    if z is None:
+        return transform(x, y)
+    return transform(x, y, numpy.asarray(z, dtype=numpy.float64))
+
+
+class WorkerPool:
+    """
+    Pool of spawned worker processes, sharing a job queue. Every worker
+    keeps the transformations it built in its transformer cache, used by
+    the Arrow and displacement field jobs (see transformer()), and the
+    GDAL and PROJ state, e.g. the opened grids, used by the
+    vectortranslate.translate() and rasterwarp.warp() jobs. warm is a
+    list of transformation keys built by every worker when it starts.
+    """
+
+    def __init__(self, workers=None, warm=()):
+        import multiprocessing
+
+        from ntv2_transformations.gdalrunner import python_executable
+
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context('spawn')
+        # Workers must not be started with the QGIS executable
+        context.set_executable(python_executable())
+        # Written by the caller and read by the workers, no lock needed
+        self._cancels = context.Array('q', CANCEL_SLOTS, lock=False)
+        self._jobIds = itertools.count(1)
+        self._pool = context.Pool(self.workers, initializer=_initialize,
+                                  initargs=(self._cancels, tuple(warm)),
+                                  maxtasksperchild=MAX_JOBS_PER_WORKER)
+        self.closed = False
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Queues function(*args, canceled=..., **kwargs), a module level
+        function polling canceled(), and returns its job id and
+        AsyncResult.
+        """
+        jobId = next(self._jobIds)
+        return jobId, self._pool.apply_async(_run_job, (jobId, function, args, kwargs))
+
+    def cancel(self, jobId):
+        """
+        Asks the job to stop, the other jobs keep running.
+        """
+        self._cancels[jobId % CANCEL_SLOTS] = jobId
+
+    def run(self, function, *args, canceled=None, poll=None, **kwargs):
+        """
+        Runs a job and returns its result. When canceled() becomes true
+        the job is canceled, RuntimeError being raised once it stopped.
+        """
+        from ntv2_transformations.gdalrunner import POLL_INTERVAL
+
+        jobId, result = self.submit(function, *args, **kwargs)
+        poll = poll or POLL_INTERVAL
+        stopped = False
+        while not result.ready():
+            if not stopped and canceled is not None and canceled():
+                self.cancel(jobId)
+                stopped = True
+            result.wait(poll)
+        if stopped:
+            raise RuntimeError('Canceled.')
+        return result.get()
+
+    def transform_points(self, key, x, y, z=None, canceled=None):
+        return self.run(transform_points, key, x, y, z, canceled=canceled)
+
+    def close(self):
+        # Waits for the queued jobs
+        self.closed = True
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self):
+        self.closed = True
+        self._pool.terminate()
+        self._pool.join()
+
+
+def worker_pool(workers=None, warm=()):
+    """
+    Pool shared by all the algorithms, started on first use, warming the
+    transformations of warm, and started again once terminated.
+    """
+    global _pool
+    with _poolLock:
+        if _pool is None or _pool.closed:
+            _pool = WorkerPool(workers, warm)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _poolLock:
+        pool, _pool = _pool, None
+    if pool is not None and not pool.closed:
+        pool.terminate()